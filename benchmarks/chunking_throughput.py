@@ -0,0 +1,82 @@
+"""Measure ParagraphTokenChunker throughput against the reference chunker.
+
+Usage: uv run python benchmarks/chunking_throughput.py [--mb 4] [--runs 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "tests")]
+
+from reference_chunker import ReferenceChunker  # noqa: E402
+
+from findocbot.infrastructure.chunking import (  # noqa: E402
+    ParagraphTokenChunker,
+)
+
+_WORDS = (
+    "revenue net income operating margin segment guidance liquidity "
+    "impairment goodwill covenant dividend EBITDA 2024 Q3 12.5% $4.2bn"
+).split()
+
+
+def build_corpus(megabytes: float, seed: int = 7) -> str:
+    """Return filing-like text: short and long paragraphs, some headers."""
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    paragraphs: list[str] = []
+    size = 0
+    while size < target:
+        words = rng.choices(_WORDS, k=rng.choice([6, 25, 60, 140, 400]))
+        paragraph = " ".join(words) + "."
+        if rng.random() < 0.05:
+            paragraph = f"Section {rng.randint(1, 20)}\n{paragraph}"
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def measure(
+    split: Callable[[str], object], text: str, runs: int
+) -> tuple[float, object]:
+    """Return the best wall time of *runs* calls and the last result."""
+    best = float("inf")
+    result: object = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = split(text)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    """Run the benchmark and print MB/s for both implementations."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=4.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--chunk-tokens", type=int, default=300)
+    args = parser.parse_args()
+
+    text = build_corpus(args.mb)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    results = {}
+    for name, chunker in (
+        ("reference", ReferenceChunker(chunk_tokens=args.chunk_tokens)),
+        (
+            "offset-index",
+            ParagraphTokenChunker(chunk_tokens=args.chunk_tokens),
+        ),
+    ):
+        seconds, results[name] = measure(chunker.split, text, args.runs)
+        print(f"{name:>13}: {megabytes / seconds:8.2f} MB/s ({seconds:.3f}s)")
+    if results["reference"] != results["offset-index"]:
+        raise SystemExit("Outputs differ between implementations.")
+
+
+if __name__ == "__main__":
+    main()
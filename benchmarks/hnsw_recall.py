@@ -0,0 +1,135 @@
+"""Report HNSW recall@k and latency per ef_search against exact search.
+
+Queries are the vectors of randomly sampled canonical chunks, slightly
+perturbed so a chunk is not trivially its own nearest neighbour. The
+exact top-k is computed with index scans disabled; each ef_search value
+then runs the same queries through ``PostgresChunkRepository``.
+
+Usage: uv run python benchmarks/hnsw_recall.py [--queries 200] [--k 5]
+       [--ef 10 20 40 80 160] [--embedding-index halfvec]
+       [--rerank-factor 4]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src")]
+
+from findocbot.config import Settings  # noqa: E402
+from findocbot.infrastructure.db import PostgresPool  # noqa: E402
+from findocbot.infrastructure.postgres_repositories import (  # noqa: E402
+    PostgresChunkRepository,
+)
+
+
+async def sample_queries(
+    db: PostgresPool, count: int, seed: int
+) -> list[list[float]]:
+    """Return perturbed vectors of *count* random canonical chunks."""
+    rows = await db.pool.fetch(
+        """
+        SELECT embedding FROM chunks
+        WHERE canonical_chunk_id IS NULL
+        ORDER BY random()
+        LIMIT $1
+        """,
+        count,
+    )
+    rng = random.Random(seed)
+    return [
+        [value + rng.gauss(0.0, 0.01) for value in row["embedding"]]
+        for row in rows
+    ]
+
+
+async def exact_top_k(
+    db: PostgresPool, query: list[float], k: int
+) -> set[str]:
+    """Return the ids of the true nearest canonical chunks."""
+    async with db.pool.acquire() as conn, conn.transaction():
+        await conn.execute("SET LOCAL enable_indexscan = off")
+        rows = await conn.fetch(
+            """
+            SELECT id FROM chunks
+            WHERE canonical_chunk_id IS NULL
+            ORDER BY embedding <=> $1::vector
+            LIMIT $2
+            """,
+            query,
+            k,
+        )
+    return {str(row["id"]) for row in rows}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of *values*."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Print recall@k and p50/p99 latency for each ef_search."""
+    k = args.k
+    db = PostgresPool(str(Settings().postgres_dsn))
+    await db.start()
+    try:
+        vectors = await sample_queries(db, args.queries, args.seed)
+        if not vectors:
+            raise SystemExit("No chunks to query; ingest documents first.")
+        truth = [await exact_top_k(db, vector, k) for vector in vectors]
+        repo = PostgresChunkRepository(
+            db,
+            embedding_index=args.embedding_index,
+            rerank_factor=args.rerank_factor,
+        )
+        print(
+            f"{len(vectors)} queries on {args.embedding_index} "
+            f"(rerank x{args.rerank_factor}), "
+            f"recall@{k} against exact search"
+        )
+        for ef in args.ef:
+            recalls: list[float] = []
+            latencies: list[float] = []
+            for vector, expected in zip(vectors, truth, strict=True):
+                started = time.perf_counter()
+                results = await repo.search_by_embedding(
+                    vector, top_k=k, ef_search=ef
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                found = {item.chunk.id for item in results}
+                recalls.append(len(found & expected) / max(len(expected), 1))
+            print(
+                f"ef_search={ef:>4}: recall {statistics.mean(recalls):.3f}, "
+                f"p50 {percentile(latencies, 0.5):6.2f} ms, "
+                f"p99 {percentile(latencies, 0.99):6.2f} ms"
+            )
+    finally:
+        await db.stop()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark against POSTGRES_DSN."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument(
+        "--ef", type=int, nargs="+", default=[10, 20, 40, 80, 160]
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--embedding-index", choices=["vector", "halfvec"], default="vector"
+    )
+    parser.add_argument("--rerank-factor", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
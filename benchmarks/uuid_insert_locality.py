@@ -0,0 +1,98 @@
+"""Compare chunk-row inserts keyed by UUIDv4 and by UUIDv7.
+
+Loads the same rows into two scratch tables shaped like ``chunks``
+(without the vector column, so the primary key dominates) and reports
+insert throughput and the size of each primary-key index.
+
+Usage: uv run python benchmarks/uuid_insert_locality.py [--rows 500000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+import asyncpg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT / "src")]
+
+from findocbot.config import Settings  # noqa: E402
+from findocbot.domain.ids import uuid7  # noqa: E402
+
+_TEXT = "Net revenue increased 12% driven by the services segment. " * 4
+
+
+async def load(
+    conn: asyncpg.Connection,
+    table: str,
+    make_id: Callable[[], uuid.UUID],
+    rows: int,
+    batch: int,
+) -> tuple[float, int]:
+    """Insert *rows* rows in batches; return seconds and PK index bytes."""
+    await conn.execute(f"DROP TABLE IF EXISTS {table}")
+    await conn.execute(
+        f"""
+        CREATE TABLE {table} (
+            id UUID PRIMARY KEY,
+            document_id UUID NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            content TEXT NOT NULL
+        )
+        """
+    )
+    document_id = make_id()
+    started = time.perf_counter()
+    for start in range(0, rows, batch):
+        if (start // batch) % 50 == 0:
+            document_id = make_id()
+        await conn.copy_records_to_table(
+            table,
+            records=[
+                (make_id(), document_id, index, _TEXT)
+                for index in range(start, min(start + batch, rows))
+            ],
+            columns=["id", "document_id", "chunk_index", "content"],
+        )
+    seconds = time.perf_counter() - started
+    size = await conn.fetchval(
+        "SELECT pg_relation_size($1::regclass)", f"{table}_pkey"
+    )
+    return seconds, int(size)
+
+
+async def run(rows: int, batch: int, keep: bool) -> None:
+    """Load both tables and print one line per id scheme."""
+    conn = await asyncpg.connect(str(Settings().postgres_dsn))
+    try:
+        for name, make_id in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+            table = f"bench_chunks_{name}"
+            seconds, size = await load(conn, table, make_id, rows, batch)
+            print(
+                f"{name}: {rows / seconds:10.0f} rows/s, "
+                f"pkey {size / 1024 / 1024:7.1f} MB"
+            )
+            if not keep:
+                await conn.execute(f"DROP TABLE {table}")
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark against POSTGRES_DSN."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the scratch tables."
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.batch, args.keep))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+-- Durable queue for asynchronous ingestion (INGEST_ASYNC=true).
+-- Workers claim rows with SELECT ... FOR UPDATE SKIP LOCKED; the upload
+-- bytes are kept only until the job finishes.
+
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id UUID PRIMARY KEY,
+    filename TEXT NOT NULL,
+    content BYTEA NULL,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    document_id UUID NULL REFERENCES documents(id) ON DELETE SET NULL,
+    error TEXT NULL,
+    stage_seconds JSONB NOT NULL DEFAULT '{}'::jsonb,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ NULL,
+    finished_at TIMESTAMPTZ NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingest_jobs_runnable
+    ON ingest_jobs(created_at)
+    WHERE status IN ('queued', 'running');
@@ -0,0 +1,15 @@
+-- Content-addressed deduplication of uploads: identical bytes map to one
+-- document. Rows created before this migration keep a NULL digest, which
+-- the unique index does not constrain.
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_sha256 TEXT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_content_sha256
+    ON documents(content_sha256);
+
+CREATE TABLE IF NOT EXISTS document_aliases (
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (document_id, filename)
+);
@@ -0,0 +1,11 @@
+-- Durable, content-addressed embedding cache. Keys are the SHA-256 of the
+-- whitespace-normalized text; the model name is part of the key so that
+-- switching embedding models never serves vectors from the old one.
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    text_sha256 TEXT NOT NULL,
+    embedding VECTOR(768) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (model, text_sha256)
+);
@@ -0,0 +1,11 @@
+-- Extracted page texts of each upload, so chunks can be rebuilt with new
+-- chunking settings without re-parsing the PDF. Pages are stored as a
+-- zlib-compressed JSON array and removed together with their document.
+
+CREATE TABLE IF NOT EXISTS page_texts (
+    content_sha256 TEXT PRIMARY KEY
+        REFERENCES documents(content_sha256) ON DELETE CASCADE,
+    page_count INTEGER NOT NULL,
+    pages BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,31 @@
+-- Near-duplicate chunks (NEAR_DUPLICATE_POLICY=link) point at a canonical
+-- chunk and keep a copy of its vector. Only canonical chunks are indexed
+-- for search, so the HNSW index is rebuilt as a partial index; on large
+-- tables run this during a maintenance window.
+-- Deleting a canonical chunk turns its near-duplicates into canonical
+-- chunks again; they already hold the vector.
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS canonical_chunk_id UUID NULL
+    REFERENCES chunks(id) ON DELETE SET NULL DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_canonical_chunk_id
+    ON chunks(canonical_chunk_id)
+    WHERE canonical_chunk_id IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_chunks_embedding_hnsw;
+
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+    ON chunks USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE canonical_chunk_id IS NULL;
+
+-- MinHash signatures of canonical chunks with their LSH band keys; a GIN
+-- index finds chunks sharing any band with a new chunk.
+CREATE TABLE IF NOT EXISTS chunk_minhash (
+    chunk_id UUID PRIMARY KEY REFERENCES chunks(id) ON DELETE CASCADE,
+    signature BIGINT[] NOT NULL,
+    band_keys BIGINT[] NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_minhash_band_keys
+    ON chunk_minhash USING gin (band_keys);
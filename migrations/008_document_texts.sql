@@ -0,0 +1,22 @@
+-- Normalized document text stored once, zlib-compressed. Chunks written
+-- with CHUNK_SPAN_STORAGE=true keep only [span_start, span_end) into it
+-- and have NULL content; their text is sliced out on read. Older chunks
+-- keep their inline content until the document is re-chunked.
+
+CREATE TABLE IF NOT EXISTS document_texts (
+    document_id UUID PRIMARY KEY REFERENCES documents(id) ON DELETE CASCADE,
+    text_sha256 TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    content BYTEA NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_document_texts_text_sha256
+    ON document_texts(text_sha256);
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS span_start INTEGER NULL;
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS span_end INTEGER NULL;
+ALTER TABLE chunks ALTER COLUMN content DROP NOT NULL;
+
+ALTER TABLE chunks DROP CONSTRAINT IF EXISTS chunks_content_or_span;
+ALTER TABLE chunks ADD CONSTRAINT chunks_content_or_span
+    CHECK (content IS NOT NULL OR span_start IS NOT NULL);
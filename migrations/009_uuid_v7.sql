@@ -0,0 +1,41 @@
+-- Identifiers are UUIDv7 (time-ordered) from this release on; the domain
+-- factories generate them. Existing UUIDv4 rows stay valid as they are:
+-- both are plain UUID values, and ids are referenced by foreign keys and
+-- returned by the API, so they are never rewritten. uuid_generate_v7()
+-- gives rows inserted from SQL the same ordering (PostgreSQL 18 has a
+-- built-in uuidv7()).
+
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS UUID
+LANGUAGE sql VOLATILE AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(
+                            floor(
+                                extract(epoch FROM clock_timestamp()) * 1000
+                            )::BIGINT
+                        )
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::UUID
+$$;
+
+ALTER TABLE documents ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE chunks ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE chat_turns ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE ingest_jobs ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+
+-- Pages of chunks_pkey split by random UUIDv4 inserts stay half full.
+-- New keys append to the right edge; to compact the old pages once,
+-- run outside a transaction during a quiet period:
+--   REINDEX INDEX CONCURRENTLY chunks_pkey;
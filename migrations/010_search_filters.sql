@@ -0,0 +1,7 @@
+-- Filtered vector search (SearchFilters) restricts chunks by document,
+-- section and upload date. Small filtered sets are ranked exactly and
+-- reach their rows through B-tree indexes; chunks(document_id) exists
+-- since 001, this adds the upload-date side.
+
+CREATE INDEX IF NOT EXISTS idx_documents_created_at
+    ON documents(created_at);
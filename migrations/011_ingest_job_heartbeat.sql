@@ -0,0 +1,6 @@
+-- Running ingestion jobs refresh heartbeat_at while they work, so a job
+-- is reclaimed only when its worker stopped answering, not when it is
+-- merely slow. Claims of jobs that already used up their attempts mark
+-- them failed instead (PostgresIngestJobRepository.claim_next).
+
+ALTER TABLE ingest_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ NULL;
@@ -0,0 +1,58 @@
+-- Half-precision copy of chunk vectors for EMBEDDING_INDEX=halfvec.
+-- Opt-in: it is not an init script, because the trigger adds work to
+-- every chunk write and the index memory that only halfvec search uses.
+-- Apply it with `make migrate-halfvec` before switching. Each step is
+-- online: the column is added without a rewrite, a trigger
+-- keeps new and updated rows in step, old rows are backfilled in small
+-- committed batches, and the index is built CONCURRENTLY. Run this file
+-- with psql in autocommit mode (the default), not inside a transaction.
+-- The full-precision column stays: it is re-ranked against and copied
+-- to near-duplicate chunks.
+
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS embedding_half HALFVEC(768) NULL;
+
+CREATE OR REPLACE FUNCTION chunks_sync_embedding_half() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.embedding_half := NEW.embedding::HALFVEC(768);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_chunks_embedding_half ON chunks;
+CREATE TRIGGER trg_chunks_embedding_half
+    BEFORE INSERT OR UPDATE OF embedding ON chunks
+    FOR EACH ROW EXECUTE FUNCTION chunks_sync_embedding_half();
+
+DO $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    LOOP
+        UPDATE chunks
+        SET embedding_half = embedding::HALFVEC(768)
+        WHERE id IN (
+            SELECT id FROM chunks
+            WHERE embedding_half IS NULL
+            LIMIT 5000
+        );
+        GET DIAGNOSTICS updated = ROW_COUNT;
+        EXIT WHEN updated = 0;
+        COMMIT;
+    END LOOP;
+END;
+$$;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_embedding_half_hnsw
+    ON chunks USING hnsw (embedding_half halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+    WHERE canonical_chunk_id IS NULL;
+
+-- Once EMBEDDING_INDEX=halfvec is deployed, drop the full-precision index
+-- to release its memory:
+--   DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_hnsw;
+-- To switch back to EMBEDDING_INDEX=vector, rebuild that index
+-- (002_hnsw_index.sql), then:
+--   DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_half_hnsw;
+--   DROP TRIGGER IF EXISTS trg_chunks_embedding_half ON chunks;
+--   ALTER TABLE chunks DROP COLUMN IF EXISTS embedding_half;
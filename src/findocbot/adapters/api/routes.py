@@ -1,27 +1,75 @@
 """FastAPI routes adapter."""
 
-from collections.abc import Generator
-from contextlib import contextmanager
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Generator,
+)
+from contextlib import ExitStack, contextmanager
+from datetime import UTC, datetime
+from pathlib import PurePosixPath
+from typing import Any, BinaryIO, cast
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    File,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
 
 from findocbot.adapters.api.schemas import (
     AskRequest,
     AskResponse,
+    BulkUploadItem,
+    BulkUploadResponse,
     ChunkResponse,
+    CreateUploadRequest,
+    IngestJobResponse,
+    RechunkResponse,
+    ReplaceResponse,
+    SearchFiltersRequest,
     SearchRequest,
     UploadResponse,
+    UploadSessionResponse,
 )
+from findocbot.domain.entities import IngestJob, UploadSession
 from findocbot.domain.exceptions import (
+    DocumentChangedError,
+    DocumentNotFoundError,
     FinDocBotError,
     InfrastructureError,
     ModelProviderError,
+    UploadConflictError,
+    UploadNotFoundError,
+    UploadTooLargeError,
 )
 from findocbot.infrastructure.container import AppContainer
+from findocbot.use_cases.dto import RechunkResultDTO
+from findocbot.use_cases.ports import SearchFilters
+from findocbot.use_cases.resumable_upload import ResumableUploadUseCase
 
 PDF_UPLOAD_FILE = File(...)
+PDF_UPLOAD_FILES = File(...)
+CONTENT_RANGE_HEADER = Header(default=None)
 _MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # 50 MB
 _MAX_UPLOAD_MB = _MAX_UPLOAD_BYTES // 1024 // 1024
+# Room for multipart boundaries and part headers around one file.
+_FORM_OVERHEAD_BYTES = 64 * 1024
+_ZIP_TYPES = frozenset({"application/zip", "application/x-zip-compressed"})
+_SPOOL_BYTES = 1024 * 1024
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
 
 
 @contextmanager
@@ -33,51 +81,492 @@ def _map_use_case_errors() -> Generator[None, None, None]:
         raise HTTPException(status_code=502, detail=str(error)) from error
     except InfrastructureError as error:
         raise HTTPException(status_code=503, detail=str(error)) from error
+    except (DocumentNotFoundError, UploadNotFoundError) as error:
+        raise HTTPException(status_code=404, detail=str(error)) from error
+    except (DocumentChangedError, UploadConflictError) as error:
+        raise HTTPException(status_code=409, detail=str(error)) from error
+    except UploadTooLargeError as error:
+        raise HTTPException(status_code=413, detail=str(error)) from error
     except FinDocBotError as error:
         raise HTTPException(status_code=400, detail=str(error)) from error
 
 
+def _require_pdf(file: UploadFile) -> None:
+    if file.content_type != "application/pdf":
+        raise HTTPException(
+            status_code=400, detail="Only PDF uploads are supported."
+        )
+
+
+class _CappedRequest(Request):
+    """Request whose body stream stops once it passes a byte limit.
+
+    FastAPI parses multipart forms from ``stream`` before the endpoint
+    runs, so an oversized upload is rejected while it is spooled, and
+    one that declares its size in ``Content-Length`` before any of it is
+    read, instead of after all of it reached the disk.
+    """
+
+    def __init__(self, request: Request, max_bytes: int) -> None:
+        """Wrap *request*, allowing at most *max_bytes* of body."""
+        super().__init__(request.scope, request.receive)
+        self._max_bytes = max_bytes
+
+    async def stream(self) -> AsyncGenerator[bytes, None]:
+        """Yield body blocks; raise 413 past the limit."""
+        declared = self.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self._max_bytes:
+            raise self._too_large()
+        seen = 0
+        async for block in super().stream():
+            seen += len(block)
+            if seen > self._max_bytes:
+                raise self._too_large()
+            yield block
+
+    def _too_large(self) -> HTTPException:
+        limit = self._max_bytes // 1024 // 1024
+        return HTTPException(
+            status_code=413, detail=f"Request exceeds {limit} MB limit."
+        )
+
+
+def _capped_route(max_bytes: int) -> type[APIRoute]:
+    """Return a route class whose request bodies stop at *max_bytes*."""
+
+    class CappedRoute(APIRoute):
+        def get_route_handler(
+            self,
+        ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+            handler = super().get_route_handler()
+
+            async def capped(request: Request) -> Response:
+                return await handler(_CappedRequest(request, max_bytes))
+
+            return capped
+
+    return CappedRoute
+
+
+_SINGLE_UPLOAD_ROUTE = _capped_route(_MAX_UPLOAD_BYTES + _FORM_OVERHEAD_BYTES)
+
+
+async def _spooled_upload(
+    file: UploadFile, max_bytes: int = _MAX_UPLOAD_BYTES
+) -> BinaryIO:
+    """Return the upload's spooled file after enforcing the size limit.
+
+    Starlette streams multipart files into a ``SpooledTemporaryFile``
+    that stays in memory up to 1 MB and rolls over to disk beyond it, so
+    handing that file to the use case keeps per-upload memory bounded
+    instead of buffering the whole PDF into ``bytes``. Upload routes are
+    built with ``_capped_route``, which bounds the whole request while
+    it streams; this check then applies *max_bytes* to each file.
+    """
+    size = file.size
+    if size is None:
+        size = await run_in_threadpool(file.file.seek, 0, os.SEEK_END)
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds {max_bytes // 1024 // 1024} MB limit.",
+        )
+    await file.seek(0)
+    return file.file
+
+
+def _extract_zip(
+    archive: BinaryIO, max_files: int, max_bytes: int, files: ExitStack
+) -> tuple[list[tuple[str, BinaryIO]], int]:
+    """Spool every PDF member of *archive*, enforcing the upload limits.
+
+    ``zipfile`` never decompresses past a member's declared size, so
+    checking the declared sizes up front, each against the single-file
+    limit and their sum against *max_bytes*, also bounds a crafted
+    archive. Spooled files are registered on *files* for closing.
+
+    Returns:
+        The spooled PDFs and their total size.
+    """
+    try:
+        with zipfile.ZipFile(archive) as bundle:
+            members = [
+                member
+                for member in bundle.infolist()
+                if not member.is_dir()
+                and member.filename.lower().endswith(".pdf")
+            ]
+            if len(members) > max_files:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"At most {max_files} PDFs per request.",
+                )
+            total = sum(member.file_size for member in members)
+            if total > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=(
+                        "Archive contents exceed "
+                        f"{max_bytes // 1024 // 1024} MB limit."
+                    ),
+                )
+            extracted: list[tuple[str, BinaryIO]] = []
+            for member in members:
+                if member.file_size > _MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=(
+                            f"{member.filename} exceeds "
+                            f"{_MAX_UPLOAD_MB} MB limit."
+                        ),
+                    )
+                spooled = files.enter_context(
+                    tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+                )
+                with bundle.open(member) as source:
+                    shutil.copyfileobj(source, spooled)
+                name = PurePosixPath(member.filename).name
+                extracted.append((name, cast(BinaryIO, spooled)))
+            return extracted, total
+    except zipfile.BadZipFile as error:
+        raise HTTPException(
+            status_code=400, detail="Invalid zip archive."
+        ) from error
+
+
+async def _bulk_files(
+    uploads: list[UploadFile], max_files: int, max_bytes: int, files: ExitStack
+) -> list[tuple[str, BinaryIO]]:
+    """Flatten PDF and zip uploads into named, size-checked PDF files.
+
+    PDFs are held to the single-file limit. Archives are bounded by
+    *max_bytes*, as is everything extracted from them in one request.
+    """
+    collected: list[tuple[str, BinaryIO]] = []
+    extracted_bytes = 0
+    for upload in uploads:
+        if upload.content_type in _ZIP_TYPES:
+            archive = await _spooled_upload(upload, max_bytes)
+            extracted, size = await run_in_threadpool(
+                _extract_zip,
+                archive,
+                max_files,
+                max_bytes - extracted_bytes,
+                files,
+            )
+            collected.extend(extracted)
+            extracted_bytes += size
+        else:
+            _require_pdf(upload)
+            content = await _spooled_upload(upload)
+            collected.append((upload.filename or "uploaded.pdf", content))
+    if len(collected) > max_files:
+        raise HTTPException(
+            status_code=413, detail=f"At most {max_files} PDFs per request."
+        )
+    return collected
+
+
+def _job_response(job: IngestJob) -> IngestJobResponse:
+    return IngestJobResponse(
+        job_id=job.id,
+        filename=job.filename,
+        status=job.status,
+        document_id=job.document_id,
+        error=job.error,
+        stage_seconds=job.stage_seconds,
+        attempts=job.attempts,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    """Read a timestamp without a zone as UTC."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=UTC)
+
+
+def _search_filters(
+    filters: SearchFiltersRequest | None,
+) -> SearchFilters | None:
+    if filters is None:
+        return None
+    return SearchFilters(
+        document_ids=(
+            tuple(str(value) for value in filters.document_ids)
+            if filters.document_ids is not None
+            else None
+        ),
+        section=filters.section,
+        uploaded_after=_as_utc(filters.uploaded_after),
+        uploaded_before=_as_utc(filters.uploaded_before),
+    )
+
+
+def _session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        upload_id=session.id,
+        filename=session.filename,
+        size=session.size,
+        received=session.received,
+        created_at=session.created_at,
+    )
+
+
+def _parse_content_range(header: str | None) -> tuple[int, int, int]:
+    """Return start, inclusive end and total of ``bytes a-b/total``."""
+    match = _CONTENT_RANGE.fullmatch(header or "")
+    if match is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Content-Range must be 'bytes <start>-<end>/<size>'.",
+        )
+    start, end, total = (int(group) for group in match.groups())
+    if end < start:
+        raise HTTPException(status_code=400, detail="Invalid Content-Range.")
+    return start, end, total
+
+
+async def _bounded_body(request: Request, length: int) -> AsyncIterator[bytes]:
+    """Stream the request body, rejecting bytes beyond *length*."""
+    seen = 0
+    async for block in request.stream():
+        seen += len(block)
+        if seen > length:
+            raise HTTPException(
+                status_code=400, detail="Body is longer than Content-Range."
+            )
+        yield block
+
+
+def _rechunk_response(result: RechunkResultDTO) -> RechunkResponse:
+    return RechunkResponse(
+        document_id=result.document_id,
+        chunks=result.chunks,
+        reused=result.reused,
+        embedded=result.embedded,
+        removed=result.removed,
+    )
+
+
+def _add_maintenance_routes(
+    router: APIRouter, container: AppContainer
+) -> None:
+    """Register routes that rework already ingested documents."""
+    uploads = APIRouter(route_class=_SINGLE_UPLOAD_ROUTE)
+
+    @router.post(
+        "/documents/{document_id}/rechunk", response_model=RechunkResponse
+    )
+    async def rechunk_document(document_id: str) -> RechunkResponse:
+        if container.rechunk_document is None:
+            raise HTTPException(
+                status_code=404, detail="Re-chunking is not available."
+            )
+        with _map_use_case_errors():
+            result = await container.rechunk_document.execute(document_id)
+        return _rechunk_response(result)
+
+    @uploads.put("/documents/{document_id}", response_model=ReplaceResponse)
+    async def replace_document(
+        document_id: str, file: UploadFile = PDF_UPLOAD_FILE
+    ) -> ReplaceResponse:
+        if container.replace_document is None:
+            raise HTTPException(
+                status_code=404, detail="Replacing documents is not available."
+            )
+        _require_pdf(file)
+        content = await _spooled_upload(file)
+        with _map_use_case_errors():
+            result = await container.replace_document.execute(
+                document_id,
+                filename=file.filename or "uploaded.pdf",
+                content=content,
+            )
+        return ReplaceResponse(
+            document_id=result.document_id,
+            filename=result.filename,
+            pages=result.pages,
+            changed_pages=result.changed_pages,
+            removed_pages=result.removed_pages,
+            chunks=_rechunk_response(result.chunks),
+        )
+
+    router.include_router(uploads)
+
+
+def _add_resumable_upload_routes(
+    router: APIRouter, container: AppContainer
+) -> None:
+    """Register create, range upload, status and finalize routes."""
+
+    def _use_case() -> ResumableUploadUseCase:
+        if container.resumable_upload is None:
+            raise HTTPException(
+                status_code=404, detail="Resumable uploads are not available."
+            )
+        return container.resumable_upload
+
+    @router.post(
+        "/documents/uploads",
+        response_model=UploadSessionResponse,
+        status_code=201,
+    )
+    async def create_upload(
+        payload: CreateUploadRequest,
+    ) -> UploadSessionResponse:
+        with _map_use_case_errors():
+            session = await _use_case().create(payload.filename, payload.size)
+        return _session_response(session)
+
+    @router.get(
+        "/documents/uploads/{upload_id}", response_model=UploadSessionResponse
+    )
+    async def get_upload(upload_id: str) -> UploadSessionResponse:
+        with _map_use_case_errors():
+            session = await _use_case().status(upload_id)
+        return _session_response(session)
+
+    @router.put(
+        "/documents/uploads/{upload_id}", response_model=UploadSessionResponse
+    )
+    async def put_upload_range(
+        upload_id: str,
+        request: Request,
+        content_range: str | None = CONTENT_RANGE_HEADER,
+    ) -> UploadSessionResponse:
+        start, end, total = _parse_content_range(content_range)
+        use_case = _use_case()
+        with _map_use_case_errors():
+            if total != (await use_case.status(upload_id)).size:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Content-Range size differs from the upload size.",
+                )
+            session = await use_case.append(
+                upload_id, start, _bounded_body(request, end - start + 1)
+            )
+        return _session_response(session)
+
+    @router.delete("/documents/uploads/{upload_id}", status_code=204)
+    async def abort_upload(upload_id: str) -> Response:
+        with _map_use_case_errors():
+            await _use_case().abort(upload_id)
+        return Response(status_code=204)
+
+    @router.post(
+        "/documents/uploads/{upload_id}/finalize",
+        response_model=UploadResponse | IngestJobResponse,
+        responses={202: {"model": IngestJobResponse}},
+    )
+    async def finalize_upload(
+        upload_id: str, response: Response
+    ) -> UploadResponse | IngestJobResponse:
+        with _map_use_case_errors():
+            result = await _use_case().finalize(upload_id)
+        if isinstance(result, IngestJob):
+            response.status_code = 202
+            return _job_response(result)
+        return UploadResponse(document_id=result.id, filename=result.filename)
+
+
+def _add_bulk_upload_route(router: APIRouter, container: AppContainer) -> None:
+    """Register the multi-file upload route."""
+    max_bytes = container.settings.bulk_upload_max_mb * 1024 * 1024
+    uploads = APIRouter(route_class=_capped_route(max_bytes))
+
+    @uploads.post("/documents/bulk-upload", response_model=BulkUploadResponse)
+    async def bulk_upload_documents(
+        files: list[UploadFile] = PDF_UPLOAD_FILES,
+    ) -> BulkUploadResponse:
+        if container.bulk_upload is None:
+            raise HTTPException(
+                status_code=404, detail="Bulk upload is not available."
+            )
+        with ExitStack() as spooled:
+            pdfs = await _bulk_files(
+                files,
+                container.settings.bulk_upload_max_files,
+                max_bytes,
+                spooled,
+            )
+            with _map_use_case_errors():
+                results = await container.bulk_upload.execute(pdfs)
+        return BulkUploadResponse(
+            items=[
+                BulkUploadItem(
+                    filename=item.filename,
+                    status=item.status,
+                    document_id=item.document_id,
+                    pages=item.pages,
+                    chunks=item.chunks,
+                    error=item.error,
+                )
+                for item in results
+            ]
+        )
+
+    router.include_router(uploads)
+
+
 def build_router(container: AppContainer) -> APIRouter:
     """Build API router with use-case handlers."""
     router = APIRouter()
+    uploads = APIRouter(route_class=_SINGLE_UPLOAD_ROUTE)
 
     @router.get("/health")
     async def healthcheck() -> dict[str, str]:
         return {"status": "ok"}
 
-    @router.post("/documents/upload", response_model=UploadResponse)
+    @uploads.post(
+        "/documents/upload",
+        response_model=UploadResponse | IngestJobResponse,
+        responses={202: {"model": IngestJobResponse}},
+    )
     async def upload_document(
+        response: Response,
         file: UploadFile = PDF_UPLOAD_FILE,
-    ) -> UploadResponse:
-        if file.content_type != "application/pdf":
-            raise HTTPException(
-                status_code=400, detail="Only PDF uploads are supported."
-            )
-        # Read in bounded chunks and abort early so an oversized upload
-        # cannot be fully buffered in memory before the limit is enforced.
-        content = bytearray()
-        while data := await file.read(1024 * 1024):
-            content.extend(data)
-            if len(content) > _MAX_UPLOAD_BYTES:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File exceeds {_MAX_UPLOAD_MB} MB limit.",
+    ) -> UploadResponse | IngestJobResponse:
+        _require_pdf(file)
+        content = await _spooled_upload(file)
+        filename = file.filename or "uploaded.pdf"
+        if container.enqueue_upload is not None:
+            with _map_use_case_errors():
+                job = await container.enqueue_upload.execute(
+                    filename=filename, content=content
                 )
+            response.status_code = 202
+            return _job_response(job)
         with _map_use_case_errors():
             document = await container.upload_pdf.execute(
-                filename=file.filename or "uploaded.pdf",
-                content=bytes(content),
+                filename=filename,
+                content=content,
             )
         return UploadResponse(
             document_id=document.id, filename=document.filename
         )
 
+    @router.get("/documents/jobs/{job_id}", response_model=IngestJobResponse)
+    async def get_ingest_job(job_id: str) -> IngestJobResponse:
+        job = None
+        if container.get_ingest_job is not None:
+            with _map_use_case_errors():
+                job = await container.get_ingest_job.execute(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        return _job_response(job)
+
     @router.post("/search", response_model=list[ChunkResponse])
     async def search_chunks(payload: SearchRequest) -> list[ChunkResponse]:
         with _map_use_case_errors():
             result = await container.search_chunks.execute(
                 query=payload.query,
                 top_k=payload.top_k,
+                filters=_search_filters(payload.filters),
+                ef_search=payload.ef_search,
             )
         return [
             ChunkResponse(
@@ -98,6 +587,8 @@ def build_router(container: AppContainer) -> APIRouter:
                 session_id=payload.session_id,
                 question=payload.question,
                 top_k=payload.top_k,
+                filters=_search_filters(payload.filters),
+                ef_search=payload.ef_search,
             )
         return AskResponse(
             answer=result.answer,
@@ -115,4 +606,8 @@ def build_router(container: AppContainer) -> APIRouter:
             ],
         )
 
+    router.include_router(uploads)
+    _add_bulk_upload_route(router, container)
+    _add_resumable_upload_routes(router, container)
+    _add_maintenance_routes(router, container)
     return router
@@ -1,15 +1,30 @@
 """API request and response schemas."""
 
+from datetime import datetime
 from typing import Literal
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 
+class SearchFiltersRequest(BaseModel):
+    """Optional restrictions of the searched chunks."""
+
+    document_ids: list[UUID] | None = Field(
+        default=None, min_length=1, max_length=100
+    )
+    section: str | None = Field(default=None, min_length=1)
+    uploaded_after: datetime | None = None
+    uploaded_before: datetime | None = None
+
+
 class SearchRequest(BaseModel):
     """Search request payload."""
 
     query: str = Field(min_length=1)
     top_k: int = Field(default=5, ge=1, le=20)
+    filters: SearchFiltersRequest | None = None
+    ef_search: int | None = Field(default=None, ge=1, le=1000)
 
 
 class AskRequest(BaseModel):
@@ -18,6 +33,8 @@ class AskRequest(BaseModel):
     session_id: str = Field(min_length=1)
     question: str = Field(min_length=1)
     top_k: int = Field(default=5, ge=1, le=20)
+    filters: SearchFiltersRequest | None = None
+    ef_search: int | None = Field(default=None, ge=1, le=1000)
 
 
 class ChunkResponse(BaseModel):
@@ -38,6 +55,76 @@ class UploadResponse(BaseModel):
     filename: str
 
 
+class CreateUploadRequest(BaseModel):
+    """Resumable upload creation payload."""
+
+    filename: str = Field(min_length=1)
+    size: int = Field(gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    """Resumable upload progress."""
+
+    upload_id: str
+    filename: str
+    size: int
+    received: int
+    created_at: datetime
+
+
+class BulkUploadItem(BaseModel):
+    """Outcome of one file of a bulk upload."""
+
+    filename: str
+    status: Literal["created", "duplicate", "failed"]
+    document_id: str | None = None
+    pages: int = 0
+    chunks: int = 0
+    error: str | None = None
+
+
+class BulkUploadResponse(BaseModel):
+    """Bulk upload response with one item per PDF, in upload order."""
+
+    items: list[BulkUploadItem]
+
+
+class RechunkResponse(BaseModel):
+    """Re-chunk operation response."""
+
+    document_id: str
+    chunks: int
+    reused: int
+    embedded: int
+    removed: int
+
+
+class ReplaceResponse(BaseModel):
+    """Replace operation response."""
+
+    document_id: str
+    filename: str
+    pages: int
+    changed_pages: list[int]
+    removed_pages: int
+    chunks: RechunkResponse
+
+
+class IngestJobResponse(BaseModel):
+    """Queued ingestion state and per-stage timings."""
+
+    job_id: str
+    filename: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    document_id: str | None = None
+    error: str | None = None
+    stage_seconds: dict[str, float] = Field(default_factory=dict)
+    attempts: int = 0
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
 class AskResponse(BaseModel):
     """Answer response payload."""
 
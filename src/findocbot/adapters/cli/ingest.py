@@ -0,0 +1,187 @@
+"""Resumable bulk loading of a directory tree of PDFs."""
+
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
+from findocbot.use_cases.dto import BulkUploadItemDTO, IngestStats
+
+CHECKPOINT_NAME = ".findocbot-ingest.jsonl"
+
+
+def _file_key(root: Path, path: Path) -> str:
+    """Identify a file by relative path, size and mtime.
+
+    A file edited after it was loaded gets a new key and is loaded again.
+    """
+    stat = path.stat()
+    relative = path.relative_to(root).as_posix()
+    return f"{relative}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class IngestCheckpoint:
+    """Append-only JSON Lines log of files that were already handled."""
+
+    def __init__(self, path: Path) -> None:
+        """Load earlier entries from *path* if it exists.
+
+        A line torn by a crash mid-write is ignored, so its file is
+        simply loaded again.
+        """
+        self._path = path
+        self._status: dict[str, str] = {}
+        self._torn = False
+        if not path.exists():
+            return
+        text = path.read_text(encoding="utf-8")
+        self._torn = bool(text) and not text.endswith("\n")
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._status[entry["key"]] = entry["status"]
+
+    def is_done(self, key: str, retry_failed: bool = False) -> bool:
+        """Return whether *key* needs no further work."""
+        status = self._status.get(key)
+        if status is None:
+            return False
+        return not (retry_failed and status == "failed")
+
+    def record(self, entries: list[tuple[str, BulkUploadItemDTO]]) -> None:
+        """Append one line per file and fsync before returning."""
+        with self._path.open("a", encoding="utf-8") as log:
+            if self._torn:
+                log.write("\n")
+                self._torn = False
+            for key, item in entries:
+                log.write(
+                    json.dumps({
+                        "key": key,
+                        "status": item.status,
+                        "document_id": item.document_id,
+                        "error": item.error,
+                    })
+                    + "\n"
+                )
+                self._status[key] = item.status
+            log.flush()
+            os.fsync(log.fileno())
+
+
+@dataclass
+class IngestProgress:
+    """Running totals and throughput of one ``findocbot ingest`` run."""
+
+    total_files: int
+    files: int = 0
+    created: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    pages: int = 0
+    chunks: int = 0
+    near_duplicates: int = 0
+    embed_seconds: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    def add(
+        self, results: list[BulkUploadItemDTO], stats: IngestStats
+    ) -> None:
+        """Fold one batch into the totals."""
+        self.files += len(results)
+        self.created += sum(item.status == "created" for item in results)
+        self.duplicates += sum(item.status == "duplicate" for item in results)
+        self.failed += sum(item.status == "failed" for item in results)
+        self.pages += stats.pages
+        self.chunks += stats.chunks
+        self.near_duplicates += stats.near_duplicates
+        self.embed_seconds += stats.stage_seconds.get("embed", 0.0)
+
+    def line(self) -> str:
+        """Render totals and rates.
+
+        Pages and chunks are per second of the whole run; embeddings are
+        per second spent embedding, i.e. the provider's throughput, and
+        exclude near-duplicate chunks, which are never embedded.
+        """
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        embedding = max(self.embed_seconds, 1e-9)
+        return (
+            f"[{self.files}/{self.total_files}] "
+            f"created={self.created} duplicate={self.duplicates} "
+            f"failed={self.failed} | "
+            f"{self.pages / elapsed:.1f} pages/s, "
+            f"{self.chunks / elapsed:.1f} chunks/s, "
+            f"{(self.chunks - self.near_duplicates) / embedding:.1f} "
+            f"embeddings/s, {self.near_duplicates} near-duplicate chunks"
+        )
+
+
+def find_pdfs(root: Path) -> list[Path]:
+    """Return every PDF under *root*, in a stable order."""
+    return sorted(
+        path
+        for path in root.rglob("*")
+        if path.is_file() and path.suffix.lower() == ".pdf"
+    )
+
+
+async def ingest_directory(
+    bulk_upload: BulkUploadUseCase,
+    root: Path,
+    checkpoint: IngestCheckpoint,
+    batch_files: int = 16,
+    retry_failed: bool = False,
+    out: TextIO = sys.stdout,
+) -> IngestProgress:
+    """Load all PDFs under *root* that the checkpoint has not seen.
+
+    Files go through ``BulkUploadUseCase`` *batch_files* at a time, so
+    embedding batches and bulk loads span documents. Each batch commits
+    before its files are checkpointed; after a crash, the interrupted
+    batch is loaded again and its committed files come back as
+    duplicates.
+
+    Args:
+        bulk_upload: Use case that ingests one batch of files.
+        root: Directory walked recursively for ``*.pdf`` files.
+        checkpoint: Record of files handled by earlier runs.
+        batch_files: Files per batch and transaction.
+        retry_failed: Load files that failed in an earlier run again.
+        out: Stream progress lines are written to.
+    """
+    pending = [
+        (key, path)
+        for path in find_pdfs(root)
+        if not checkpoint.is_done(
+            key := _file_key(root, path), retry_failed=retry_failed
+        )
+    ]
+    progress = IngestProgress(total_files=len(pending))
+    for start in range(0, len(pending), batch_files):
+        batch = pending[start : start + batch_files]
+        stats = IngestStats()
+        with ExitStack() as files:
+            results = await bulk_upload.execute(
+                [
+                    (path.name, files.enter_context(path.open("rb")))
+                    for _, path in batch
+                ],
+                stats=stats,
+            )
+        checkpoint.record([
+            (key, item) for (key, _), item in zip(batch, results, strict=True)
+        ])
+        progress.add(results, stats)
+        for (_, path), item in zip(batch, results, strict=True):
+            if item.status == "failed":
+                print(f"failed: {path}: {item.error}", file=out)
+        print(progress.line(), file=out, flush=True)
+    return progress
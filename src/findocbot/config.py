@@ -1,5 +1,7 @@
 """Application configuration."""
 
+from typing import Literal
+
 from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,10 +19,64 @@ class Settings(BaseSettings):
     )
 
     top_k: int = 5
+    search_exact_max_rows: int = 10_000
+    search_hnsw_max_scan_tuples: int = 20_000
+    search_ef_search: int | None = 40
+    ask_ef_search: int | None = 100
+    embedding_index: Literal["vector", "halfvec"] = "vector"
+    halfvec_rerank_factor: int = 4
     max_history_pairs: int = 5
     embedding_cache_size: int = 1000
     embedding_batch_size: int = 50
+    embedding_max_in_flight: int = 1
+    embedding_batch_token_budget: int | None = None
+    embedding_batch_adaptive: bool = False
+    embedding_max_retries: int = 2
+    embedding_retry_backoff_seconds: float = 0.5
+    embedding_store_flush_size: int = 500
     embedding_cache_ttl_seconds: int | None = 3600
+    embedding_store: Literal["none", "postgres", "sqlite"] = "postgres"
+    embedding_store_sqlite_path: str = "data/embedding_cache.sqlite3"
+
+    pdf_parser_workers: int = 1
+    pdf_parallel_min_pages: int = 32
+    pdf_sandbox_enabled: bool = False
+    pdf_sandbox_workers: int = 2
+    pdf_sandbox_timeout_seconds: float = 120.0
+    pdf_sandbox_page_timeout_seconds: float = 10.0
+    pdf_sandbox_memory_limit_mb: int | None = 1024
+    pdf_sandbox_recycle_after: int = 50
+
+    dedup_record_aliases: bool = True
+
+    chunk_tokens: int = 300
+    chunk_overlap_ratio: float = 0.15
+    page_text_cache_enabled: bool = True
+    near_duplicate_policy: Literal["off", "link", "skip"] = "off"
+    near_duplicate_threshold: float = 0.9
+    chunk_span_storage: bool = False
+    document_text_cache_size: int = 32
+
+    ingest_pipeline_enabled: bool = False
+    ingest_persist_batch_size: int = 500
+    ingest_queue_size: int = 4
+    chunk_copy_batch_size: int = 2000
+
+    bulk_upload_max_files: int = 200
+    bulk_upload_max_mb: int = 1024
+    bulk_upload_batch_files: int = 16
+    bulk_parse_concurrency: int = 4
+    resumable_upload_dir: str = "data/uploads"
+    resumable_upload_max_mb: int = 2048
+    resumable_upload_ttl_seconds: int = 86400
+
+    ingest_async: bool = False
+    ingest_workers: int = 2
+    ingest_poll_interval_seconds: float = 1.0
+    ingest_job_stale_after_seconds: int = 1800
+    ingest_job_heartbeat_seconds: float = 60.0
+    ingest_job_max_attempts: int = 3
+    ingest_job_max_mb: int = 512
 
 
 def load_settings() -> Settings:
@@ -1,17 +1,41 @@
 """Domain layer exports."""
 
-from findocbot.domain.entities import ChatTurn, Chunk, Document
+from findocbot.domain.entities import (
+    ChatTurn,
+    Chunk,
+    Document,
+    IngestJob,
+    IngestJobStatus,
+    UploadSession,
+)
 from findocbot.domain.exceptions import (
+    DocumentNotFoundError,
+    DuplicateDocumentError,
     EmptyDocumentError,
     FinDocBotError,
     InvalidQueryError,
+    PageTextUnavailableError,
+    UnreadableDocumentError,
+    UploadConflictError,
+    UploadNotFoundError,
+    UploadTooLargeError,
 )
 
 __all__ = [
     "ChatTurn",
     "Chunk",
     "Document",
+    "DocumentNotFoundError",
+    "DuplicateDocumentError",
     "EmptyDocumentError",
     "FinDocBotError",
+    "IngestJob",
+    "IngestJobStatus",
     "InvalidQueryError",
+    "PageTextUnavailableError",
+    "UnreadableDocumentError",
+    "UploadConflictError",
+    "UploadNotFoundError",
+    "UploadSession",
+    "UploadTooLargeError",
 ]
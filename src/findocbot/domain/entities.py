@@ -2,7 +2,11 @@
 
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from uuid import uuid4
+from typing import Literal
+
+from findocbot.domain.ids import new_id
+
+IngestJobStatus = Literal["queued", "running", "succeeded", "failed"]
 
 
 @dataclass(frozen=True)
@@ -14,22 +18,34 @@ class Document:
     created_at: datetime = field(
         default_factory=lambda: datetime.now(tz=UTC),
     )
+    content_sha256: str | None = None
 
     @staticmethod
-    def create(filename: str) -> "Document":
+    def create(filename: str, content_sha256: str | None = None) -> "Document":
         """Create a document with generated identifier."""
-        return Document(id=str(uuid4()), filename=filename)
+        return Document(
+            id=new_id(), filename=filename, content_sha256=content_sha256
+        )
 
 
 @dataclass(frozen=True)
 class Chunk:
-    """Document chunk prepared for retrieval."""
+    """Document chunk prepared for retrieval.
+
+    A chunk with ``canonical_chunk_id`` is a near-duplicate of that chunk:
+    it shares its vector and is left out of search results. A chunk with
+    a span is stored as ``[span_start, span_end)`` of its document's
+    normalized text, and ``text`` is that slice.
+    """
 
     id: str
     document_id: str
     chunk_index: int
     text: str
     section: str | None = None
+    canonical_chunk_id: str | None = None
+    span_start: int | None = None
+    span_end: int | None = None
 
     @staticmethod
     def create(
@@ -37,14 +53,17 @@ class Chunk:
         chunk_index: int,
         text: str,
         section: str | None = None,
+        span: tuple[int, int] | None = None,
     ) -> "Chunk":
         """Create chunk with generated identifier."""
         return Chunk(
-            id=str(uuid4()),
+            id=new_id(),
             document_id=document_id,
             chunk_index=chunk_index,
             text=text,
             section=section,
+            span_start=span[0] if span is not None else None,
+            span_end=span[1] if span is not None else None,
         )
 
 
@@ -64,8 +83,54 @@ class ChatTurn:
     def create(session_id: str, question: str, answer: str) -> "ChatTurn":
         """Create chat turn with generated identifier."""
         return ChatTurn(
-            id=str(uuid4()),
+            id=new_id(),
             session_id=session_id,
             question=question,
             answer=answer,
         )
+
+
+@dataclass(frozen=True)
+class IngestJob:
+    """Queued PDF ingestion and its outcome."""
+
+    id: str
+    filename: str
+    status: IngestJobStatus = "queued"
+    document_id: str | None = None
+    error: str | None = None
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    attempts: int = 0
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(tz=UTC),
+    )
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @staticmethod
+    def create(filename: str) -> "IngestJob":
+        """Create a queued job with generated identifier."""
+        return IngestJob(id=new_id(), filename=filename)
+
+
+@dataclass(frozen=True)
+class UploadSession:
+    """Resumable upload whose first ``received`` bytes are stored."""
+
+    id: str
+    filename: str
+    size: int
+    received: int = 0
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(tz=UTC),
+    )
+
+    @property
+    def complete(self) -> bool:
+        """Whether all declared bytes have arrived."""
+        return self.received >= self.size
+
+    @staticmethod
+    def create(filename: str, size: int) -> "UploadSession":
+        """Create an empty upload with generated identifier."""
+        return UploadSession(id=new_id(), filename=filename, size=size)
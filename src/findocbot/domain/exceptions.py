@@ -13,6 +13,38 @@ class InvalidQueryError(FinDocBotError):
     """Raised when a search or question is invalid."""
 
 
+class DuplicateDocumentError(FinDocBotError):
+    """Raised when a document with the same content digest already exists."""
+
+
+class UnreadableDocumentError(FinDocBotError):
+    """Raised when a PDF is malformed or exceeds parsing time/memory limits."""
+
+
+class DocumentNotFoundError(FinDocBotError):
+    """Raised when an operation targets a document id that does not exist."""
+
+
+class PageTextUnavailableError(FinDocBotError):
+    """Raised when a document has no cached page text to re-chunk from."""
+
+
+class DocumentChangedError(FinDocBotError):
+    """Raised when a document changed while an update was being prepared."""
+
+
+class UploadNotFoundError(FinDocBotError):
+    """Raised when a resumable upload does not exist or has expired."""
+
+
+class UploadConflictError(FinDocBotError):
+    """Raised when a byte range or finalize does not fit upload progress."""
+
+
+class UploadTooLargeError(FinDocBotError):
+    """Raised when an upload exceeds its declared or maximum size."""
+
+
 # --- Infrastructure / adapter exceptions ---
 
 
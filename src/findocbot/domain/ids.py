@@ -0,0 +1,49 @@
+"""Time-ordered identifiers."""
+
+import os
+import threading
+import time
+from uuid import UUID
+
+_COUNTER_MAX = 0xFFF
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    """Return a UUIDv7 (RFC 9562) that sorts after every earlier one.
+
+    The top 48 bits are the Unix time in milliseconds, so keys generated
+    together land on the same B-tree pages. The 12-bit ``rand_a`` field
+    is a counter that starts at a random value each millisecond and is
+    incremented within it, which keeps ids from one process strictly
+    increasing. When it overflows, or the clock steps back, the
+    timestamp is carried forward instead. The remaining 62 bits are
+    random.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            _last_ms += 1
+            _counter = 0
+        timestamp, counter = _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+    return UUID(
+        int=(timestamp & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | random_bits
+    )
+
+
+def new_id() -> str:
+    """Return a new entity identifier as a string."""
+    return str(uuid7())
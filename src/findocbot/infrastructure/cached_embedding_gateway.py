@@ -9,8 +9,13 @@ from dataclasses import dataclass
 from hashlib import sha256
 from typing import TYPE_CHECKING, Any
 
+from findocbot.domain.exceptions import StorageError
+
 if TYPE_CHECKING:
-    from findocbot.use_cases.ports import ModelProviderGateway
+    from findocbot.use_cases.ports import (
+        EmbeddingStorePort,
+        ModelProviderGateway,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +28,8 @@ class CacheStats:
     misses: int
     size: int
     max_size: int
+    store_hits: int = 0
+    store_misses: int = 0
 
     @property
     def hit_rate(self) -> float:
@@ -31,19 +38,54 @@ class CacheStats:
         return self.hits / total if total > 0 else 0.0
 
 
+def normalize_text(text: str) -> str:
+    """Collapse whitespace runs so layout-only differences share a key."""
+    return " ".join(text.split())
+
+
 class CachedEmbeddingGateway:
-    """Wrapper that caches embeddings for repeated queries."""
+    """Wrapper that caches embeddings for repeated queries.
+
+    Query embeddings live in a per-process LRU. With a durable *store*,
+    both ``embed_one`` and ``embed_many`` also consult it, so repeated
+    boilerplate chunks survive restarts and are shared between worker
+    processes. Only ``embed_many`` writes misses back, in slices, so when
+    a large upload fails part-way, the slices finished before the
+    failure are store hits on the next attempt. Query vectors are never
+    stored: every distinct question would otherwise grow the table
+    without bound.
+    """
 
     def __init__(
         self,
         gateway: ModelProviderGateway,
         cache_size: int = 1000,
         ttl_seconds: int | None = None,
+        store: EmbeddingStorePort | None = None,
+        model: str = "",
+        store_flush_size: int = 500,
     ) -> None:
-        """Store gateway and configure cache size and TTL."""
+        """Store gateway and configure cache size and TTL.
+
+        Args:
+            gateway: Provider that computes embeddings on a miss.
+            cache_size: Maximum LRU entries for query embeddings.
+            ttl_seconds: LRU entry lifetime; ``None`` disables expiry.
+            store: Optional durable embedding store.
+            model: Embedding model name; part of the store key so a model
+                change never serves stale vectors.
+            store_flush_size: Store misses sent upstream per
+                ``embed_many`` call and written to the store together.
+                Use a multiple of the provider's batch size.
+        """
         self._gateway = gateway
         self._cache_size = cache_size
         self._ttl_seconds = ttl_seconds
+        self._store = store
+        self._model = model
+        self._store_flush_size = max(1, store_flush_size)
+        self._store_hits = 0
+        self._store_misses = 0
         # Cache stores (embedding, timestamp) tuples
         self._cache: OrderedDict[str, tuple[list[float], float]] = (
             OrderedDict()
@@ -76,6 +118,11 @@ class CachedEmbeddingGateway:
         """Convert text to deterministic cache key."""
         return sha256(text.encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _store_key(text: str) -> str:
+        """Digest of the normalized text, used as the durable store key."""
+        return sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
     def _is_expired(self, timestamp: float) -> bool:
         """Check if cache entry has expired based on TTL."""
         if self._ttl_seconds is None:
@@ -100,7 +147,12 @@ class CachedEmbeddingGateway:
         # No single-flight lock here: concurrent identical misses may each
         # call the backend. Embeddings are idempotent, so the only cost is a
         # duplicate request — an accepted trade-off vs. per-key locking.
-        result = await self._gateway.embed_one(text)
+        if self._store is not None:
+            result = (
+                await self._embed_through_store([text], write_back=False)
+            )[0]
+        else:
+            result = await self._gateway.embed_one(text)
 
         self._cache[cache_key] = (result, time.time())
 
@@ -116,11 +168,70 @@ class CachedEmbeddingGateway:
             misses=self._misses,
             size=len(self._cache),
             max_size=self._cache_size,
+            store_hits=self._store_hits,
+            store_misses=self._store_misses,
         )
 
     async def embed_many(self, texts: list[str]) -> list[list[float]]:
-        """Embed many texts without caching (used for document chunks)."""
-        return await self._gateway.embed_many(texts)
+        """Embed document chunks, reusing stored vectors when configured.
+
+        Without a durable store this is a pass-through: chunk texts are
+        mostly unique, so they would only churn the query LRU.
+        """
+        if self._store is None or not texts:
+            return await self._gateway.embed_many(texts)
+        return await self._embed_through_store(texts)
+
+    async def _embed_through_store(
+        self, texts: list[str], write_back: bool = True
+    ) -> list[list[float]]:
+        """Serve store hits and send only the distinct misses upstream.
+
+        Hits and misses are both counted per distinct normalized text.
+        """
+        assert self._store is not None
+        keys = [self._store_key(text) for text in texts]
+        distinct = list(dict.fromkeys(keys))
+        try:
+            found = await self._store.get_many(self._model, distinct)
+        except StorageError:
+            logger.warning("Embedding store lookup failed", exc_info=True)
+            found = {}
+
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in found:
+                missing.setdefault(key, text)
+        self._store_hits += len(distinct) - len(missing)
+        self._store_misses += len(missing)
+
+        pending = list(missing.items())
+        for start in range(0, len(pending), self._store_flush_size):
+            found.update(
+                await self._embed_and_store(
+                    pending[start : start + self._store_flush_size],
+                    write_back,
+                )
+            )
+        return [found[key] for key in keys]
+
+    async def _embed_and_store(
+        self, pending: list[tuple[str, str]], write_back: bool
+    ) -> dict[str, list[float]]:
+        """Embed one slice of ``(key, text)`` misses, storing on request."""
+        assert self._store is not None
+        vectors = await self._gateway.embed_many([text for _, text in pending])
+        fresh = {
+            key: vector
+            for (key, _), vector in zip(pending, vectors, strict=True)
+        }
+        if not write_back:
+            return fresh
+        try:
+            await self._store.put_many(self._model, fresh)
+        except StorageError:
+            logger.warning("Embedding store write failed", exc_info=True)
+        return fresh
 
     async def generate_structured(
         self,
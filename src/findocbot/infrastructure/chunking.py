@@ -1,11 +1,91 @@
 """Token-oriented chunking with paragraph awareness."""
 
 import re
+from bisect import bisect_right
+from collections.abc import Generator, Iterable, Iterator
+from typing import NamedTuple
 
+from findocbot.use_cases.ports import ChunkSpan
+
+PARAGRAPH_PATTERN = re.compile(r"\n{2,}")
 TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
 SECTION_PATTERN = re.compile(r"^(section|chapter)\b", re.IGNORECASE)
 
 
+class _Part(NamedTuple):
+    """A chunk part and the (start, end) offsets of its tokens.
+
+    ``source`` holds the same tokens' offsets in the normalized text,
+    i.e. all paragraphs joined by blank lines.
+    """
+
+    text: str
+    spans: list[tuple[int, int]]
+    source: list[tuple[int, int]]
+
+
+class _Piece(NamedTuple):
+    """A finished chunk and the extent of its tokens in the source."""
+
+    text: str
+    section: str | None
+    start: int
+    end: int
+
+
+def _token_spans(text: str) -> list[tuple[int, int]]:
+    return [match.span() for match in TOKEN_PATTERN.finditer(text)]
+
+
+def _paragraphs(pages: Iterable[str]) -> Iterator[str]:
+    return (
+        p.strip()
+        for page in pages
+        for p in PARAGRAPH_PATTERN.split(page)
+        if p.strip()
+    )
+
+
+def _parts_piece(parts: list[_Part], section: str | None) -> _Piece:
+    source = [span for part in parts for span in part.source]
+    if not source:
+        return _Piece(_join_parts(parts), section, 0, 0)
+    return _Piece(_join_parts(parts), section, source[0][0], source[-1][1])
+
+
+class _NormalizedText:
+    """Paragraphs joined by blank lines, sliceable while still growing."""
+
+    def __init__(self) -> None:
+        self._paragraphs: list[str] = []
+        self._offsets: list[int] = []
+        self.length = 0
+
+    def append(self, paragraph: str) -> int:
+        """Add *paragraph* and return its offset."""
+        if self._paragraphs:
+            self.length += 2
+        self._paragraphs.append(paragraph)
+        self._offsets.append(self.length)
+        self.length += len(paragraph)
+        return self._offsets[-1]
+
+    def slice(self, start: int, end: int) -> str:
+        first = max(0, bisect_right(self._offsets, start) - 1)
+        last = bisect_right(self._offsets, end - 1)
+        base = self._offsets[first]
+        text = "\n\n".join(self._paragraphs[first:last])
+        return text[start - base : end - base]
+
+
+def _count_part_tokens(parts: list[_Part]) -> int:
+    return sum(len(part.spans) for part in parts)
+
+
+def _join_parts(parts: list[_Part]) -> str:
+    return "\n\n".join(part.text for part in parts).strip()
+
+
 class ParagraphTokenChunker:
     """Split text into chunks while preserving paragraph/section boundaries."""
 
@@ -22,28 +102,105 @@ class ParagraphTokenChunker:
 
     def split(self, text: str) -> list[tuple[str, str | None]]:
         """Return chunks as (text, section) pairs."""
-        paragraphs = [
-            p.strip() for p in re.split(r"\n{2,}", text) if p.strip()
-        ]
-        chunks: list[tuple[str, str | None]] = []
-        current_parts: list[str] = []
+        return list(self.iter_chunks([text]))
+
+    def iter_chunks(
+        self, pages: Iterable[str]
+    ) -> Iterator[tuple[str, str | None]]:
+        """Yield chunks incrementally while consuming *pages* lazily.
+
+        Produces exactly what ``split`` returns for the pages joined by
+        blank lines. The most recent chunk is held back by one step
+        because an undersized tail is merged into it.
+        """
+        for piece in self._iter_pieces(_paragraphs(pages), _NormalizedText()):
+            yield piece.text, piece.section
+
+    def normalize(self, pages: Iterable[str]) -> str:
+        """Return the text ``iter_spans`` offsets refer to."""
+        return "\n\n".join(_paragraphs(pages))
+
+    def iter_spans(self, pages: Iterable[str]) -> Iterator[ChunkSpan]:
+        """Yield the chunks of ``iter_chunks`` as slices of the source.
+
+        Each chunk covers the same tokens as in ``iter_chunks``, but its
+        text is ``normalize(pages)[start:end]``, so tokens keep their
+        original spacing instead of being re-joined with single spaces.
+        """
+        normalized = _NormalizedText()
+        for piece in self._iter_pieces(_paragraphs(pages), normalized):
+            yield ChunkSpan(
+                text=normalized.slice(piece.start, piece.end),
+                section=piece.section,
+                start=piece.start,
+                end=piece.end,
+            )
+
+    def _iter_pieces(
+        self, paragraphs: Iterable[str], normalized: _NormalizedText
+    ) -> Iterator[_Piece]:
+        flushed = self._iter_flushed(paragraphs, normalized)
+        previous: _Piece | None = None
+        while True:
+            try:
+                chunk = next(flushed)
+            except StopIteration as stop:
+                tail: _Piece | None = stop.value
+                break
+            if previous is not None:
+                yield previous
+            previous = chunk
+
+        if tail is not None:
+            if (
+                self._count_tokens(tail.text) >= self._min_chunk_tokens
+                or previous is None
+            ):
+                if previous is not None:
+                    yield previous
+                previous = tail
+            else:
+                merged_text = "\n\n".join([previous.text, tail.text]).strip()
+                previous = _Piece(
+                    merged_text, previous.section, previous.start, tail.end
+                )
+        if previous is not None:
+            yield previous
+
+    def _iter_flushed(
+        self, paragraphs: Iterable[str], normalized: _NormalizedText
+    ) -> Generator[_Piece, None, _Piece | None]:
+        """Yield full chunks; return the unflushed tail, if any.
+
+        Each paragraph is tokenized once. Chunk sizes are running sums of
+        per-part token counts — tokens never span the blank lines that
+        join parts — so no candidate text is re-joined or re-tokenized.
+        """
+        current_parts: list[_Part] = []
+        current_tokens = 0
         current_section: str | None = None
 
         for paragraph in paragraphs:
+            offset = normalized.append(paragraph)
+            spans = _token_spans(paragraph)
+            part = _Part(
+                paragraph,
+                spans,
+                [(offset + start, offset + end) for start, end in spans],
+            )
             maybe_section = self._extract_section(paragraph)
-            candidate = "\n\n".join([*current_parts, paragraph]).strip()
-            if self._count_tokens(candidate) <= self._chunk_tokens:
-                current_parts.append(paragraph)
+            if current_tokens + len(part.spans) <= self._chunk_tokens:
+                current_parts.append(part)
+                current_tokens += len(part.spans)
                 if maybe_section is not None:
                     current_section = maybe_section
                 continue
 
             if current_parts:
-                chunk_text = "\n\n".join(current_parts).strip()
                 # Use the section that was active *before* this paragraph
                 # (current_section has not been updated yet).
-                chunks.append((chunk_text, current_section))
-                current_parts = self._build_overlap(chunk_text)
+                yield _parts_piece(current_parts, current_section)
+                current_parts = self._build_overlap(current_parts)
 
                 # If the incoming paragraph does not fit within the
                 # remaining token budget, split it immediately and
@@ -51,120 +208,146 @@ class ParagraphTokenChunker:
                 # flushing a duplicate overlap-only chunk and prevents
                 # an oversized final chunk.
                 handled = self._try_split_oversized_after_flush(
-                    paragraph=paragraph,
+                    part=part,
                     maybe_section=maybe_section,
                     current_parts=current_parts,
                     current_section=current_section,
                 )
                 if handled is not None:
-                    chunks.extend(handled[0])
+                    yield from handled[0]
                     current_parts = handled[1]
                     current_section = handled[2]
+                    current_tokens = _count_part_tokens(current_parts)
                     continue
             else:
                 if maybe_section is not None:
                     current_section = maybe_section
-                chunks.extend(
-                    self._split_long_paragraph(paragraph, current_section)
-                )
+                yield from self._split_long_paragraph(part, current_section)
                 continue
 
             # Only now update the section for the new paragraph being added.
             current_section, current_parts = self._append_to_current(
-                paragraph=paragraph,
+                part=part,
                 maybe_section=maybe_section,
                 current_parts=current_parts,
                 current_section=current_section,
             )
+            current_tokens = _count_part_tokens(current_parts)
 
         if current_parts:
-            last_chunk = "\n\n".join(current_parts).strip()
-            if (
-                self._count_tokens(last_chunk) >= self._min_chunk_tokens
-                or not chunks
-            ):
-                chunks.append((last_chunk, current_section))
-            else:
-                merged_text = "\n\n".join([chunks[-1][0], last_chunk]).strip()
-                chunks[-1] = (merged_text, chunks[-1][1])
-        return chunks
+            return _parts_piece(current_parts, current_section)
+        return None
 
     @staticmethod
     def _append_to_current(
-        paragraph: str,
+        part: _Part,
         maybe_section: str | None,
-        current_parts: list[str],
+        current_parts: list[_Part],
         current_section: str | None,
-    ) -> tuple[str | None, list[str]]:
-        """Update section and append *paragraph* to *current_parts*."""
+    ) -> tuple[str | None, list[_Part]]:
+        """Update section and append *part* to *current_parts*."""
         section = (
             maybe_section if maybe_section is not None else current_section
         )
-        if paragraph not in current_parts:
-            current_parts.append(paragraph)
+        if all(existing.text != part.text for existing in current_parts):
+            current_parts.append(part)
         return section, current_parts
 
     def _try_split_oversized_after_flush(
         self,
-        paragraph: str,
+        part: _Part,
         maybe_section: str | None,
-        current_parts: list[str],
+        current_parts: list[_Part],
         current_section: str | None,
-    ) -> tuple[list[tuple[str, str | None]], list[str], str | None] | None:
-        """Split *paragraph* if it exceeds the remaining token budget.
+    ) -> tuple[list[_Piece], list[_Part], str | None] | None:
+        """Split *part* if it exceeds the remaining token budget.
 
         Called right after flushing *current_parts* and building the
         overlap.  Returns new pieces, updated *current_parts*, and
         updated *current_section* when a split was performed, or
         ``None`` when the paragraph fits and should be appended normally.
         """
-        overlap_size = (
-            self._count_tokens("\n\n".join(current_parts))
-            if current_parts
-            else 0
-        )
-        if self._count_tokens(paragraph) <= self._chunk_tokens - overlap_size:
+        overlap_size = _count_part_tokens(current_parts)
+        if len(part.spans) <= self._chunk_tokens - overlap_size:
             return None
 
         section = (
             maybe_section if maybe_section is not None else current_section
         )
-        pieces = self._split_long_paragraph(paragraph, section)
+        pieces = self._split_long_paragraph(part, section)
         if pieces and current_parts:
-            first_text, first_section = pieces[0]
-            merged = "\n\n".join([*current_parts, first_text]).strip()
-            pieces[0] = (merged, first_section)
+            first = pieces[0]
+            merged = "\n\n".join([
+                *(existing.text for existing in current_parts),
+                first.text,
+            ]).strip()
+            pieces[0] = _Piece(
+                merged,
+                first.section,
+                _parts_piece(current_parts, None).start,
+                first.end,
+            )
             current_parts = []
         return pieces, current_parts, section
 
     def _split_long_paragraph(
         self,
-        paragraph: str,
+        part: _Part,
         section: str | None,
-    ) -> list[tuple[str, str | None]]:
-        tokens = TOKEN_PATTERN.findall(paragraph)
-        if len(tokens) <= self._chunk_tokens:
-            return [(paragraph, section)]
+    ) -> list[_Piece]:
+        spans = part.spans
+        if len(spans) <= self._chunk_tokens:
+            return [_parts_piece([part], section)]
 
-        parts: list[tuple[str, str | None]] = []
+        parts: list[_Piece] = []
         start = 0
-        while start < len(tokens):
-            end = min(len(tokens), start + self._chunk_tokens)
-            piece = " ".join(tokens[start:end]).strip()
+        while start < len(spans):
+            end = min(len(spans), start + self._chunk_tokens)
+            piece = " ".join(
+                part.text[token_start:token_end]
+                for token_start, token_end in spans[start:end]
+            ).strip()
             if piece:
-                parts.append((piece, section))
-            if end >= len(tokens):
+                parts.append(
+                    _Piece(
+                        piece,
+                        section,
+                        part.source[start][0],
+                        part.source[end - 1][1],
+                    )
+                )
+            if end >= len(spans):
                 break
             start = max(0, end - self._overlap_tokens)
         return parts
 
-    def _build_overlap(self, chunk_text: str) -> list[str]:
-        overlap_tokens = TOKEN_PATTERN.findall(chunk_text)[
-            -self._overlap_tokens :
-        ]
-        if not overlap_tokens:
+    def _build_overlap(self, parts: list[_Part]) -> list[_Part]:
+        """Return the last ``overlap_tokens`` tokens as one space-joined part.
+
+        Only the trailing parts are visited, and the offsets of the new
+        part follow from the token lengths.
+        """
+        tokens: list[str] = []
+        source: list[tuple[int, int]] = []
+        for part in reversed(parts):
+            needed = self._overlap_tokens - len(tokens)
+            if needed <= 0:
+                break
+            tokens.extend(
+                part.text[start:end]
+                for start, end in reversed(part.spans[-needed:])
+            )
+            source.extend(reversed(part.source[-needed:]))
+        if not tokens:
             return []
-        return [" ".join(overlap_tokens)]
+        tokens.reverse()
+        source.reverse()
+        spans: list[tuple[int, int]] = []
+        position = 0
+        for token in tokens:
+            spans.append((position, position + len(token)))
+            position += len(token) + 1
+        return [_Part(" ".join(tokens), spans, source)]
 
     @staticmethod
     def _count_tokens(text: str) -> int:
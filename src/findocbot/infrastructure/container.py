@@ -1,5 +1,6 @@
 """Dependency container wiring."""
 
+import asyncio
 from dataclasses import dataclass
 
 from findocbot.config import Settings
@@ -8,19 +9,49 @@ from findocbot.infrastructure.cached_embedding_gateway import (
 )
 from findocbot.infrastructure.chunking import ParagraphTokenChunker
 from findocbot.infrastructure.db import PostgresPool
+from findocbot.infrastructure.ingest_worker import IngestWorkerPool
+from findocbot.infrastructure.minhash import MinHashDetector
 from findocbot.infrastructure.ollama_gateway import OllamaGateway
 from findocbot.infrastructure.pdf_parser import PyPDFParser
 from findocbot.infrastructure.postgres_repositories import (
+    DocumentTextCache,
     PostgresChatHistoryRepository,
     PostgresChunkRepository,
     PostgresDocumentRepository,
+    PostgresEmbeddingStore,
+    PostgresIngestJobRepository,
+    PostgresPageTextStore,
+    PostgresUnitOfWork,
 )
+from findocbot.infrastructure.sandboxed_pdf_parser import (
+    SandboxedPDFParser,
+)
+from findocbot.infrastructure.sqlite_embedding_store import (
+    SqliteEmbeddingStore,
+)
+from findocbot.infrastructure.upload_store import LocalUploadStore
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
-from findocbot.use_cases.ports import ModelProviderGateway
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
+from findocbot.use_cases.ingest_jobs import (
+    EnqueueUploadUseCase,
+    GetIngestJobUseCase,
+    ProcessIngestJobUseCase,
+)
+from findocbot.use_cases.near_duplicates import NearDuplicateFilter
+from findocbot.use_cases.ports import (
+    EmbeddingStorePort,
+    ModelProviderGateway,
+)
+from findocbot.use_cases.rechunk_document import RechunkDocumentUseCase
+from findocbot.use_cases.replace_document import ReplaceDocumentUseCase
+from findocbot.use_cases.resumable_upload import ResumableUploadUseCase
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
 )
-from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+from findocbot.use_cases.upload_pdf import (
+    IngestPipelineOptions,
+    UploadPDFUseCase,
+)
 
 
 @dataclass
@@ -33,39 +64,110 @@ class AppContainer:
     upload_pdf: UploadPDFUseCase
     search_chunks: SearchSimilarChunksUseCase
     answer_question: AnswerQuestionUseCase
+    bulk_upload: BulkUploadUseCase | None = None
+    rechunk_document: RechunkDocumentUseCase | None = None
+    replace_document: ReplaceDocumentUseCase | None = None
+    enqueue_upload: EnqueueUploadUseCase | None = None
+    resumable_upload: ResumableUploadUseCase | None = None
+    get_ingest_job: GetIngestJobUseCase | None = None
+    ingest_workers: IngestWorkerPool | None = None
+    parser: PyPDFParser | SandboxedPDFParser | None = None
 
     async def startup(self) -> None:
         """Initialize external resources."""
         await self.db.start()
         await self.provider.start()
+        if self.ingest_workers is not None:
+            await self.ingest_workers.start()
 
     async def shutdown(self) -> None:
         """Shutdown external resources."""
+        if self.ingest_workers is not None:
+            await self.ingest_workers.stop()
+        if self.parser is not None:
+            await asyncio.to_thread(self.parser.stop)
         await self.provider.stop()
         await self.db.stop()
 
 
+def _create_embedding_store(
+    settings: Settings, db: PostgresPool
+) -> EmbeddingStorePort | None:
+    if settings.embedding_store == "postgres":
+        return PostgresEmbeddingStore(db)
+    if settings.embedding_store == "sqlite":
+        return SqliteEmbeddingStore(settings.embedding_store_sqlite_path)
+    return None
+
+
 def create_container(settings: Settings) -> AppContainer:
     """Wire use-cases with concrete infrastructure implementations."""
     db = PostgresPool(str(settings.postgres_dsn))
-    parser = PyPDFParser()
-    chunker = ParagraphTokenChunker(chunk_tokens=300, overlap_ratio=0.15)
+    parser: PyPDFParser | SandboxedPDFParser = (
+        SandboxedPDFParser(
+            workers=settings.pdf_sandbox_workers,
+            timeout_seconds=settings.pdf_sandbox_timeout_seconds,
+            page_timeout_seconds=settings.pdf_sandbox_page_timeout_seconds,
+            memory_limit_mb=settings.pdf_sandbox_memory_limit_mb,
+            recycle_after=settings.pdf_sandbox_recycle_after,
+        )
+        if settings.pdf_sandbox_enabled
+        else PyPDFParser(
+            workers=settings.pdf_parser_workers,
+            parallel_min_pages=settings.pdf_parallel_min_pages,
+        )
+    )
+    chunker = ParagraphTokenChunker(
+        chunk_tokens=settings.chunk_tokens,
+        overlap_ratio=settings.chunk_overlap_ratio,
+    )
 
     ollama_gateway = OllamaGateway(
         base_url=settings.ollama_base_url,
         chat_model=settings.ollama_chat_model,
         embed_model=settings.ollama_embed_model,
         batch_size=settings.embedding_batch_size,
+        max_in_flight=settings.embedding_max_in_flight,
+        token_budget=settings.embedding_batch_token_budget,
+        adaptive_batching=settings.embedding_batch_adaptive,
+        max_retries=settings.embedding_max_retries,
+        retry_backoff_seconds=settings.embedding_retry_backoff_seconds,
     )
     provider = CachedEmbeddingGateway(
         gateway=ollama_gateway,
         cache_size=settings.embedding_cache_size,
         ttl_seconds=settings.embedding_cache_ttl_seconds,
+        store=_create_embedding_store(settings, db),
+        model=settings.ollama_embed_model,
+        store_flush_size=settings.embedding_store_flush_size,
     )
 
     documents = PostgresDocumentRepository(db)
-    chunks = PostgresChunkRepository(db)
+    text_cache = DocumentTextCache(
+        max_documents=settings.document_text_cache_size
+    )
+    chunks = PostgresChunkRepository(
+        db,
+        copy_batch_size=settings.chunk_copy_batch_size,
+        text_cache=text_cache,
+        exact_search_max_rows=settings.search_exact_max_rows,
+        hnsw_max_scan_tuples=settings.search_hnsw_max_scan_tuples,
+        ef_search=settings.search_ef_search,
+        embedding_index=settings.embedding_index,
+        rerank_factor=settings.halfvec_rerank_factor,
+    )
     history = PostgresChatHistoryRepository(db)
+    near_duplicates = (
+        NearDuplicateFilter(
+            detector=MinHashDetector(
+                threshold=settings.near_duplicate_threshold
+            ),
+            chunks=chunks,
+            policy=settings.near_duplicate_policy,
+        )
+        if settings.near_duplicate_policy != "off"
+        else None
+    )
 
     search_chunks = SearchSimilarChunksUseCase(
         provider=provider, chunks=chunks
@@ -75,15 +177,62 @@ def create_container(settings: Settings) -> AppContainer:
         search_use_case=search_chunks,
         history=history,
         max_history_pairs=settings.max_history_pairs,
+        ef_search=settings.ask_ef_search,
+    )
+    page_texts = PostgresPageTextStore(db)
+    unit_of_work = PostgresUnitOfWork(
+        db,
+        copy_batch_size=settings.chunk_copy_batch_size,
+        text_cache=text_cache,
     )
     upload_pdf = UploadPDFUseCase(
         parser=parser,
         chunker=chunker,
         provider=provider,
         documents=documents,
-        chunks=chunks,
+        unit_of_work=unit_of_work,
+        pipeline=(
+            IngestPipelineOptions(
+                embed_batch_size=settings.embedding_batch_size,
+                persist_batch_size=settings.ingest_persist_batch_size,
+                queue_size=settings.ingest_queue_size,
+            )
+            if settings.ingest_pipeline_enabled
+            else None
+        ),
+        record_aliases=settings.dedup_record_aliases,
+        store_page_text=settings.page_text_cache_enabled,
+        near_duplicates=near_duplicates,
+        store_chunk_spans=settings.chunk_span_storage,
     )
 
+    ingest_jobs = PostgresIngestJobRepository(
+        db,
+        stale_after_seconds=settings.ingest_job_stale_after_seconds,
+        max_attempts=settings.ingest_job_max_attempts,
+    )
+    ingest_workers = (
+        IngestWorkerPool(
+            process_job=ProcessIngestJobUseCase(
+                jobs=ingest_jobs,
+                upload=upload_pdf,
+                heartbeat_seconds=settings.ingest_job_heartbeat_seconds,
+            ),
+            concurrency=settings.ingest_workers,
+            poll_interval_seconds=settings.ingest_poll_interval_seconds,
+        )
+        if settings.ingest_async and settings.ingest_workers > 0
+        else None
+    )
+
+    enqueue_upload = (
+        EnqueueUploadUseCase(
+            jobs=ingest_jobs,
+            max_bytes=settings.ingest_job_max_mb * 1024 * 1024,
+        )
+        if settings.ingest_async
+        else None
+    )
     return AppContainer(
         settings=settings,
         db=db,
@@ -91,4 +240,50 @@ def create_container(settings: Settings) -> AppContainer:
         upload_pdf=upload_pdf,
         search_chunks=search_chunks,
         answer_question=answer_question,
+        parser=parser,
+        bulk_upload=BulkUploadUseCase(
+            parser=parser,
+            chunker=chunker,
+            provider=provider,
+            documents=documents,
+            unit_of_work=unit_of_work,
+            parse_concurrency=settings.bulk_parse_concurrency,
+            batch_files=settings.bulk_upload_batch_files,
+            record_aliases=settings.dedup_record_aliases,
+            store_page_text=settings.page_text_cache_enabled,
+            near_duplicates=near_duplicates,
+            store_chunk_spans=settings.chunk_span_storage,
+        ),
+        rechunk_document=RechunkDocumentUseCase(
+            chunker=chunker,
+            provider=provider,
+            documents=documents,
+            chunks=chunks,
+            page_texts=page_texts,
+            unit_of_work=unit_of_work,
+            near_duplicates=near_duplicates,
+            store_chunk_spans=settings.chunk_span_storage,
+        ),
+        replace_document=ReplaceDocumentUseCase(
+            parser=parser,
+            chunker=chunker,
+            provider=provider,
+            documents=documents,
+            chunks=chunks,
+            page_texts=page_texts,
+            unit_of_work=unit_of_work,
+            near_duplicates=near_duplicates,
+            store_chunk_spans=settings.chunk_span_storage,
+            store_page_text=settings.page_text_cache_enabled,
+        ),
+        enqueue_upload=enqueue_upload,
+        resumable_upload=ResumableUploadUseCase(
+            store=LocalUploadStore(settings.resumable_upload_dir),
+            upload=upload_pdf,
+            enqueue=enqueue_upload,
+            max_bytes=settings.resumable_upload_max_mb * 1024 * 1024,
+            ttl_seconds=settings.resumable_upload_ttl_seconds,
+        ),
+        get_ingest_job=GetIngestJobUseCase(jobs=ingest_jobs),
+        ingest_workers=ingest_workers,
     )
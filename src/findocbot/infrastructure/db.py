@@ -1,7 +1,79 @@
 """PostgreSQL connection management."""
 
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
 import asyncpg
 
+# pgvector binary wire format: uint16 dimensions, uint16 reserved, then
+# big-endian float32 (vector) or float16 (halfvec) components.
+_VECTOR_HEADER = struct.Struct(">HH")
+_SWAP_BYTES = sys.byteorder == "little"
+
+
+def _encode_vector(values: Sequence[float]) -> bytes:
+    components = array("f", values)
+    if _SWAP_BYTES:
+        components.byteswap()
+    return _VECTOR_HEADER.pack(len(components), 0) + components.tobytes()
+
+
+def _decode_vector(data: bytes) -> list[float]:
+    dimensions, _ = _VECTOR_HEADER.unpack_from(data)
+    components = array("f")
+    components.frombytes(data[_VECTOR_HEADER.size :])
+    if _SWAP_BYTES:
+        components.byteswap()
+    if len(components) != dimensions:
+        raise ValueError("Malformed vector value.")
+    return components.tolist()
+
+
+def _encode_halfvec(values: Sequence[float]) -> bytes:
+    return struct.pack(f">HH{len(values)}e", len(values), 0, *values)
+
+
+def _decode_halfvec(data: bytes) -> list[float]:
+    dimensions, _ = _VECTOR_HEADER.unpack_from(data)
+    return list(
+        struct.unpack_from(f">{dimensions}e", data, _VECTOR_HEADER.size)
+    )
+
+
+_VECTOR_CODECS = {
+    "vector": (_encode_vector, _decode_vector),
+    "halfvec": (_encode_halfvec, _decode_halfvec),
+}
+
+
+async def _register_vector_codecs(conn: asyncpg.Connection) -> None:
+    """Exchange pgvector values as packed binary lists of floats.
+
+    Types are looked up by name so the codecs follow the extension into
+    whatever schema it was installed in; ``halfvec`` only exists in
+    pgvector 0.7+, and neither exists before the first migration.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT t.typname, n.nspname
+        FROM pg_type t
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = ANY($1::text[])
+        """,
+        list(_VECTOR_CODECS),
+    )
+    for row in rows:
+        encoder, decoder = _VECTOR_CODECS[row["typname"]]
+        await conn.set_type_codec(
+            row["typname"],
+            schema=row["nspname"],
+            encoder=encoder,
+            decoder=decoder,
+            format="binary",
+        )
+
 
 class PostgresPool:
     """Thin wrapper around asyncpg pool lifecycle."""
@@ -15,7 +87,10 @@ class PostgresPool:
         """Create asyncpg pool if missing."""
         if self._pool is None:
             self._pool = await asyncpg.create_pool(
-                dsn=self._dsn, min_size=1, max_size=5
+                dsn=self._dsn,
+                min_size=1,
+                max_size=5,
+                init=_register_vector_codecs,
             )
 
     async def stop(self) -> None:
@@ -1,9 +1,18 @@
 """In-memory adapters used in tests and local dry runs."""
 
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
 
-from findocbot.domain.entities import ChatTurn, Chunk, Document
-from findocbot.use_cases.ports import ChunkWithScore
+from findocbot.domain.entities import ChatTurn, Chunk, Document, IngestJob
+from findocbot.domain.exceptions import DuplicateDocumentError
+from findocbot.use_cases.ports import (
+    ChunkWithScore,
+    MinHashSketch,
+    SearchFilters,
+    TransactionScope,
+)
 
 
 def _cosine_similarity(a: list[float], b: list[float]) -> float:
@@ -21,28 +30,83 @@ class InMemoryDocumentRepository:
     def __init__(self) -> None:
         """Initialize in-memory document storage."""
         self.items: dict[str, Document] = {}
+        self.aliases: dict[str, set[str]] = {}
 
     async def create(self, document: Document) -> None:
         """Store document entity."""
+        if (
+            document.content_sha256 is not None
+            and await self.get_by_digest(document.content_sha256) is not None
+        ):
+            raise DuplicateDocumentError(
+                "A document with the same content already exists"
+            )
         self.items[document.id] = document
 
     async def delete(self, document_id: str) -> None:
         """Remove document entity by id."""
         self.items.pop(document_id, None)
+        self.aliases.pop(document_id, None)
+
+    async def get(self, document_id: str) -> Document | None:
+        """Return document by id."""
+        return self.items.get(document_id)
+
+    async def update(self, document: Document) -> None:
+        """Replace stored document entity."""
+        owner = (
+            await self.get_by_digest(document.content_sha256)
+            if document.content_sha256 is not None
+            else None
+        )
+        if owner is not None and owner.id != document.id:
+            raise DuplicateDocumentError(
+                "A document with the same content already exists"
+            )
+        self.items[document.id] = document
+
+    async def list_ids(self) -> list[str]:
+        """Return document ids, oldest first."""
+        documents = sorted(self.items.values(), key=lambda d: d.created_at)
+        return [document.id for document in documents]
+
+    async def get_by_digest(self, content_sha256: str) -> Document | None:
+        """Return document with matching content digest."""
+        return next(
+            (
+                document
+                for document in self.items.values()
+                if document.content_sha256 == content_sha256
+            ),
+            None,
+        )
+
+    async def add_alias(self, document_id: str, filename: str) -> None:
+        """Record alternative filename."""
+        self.aliases.setdefault(document_id, set()).add(filename)
 
 
 @dataclass
 class _StoredChunk:
     chunk: Chunk
     embedding: list[float]
+    sketch: MinHashSketch | None = None
 
 
 class InMemoryChunkRepository:
     """Simple chunk repository for tests."""
 
-    def __init__(self) -> None:
-        """Initialize in-memory chunk storage."""
+    def __init__(
+        self, documents: InMemoryDocumentRepository | None = None
+    ) -> None:
+        """Initialize in-memory chunk storage.
+
+        Args:
+            documents: Documents whose upload dates date filters use;
+                without it, date-filtered searches match nothing.
+        """
         self.items: list[_StoredChunk] = []
+        self._documents = documents
 
     async def add_chunks_with_embeddings(
         self,
@@ -57,10 +121,34 @@ class InMemoryChunkRepository:
         self,
         embedding: list[float],
         top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
     ) -> list[ChunkWithScore]:
-        """Return top-k chunks sorted by cosine similarity."""
-        ranked = sorted(
+        """Return top-k canonical chunks sorted by cosine similarity.
+
+        Document and section filters also match linked chunks, keeping
+        one chunk per near-duplicate group and preferring the canonical
+        one. The ranking is exact, so *ef_search* has no effect.
+        """
+        include_linked = filters is not None and (
+            filters.document_ids is not None or filters.section is not None
+        )
+        groups: dict[str, _StoredChunk] = {}
+        for item in sorted(
             self.items,
+            key=lambda item: item.chunk.canonical_chunk_id is not None,
+        ):
+            if (
+                item.chunk.canonical_chunk_id is not None
+                and not include_linked
+            ):
+                continue
+            if filters is not None and not self._matches(item.chunk, filters):
+                continue
+            group = item.chunk.canonical_chunk_id or item.chunk.id
+            groups.setdefault(group, item)
+        ranked = sorted(
+            groups.values(),
             key=lambda item: _cosine_similarity(item.embedding, embedding),
             reverse=True,
         )[:top_k]
@@ -72,6 +160,384 @@ class InMemoryChunkRepository:
             for entry in ranked
         ]
 
+    def _matches(self, chunk: Chunk, filters: SearchFilters) -> bool:
+        if (
+            filters.document_ids is not None
+            and chunk.document_id not in filters.document_ids
+        ):
+            return False
+        if filters.section is not None and not (
+            chunk.section or ""
+        ).casefold().startswith(filters.section.casefold()):
+            return False
+        if filters.uploaded_after is None and filters.uploaded_before is None:
+            return True
+        document = (
+            self._documents.items.get(chunk.document_id)
+            if self._documents is not None
+            else None
+        )
+        if document is None:
+            return False
+        after, before = filters.uploaded_after, filters.uploaded_before
+        return (after is None or document.created_at >= after) and (
+            before is None or document.created_at <= before
+        )
+
+    async def list_by_document(self, document_id: str) -> list[Chunk]:
+        """Return a document's chunks in index order."""
+        return sorted(
+            (
+                item.chunk
+                for item in self.items
+                if item.chunk.document_id == document_id
+            ),
+            key=lambda chunk: chunk.chunk_index,
+        )
+
+    async def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Drop chunks by id; their near-duplicates become canonical."""
+        doomed = set(chunk_ids)
+        self.items = [
+            item for item in self.items if item.chunk.id not in doomed
+        ]
+        for item in self.items:
+            if item.chunk.canonical_chunk_id in doomed:
+                item.chunk = replace(item.chunk, canonical_chunk_id=None)
+
+    async def reindex_chunks(self, positions: dict[str, int]) -> None:
+        """Replace chunks with copies at their new index."""
+        for item in self.items:
+            if item.chunk.id in positions:
+                item.chunk = replace(
+                    item.chunk, chunk_index=positions[item.chunk.id]
+                )
+
+    async def add_sketches(self, sketches: dict[str, MinHashSketch]) -> None:
+        """Attach sketches to stored chunks."""
+        for item in self.items:
+            if item.chunk.id in sketches:
+                item.sketch = sketches[item.chunk.id]
+
+    async def find_near_duplicate_candidates(
+        self, band_keys: list[int]
+    ) -> list[tuple[Chunk, MinHashSketch]]:
+        """Return sketched canonical chunks sharing a band key."""
+        wanted = set(band_keys)
+        return [
+            (item.chunk, item.sketch)
+            for item in self.items
+            if item.sketch is not None
+            and item.chunk.canonical_chunk_id is None
+            and wanted.intersection(item.sketch.band_keys)
+        ]
+
+    async def get_embeddings(
+        self, chunk_ids: list[str]
+    ) -> dict[str, list[float]]:
+        """Return vectors of the stored chunks among *chunk_ids*."""
+        wanted = set(chunk_ids)
+        return {
+            item.chunk.id: item.embedding
+            for item in self.items
+            if item.chunk.id in wanted
+        }
+
+    async def respan_chunks(self, spans: dict[str, tuple[int, int]]) -> None:
+        """Replace chunks with copies pointing at their new span."""
+        for item in self.items:
+            if item.chunk.id in spans:
+                start, end = spans[item.chunk.id]
+                item.chunk = replace(
+                    item.chunk, span_start=start, span_end=end
+                )
+
+
+class InMemoryPageTextStore:
+    """Simple page text store for tests."""
+
+    def __init__(self) -> None:
+        """Initialize in-memory page text storage."""
+        self.items: dict[str, list[str]] = {}
+
+    async def get(self, content_sha256: str) -> list[str] | None:
+        """Return stored page texts."""
+        return self.items.get(content_sha256)
+
+    async def put(self, content_sha256: str, pages: list[str]) -> None:
+        """Store page texts, keeping an existing entry."""
+        self.items.setdefault(content_sha256, list(pages))
+
+    async def delete(self, content_sha256: str) -> None:
+        """Drop page texts."""
+        self.items.pop(content_sha256, None)
+
+
+class InMemoryDocumentTextStore:
+    """Simple document text store for tests."""
+
+    def __init__(self) -> None:
+        """Initialize in-memory document text storage."""
+        self.items: dict[str, str] = {}
+
+    async def get(self, document_id: str) -> str | None:
+        """Return the stored text."""
+        return self.items.get(document_id)
+
+    async def put(self, document_id: str, text: str) -> None:
+        """Store text, replacing an existing entry."""
+        self.items[document_id] = text
+
+    async def delete(self, document_id: str) -> None:
+        """Drop the stored text."""
+        self.items.pop(document_id, None)
+
+
+# Compensating actions of one in-memory transaction, run in reverse order.
+_UndoLog = list[Callable[[], None]]
+
+
+class _TransactionDocuments:
+    """Document repository view that logs how to undo its writes."""
+
+    def __init__(
+        self, inner: InMemoryDocumentRepository, undo: _UndoLog
+    ) -> None:
+        self._inner = inner
+        self._undo = undo
+
+    async def create(self, document: Document) -> None:
+        await self._inner.create(document)
+        self._undo.append(lambda: self._forget(document.id))
+
+    async def delete(self, document_id: str) -> None:
+        await self._inner.delete(document_id)
+
+    async def get(self, document_id: str) -> Document | None:
+        return await self._inner.get(document_id)
+
+    async def update(self, document: Document) -> None:
+        previous = self._inner.items[document.id]
+        await self._inner.update(document)
+        self._undo.append(
+            lambda: self._inner.items.__setitem__(previous.id, previous)
+        )
+
+    async def list_ids(self) -> list[str]:
+        return await self._inner.list_ids()
+
+    async def get_by_digest(self, content_sha256: str) -> Document | None:
+        return await self._inner.get_by_digest(content_sha256)
+
+    async def add_alias(self, document_id: str, filename: str) -> None:
+        await self._inner.add_alias(document_id, filename)
+
+    def _forget(self, document_id: str) -> None:
+        self._inner.items.pop(document_id, None)
+        self._inner.aliases.pop(document_id, None)
+
+
+class _TransactionChunks:
+    """Chunk repository view that logs how to undo its writes."""
+
+    def __init__(self, inner: InMemoryChunkRepository, undo: _UndoLog) -> None:
+        self._inner = inner
+        self._undo = undo
+
+    async def add_chunks_with_embeddings(
+        self,
+        chunks: list[Chunk],
+        embeddings: list[list[float]],
+    ) -> None:
+        await self._inner.add_chunks_with_embeddings(chunks, embeddings)
+        added = {chunk.id for chunk in chunks}
+        self._undo.append(lambda: self._drop(added))
+
+    async def search_by_embedding(
+        self,
+        embedding: list[float],
+        top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
+    ) -> list[ChunkWithScore]:
+        return await self._inner.search_by_embedding(
+            embedding, top_k, filters, ef_search
+        )
+
+    async def list_by_document(self, document_id: str) -> list[Chunk]:
+        return await self._inner.list_by_document(document_id)
+
+    async def delete_chunks(self, chunk_ids: list[str]) -> None:
+        doomed = set(chunk_ids)
+        removed = [
+            item for item in self._inner.items if item.chunk.id in doomed
+        ]
+        linked = {
+            id(item): item.chunk
+            for item in self._inner.items
+            if item.chunk.canonical_chunk_id in doomed
+        }
+        await self._inner.delete_chunks(chunk_ids)
+        self._undo.append(lambda: self._restore_deleted(removed, linked))
+
+    async def add_sketches(self, sketches: dict[str, MinHashSketch]) -> None:
+        await self._inner.add_sketches(sketches)
+        self._undo.append(lambda: self._forget_sketches(set(sketches)))
+
+    async def find_near_duplicate_candidates(
+        self, band_keys: list[int]
+    ) -> list[tuple[Chunk, MinHashSketch]]:
+        return await self._inner.find_near_duplicate_candidates(band_keys)
+
+    async def get_embeddings(
+        self, chunk_ids: list[str]
+    ) -> dict[str, list[float]]:
+        return await self._inner.get_embeddings(chunk_ids)
+
+    async def respan_chunks(self, spans: dict[str, tuple[int, int]]) -> None:
+        previous = {
+            item.chunk.id: item.chunk
+            for item in self._inner.items
+            if item.chunk.id in spans
+        }
+        await self._inner.respan_chunks(spans)
+        self._undo.append(lambda: self._restore_chunks(previous))
+
+    async def reindex_chunks(self, positions: dict[str, int]) -> None:
+        previous = {
+            item.chunk.id: item.chunk.chunk_index
+            for item in self._inner.items
+            if item.chunk.id in positions
+        }
+        await self._inner.reindex_chunks(positions)
+        self._undo.append(lambda: self._restore_indexes(previous))
+
+    def _drop(self, chunk_ids: set[str]) -> None:
+        self._inner.items = [
+            item
+            for item in self._inner.items
+            if item.chunk.id not in chunk_ids
+        ]
+
+    def _restore_deleted(
+        self, removed: list[_StoredChunk], linked: dict[int, Chunk]
+    ) -> None:
+        for item in self._inner.items:
+            item.chunk = linked.get(id(item), item.chunk)
+        self._inner.items.extend(removed)
+
+    def _forget_sketches(self, chunk_ids: set[str]) -> None:
+        for item in self._inner.items:
+            if item.chunk.id in chunk_ids:
+                item.sketch = None
+
+    def _restore_indexes(self, positions: dict[str, int]) -> None:
+        for item in self._inner.items:
+            if item.chunk.id in positions:
+                item.chunk = replace(
+                    item.chunk, chunk_index=positions[item.chunk.id]
+                )
+
+    def _restore_chunks(self, previous: dict[str, Chunk]) -> None:
+        for item in self._inner.items:
+            item.chunk = previous.get(item.chunk.id, item.chunk)
+
+
+class _TransactionPages:
+    """Page text store view that logs how to undo its writes."""
+
+    def __init__(self, inner: InMemoryPageTextStore, undo: _UndoLog) -> None:
+        self._inner = inner
+        self._undo = undo
+
+    async def get(self, content_sha256: str) -> list[str] | None:
+        return await self._inner.get(content_sha256)
+
+    async def put(self, content_sha256: str, pages: list[str]) -> None:
+        if content_sha256 in self._inner.items:
+            return
+        await self._inner.put(content_sha256, pages)
+        self._undo.append(lambda: self._forget(content_sha256))
+
+    async def delete(self, content_sha256: str) -> None:
+        removed = self._inner.items.get(content_sha256)
+        await self._inner.delete(content_sha256)
+        if removed is not None:
+            self._undo.append(
+                lambda: self._inner.items.__setitem__(content_sha256, removed)
+            )
+
+    def _forget(self, content_sha256: str) -> None:
+        self._inner.items.pop(content_sha256, None)
+
+
+class _TransactionTexts:
+    """Document text store view that logs how to undo its writes."""
+
+    def __init__(
+        self, inner: InMemoryDocumentTextStore, undo: _UndoLog
+    ) -> None:
+        self._inner = inner
+        self._undo = undo
+
+    async def get(self, document_id: str) -> str | None:
+        return await self._inner.get(document_id)
+
+    async def put(self, document_id: str, text: str) -> None:
+        previous = self._inner.items.get(document_id)
+        await self._inner.put(document_id, text)
+        self._undo.append(lambda: self._restore(document_id, previous))
+
+    async def delete(self, document_id: str) -> None:
+        previous = self._inner.items.get(document_id)
+        await self._inner.delete(document_id)
+        self._undo.append(lambda: self._restore(document_id, previous))
+
+    def _restore(self, document_id: str, text: str | None) -> None:
+        if text is None:
+            self._inner.items.pop(document_id, None)
+        else:
+            self._inner.items[document_id] = text
+
+
+class InMemoryUnitOfWork:
+    """Unit of work over in-memory repositories.
+
+    Writes are applied immediately and undone on error, so concurrent
+    transactions see each other's rows, as with Postgres unique checks.
+    """
+
+    def __init__(
+        self,
+        documents: InMemoryDocumentRepository,
+        chunks: InMemoryChunkRepository,
+        pages: InMemoryPageTextStore | None = None,
+        texts: InMemoryDocumentTextStore | None = None,
+    ) -> None:
+        """Store the repositories that transactions write to."""
+        self._documents = documents
+        self._chunks = chunks
+        self.pages = pages if pages is not None else InMemoryPageTextStore()
+        self.texts = (
+            texts if texts is not None else InMemoryDocumentTextStore()
+        )
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[TransactionScope]:
+        """Yield recording repositories; undo their writes on error."""
+        undo: _UndoLog = []
+        try:
+            yield TransactionScope(
+                documents=_TransactionDocuments(self._documents, undo),
+                chunks=_TransactionChunks(self._chunks, undo),
+                pages=_TransactionPages(self.pages, undo),
+                texts=_TransactionTexts(self.texts, undo),
+            )
+        except BaseException:
+            for action in reversed(undo):
+                action()
+            raise
+
 
 class InMemoryHistoryRepository:
     """Simple chat history repository for tests."""
@@ -90,3 +556,110 @@ class InMemoryHistoryRepository:
             item for item in self.items if item.session_id == session_id
         ]
         return filtered[-limit:]
+
+
+class InMemoryIngestJobRepository:
+    """Simple ingestion job queue for tests."""
+
+    def __init__(self) -> None:
+        """Initialize in-memory job storage."""
+        self.items: dict[str, IngestJob] = {}
+        self.contents: dict[str, bytes] = {}
+        self.heartbeats: dict[str, int] = {}
+
+    async def enqueue(self, job: IngestJob, content: bytes) -> None:
+        """Store queued job and its upload bytes."""
+        self.items[job.id] = job
+        self.contents[job.id] = content
+
+    async def claim_next(self) -> tuple[IngestJob, bytes] | None:
+        """Mark the oldest queued job as running and return it."""
+        queued = [job for job in self.items.values() if job.status == "queued"]
+        if not queued:
+            return None
+        oldest = min(queued, key=lambda item: item.created_at)
+        job = replace(
+            oldest,
+            status="running",
+            started_at=datetime.now(tz=UTC),
+            attempts=oldest.attempts + 1,
+        )
+        self.items[job.id] = job
+        return job, self.contents[job.id]
+
+    async def heartbeat(self, job_id: str) -> None:
+        """Count heartbeats of a job."""
+        self.heartbeats[job_id] = self.heartbeats.get(job_id, 0) + 1
+
+    async def complete(
+        self,
+        job_id: str,
+        attempt: int,
+        document_id: str,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        """Mark job as succeeded unless it was reclaimed."""
+        if not self._holds_claim(job_id, attempt):
+            return False
+        self.items[job_id] = replace(
+            self.items[job_id],
+            status="succeeded",
+            document_id=document_id,
+            stage_seconds=stage_seconds,
+            finished_at=datetime.now(tz=UTC),
+        )
+        self.contents.pop(job_id, None)
+        return True
+
+    async def fail(
+        self,
+        job_id: str,
+        attempt: int,
+        error: str,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        """Mark job as failed unless it was reclaimed."""
+        if not self._holds_claim(job_id, attempt):
+            return False
+        self.items[job_id] = replace(
+            self.items[job_id],
+            status="failed",
+            error=error,
+            stage_seconds=stage_seconds,
+            finished_at=datetime.now(tz=UTC),
+        )
+        self.contents.pop(job_id, None)
+        return True
+
+    def _holds_claim(self, job_id: str, attempt: int) -> bool:
+        job = self.items[job_id]
+        return job.status == "running" and job.attempts == attempt
+
+    async def get(self, job_id: str) -> IngestJob | None:
+        """Return job by id."""
+        return self.items.get(job_id)
+
+
+class InMemoryEmbeddingStore:
+    """Simple embedding store for tests."""
+
+    def __init__(self) -> None:
+        """Initialize in-memory embedding storage."""
+        self.items: dict[tuple[str, str], list[float]] = {}
+
+    async def get_many(
+        self, model: str, digests: list[str]
+    ) -> dict[str, list[float]]:
+        """Return stored embeddings for known digests."""
+        return {
+            digest: self.items[(model, digest)]
+            for digest in digests
+            if (model, digest) in self.items
+        }
+
+    async def put_many(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        """Store embeddings, keeping existing entries."""
+        for digest, vector in embeddings.items():
+            self.items.setdefault((model, digest), vector)
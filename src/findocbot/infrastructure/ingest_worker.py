@@ -0,0 +1,76 @@
+"""Background consumers for the ingestion job queue."""
+
+import asyncio
+import contextlib
+import logging
+
+from findocbot.domain.exceptions import InfrastructureError
+from findocbot.use_cases.ingest_jobs import ProcessIngestJobUseCase
+
+logger = logging.getLogger(__name__)
+
+
+class IngestWorkerPool:
+    """Run N concurrent consumer loops over ``ProcessIngestJobUseCase``."""
+
+    def __init__(
+        self,
+        process_job: ProcessIngestJobUseCase,
+        concurrency: int,
+        poll_interval_seconds: float = 1.0,
+        shutdown_grace_seconds: float = 30.0,
+    ) -> None:
+        """Configure the pool; consumers start on ``start()``.
+
+        Args:
+            process_job: Use case that claims and runs one job.
+            concurrency: Number of consumer loops.
+            poll_interval_seconds: Sleep between polls of an empty queue.
+            shutdown_grace_seconds: How long ``stop()`` lets in-flight jobs
+                finish before cancelling them. A cancelled job stays
+                ``running`` until the repository's stale-job reclaim.
+        """
+        self._process_job = process_job
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval_seconds
+        self._shutdown_grace = shutdown_grace_seconds
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        """Spawn consumer tasks if not running yet."""
+        if self._tasks:
+            return
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._consume(), name=f"ingest-worker-{i}")
+            for i in range(self._concurrency)
+        ]
+        logger.info(f"Started {self._concurrency} ingestion workers")
+
+    async def stop(self) -> None:
+        """Stop polling, wait for in-flight jobs, then cancel stragglers."""
+        if not self._tasks:
+            return
+        self._stopping.set()
+        _, pending = await asyncio.wait(
+            self._tasks, timeout=self._shutdown_grace
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _consume(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self._process_job.run_next()
+            except InfrastructureError:
+                logger.exception("Failed to poll ingestion queue")
+                processed = False
+            if processed:
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=self._poll_interval
+                )
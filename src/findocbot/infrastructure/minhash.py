@@ -0,0 +1,136 @@
+"""MinHash sketches with LSH banding for near-duplicate chunk detection."""
+
+import random
+import re
+from hashlib import blake2b
+
+from findocbot.use_cases.ports import MinHashSketch
+
+WORD_PATTERN = re.compile(r"\d[\d,.]*\d|\w+", re.UNICODE)
+# Page numbers: "Page 12", "Page 12 of 40", "12 of 40", or a header or
+# footer like "- 12 -": a line holding nothing but a short number that
+# starts or ends the text or a paragraph, where pages are joined. Lines
+# inside a paragraph are left alone, since pypdf writes table cells one
+# per line and their figures must still be compared.
+PAGE_NUMBER_PATTERN = re.compile(
+    r"\bpage\s+\d+(?:\s+of\s+\d+)?\b"
+    r"|\b\d+\s+of\s+\d+\b"
+    r"|(?:\A|(?<=\n\n))[^\w\n]*\d{1,4}[^\w\n]*(?=\n|\Z)"
+    r"|(?:\A|(?<=\n))[^\w\n]*\d{1,4}[^\w\n]*(?=\n\n|\Z)",
+    re.IGNORECASE,
+)
+_PAGE_TOKEN = "pagenumber"
+
+# Universal hashing modulo a Mersenne prime; values are kept to 32 bits.
+_PRIME = (1 << 61) - 1
+_VALUE_MASK = (1 << 32) - 1
+# Band keys are stored as signed BIGINT.
+_KEY_MASK = (1 << 63) - 1
+
+
+def _words(text: str) -> list[str]:
+    """Lower-cased words with page numbers replaced by one token."""
+    masked = PAGE_NUMBER_PATTERN.sub(f" {_PAGE_TOKEN} ", text)
+    return WORD_PATTERN.findall(masked.lower())
+
+
+def _figures(words: list[str]) -> list[str]:
+    """Every number outside page numbers; all must match exactly."""
+    return sorted(word for word in words if word[0].isdigit())
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode(), digest_size=8).digest())
+
+
+class MinHashDetector:
+    """Estimate Jaccard similarity of word shingles with MinHash.
+
+    Signatures are split into *bands* LSH bands; chunks sharing any band
+    are candidates, and a candidate is a near-duplicate when the estimated
+    similarity reaches *threshold*. With the defaults (64 hashes, 8 bands
+    of 8) a pair at 0.9 similarity becomes a candidate with probability
+    ~0.99, a pair at 0.5 with ~0.03.
+
+    Page numbers ("Page 12", "12 of 40", or a number alone on the first
+    or last line of a paragraph) are ignored, so repeated footers and
+    boilerplate match across pages.
+    Every other number, however small, must be equal: two chunks that
+    differ only in their figures are never merged.
+    """
+
+    def __init__(
+        self,
+        num_hashes: int = 64,
+        bands: int = 8,
+        shingle_words: int = 5,
+        threshold: float = 0.9,
+        seed: int = 1,
+    ) -> None:
+        """Draw the hash functions.
+
+        Args:
+            num_hashes: Signature length; must be divisible by *bands*.
+            bands: LSH bands the signature is split into.
+            shingle_words: Words per shingle.
+            threshold: Minimum estimated Jaccard similarity.
+            seed: Seed of the hash functions. Changing it invalidates all
+                stored sketches.
+        """
+        if num_hashes % bands:
+            raise ValueError("num_hashes must be divisible by bands.")
+        rng = random.Random(seed)
+        self._hashes = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_hashes)
+        ]
+        self._rows = num_hashes // bands
+        self._shingle_words = shingle_words
+        self._threshold = threshold
+
+    def sketch(self, text: str) -> MinHashSketch:
+        """Return the signature and band keys of *text*."""
+        words = _words(text)
+        size = self._shingle_words
+        shingles = {
+            _hash64(" ".join(words[start : start + size]))
+            for start in range(max(1, len(words) - size + 1))
+        }
+        signature = [
+            min(
+                ((a * shingle + b) % _PRIME) & _VALUE_MASK
+                for shingle in shingles
+            )
+            for a, b in self._hashes
+        ]
+        band_keys = [
+            _hash64(f"{band}:{signature[start : start + self._rows]}")
+            & _KEY_MASK
+            for band, start in enumerate(range(0, len(signature), self._rows))
+        ]
+        return MinHashSketch(signature=signature, band_keys=band_keys)
+
+    def similarity(self, sketch: MinHashSketch, other: MinHashSketch) -> float:
+        """Estimate the Jaccard similarity of two sketched texts."""
+        equal = sum(
+            1
+            for left, right in zip(
+                sketch.signature, other.signature, strict=True
+            )
+            if left == right
+        )
+        return equal / len(sketch.signature)
+
+    def is_near_duplicate(
+        self,
+        text: str,
+        sketch: MinHashSketch,
+        other_text: str,
+        other_sketch: MinHashSketch,
+    ) -> bool:
+        """Return whether *text* may share the vector of *other_text*."""
+        if len(sketch.signature) != len(other_sketch.signature):
+            return False
+        if self.similarity(sketch, other_sketch) < self._threshold:
+            return False
+        return _figures(_words(text)) == _figures(_words(other_text))
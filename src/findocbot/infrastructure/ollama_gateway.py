@@ -1,12 +1,155 @@
 """Ollama implementation for model provider gateway."""
 
+import asyncio
 import json
+import logging
+import random
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
 from findocbot.domain.exceptions import ModelProviderError
 
+logger = logging.getLogger(__name__)
+
+# Growing the budget must buy at least this much per-token speed-up.
+_GROWTH_MIN_GAIN = 0.05
+_GROWTH_FACTOR = 1.25
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for batch packing."""
+    return len(text) // 4 + 1
+
+
+@dataclass(frozen=True)
+class EmbedBatchStats:
+    """Embedding batch sizing and throughput metrics."""
+
+    token_budget: int | None
+    batches: int
+    items: int
+    seconds: float
+    shrinks: int
+    last_batch_items: int
+    last_batch_seconds: float
+    retries: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        """Average embedding throughput across all batches."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def last_items_per_second(self) -> float:
+        """Throughput of the most recent batch."""
+        if self.last_batch_seconds <= 0:
+            return 0.0
+        return self.last_batch_items / self.last_batch_seconds
+
+
+class _TokenBudget:
+    """Per-request token budget, optionally tuned from observed latency.
+
+    The budget grows while a bigger batch keeps lowering the per-token
+    latency and is halved whenever Ollama times out or answers 5xx.
+    """
+
+    def __init__(self, initial: int, adaptive: bool) -> None:
+        self.current = initial
+        self.adaptive = adaptive
+        self.shrinks = 0
+        self._minimum = max(1, initial // 16)
+        self._maximum = initial * 4
+        self._best_seconds_per_token: float | None = None
+
+    def observe(self, tokens: int, seconds: float) -> None:
+        if not self.adaptive or tokens <= 0:
+            return
+        rate = seconds / tokens
+        best = self._best_seconds_per_token
+        if best is None or rate < best * (1 - _GROWTH_MIN_GAIN):
+            self._best_seconds_per_token = rate
+            self.current = min(
+                self._maximum, int(self.current * _GROWTH_FACTOR)
+            )
+
+    def shrink(self) -> None:
+        self.current = max(self._minimum, self.current // 2)
+        self.shrinks += 1
+        # Latencies measured before the overload no longer apply.
+        self._best_seconds_per_token = None
+
+
+class _BatchCursor:
+    """Cut consecutive batches from *texts* on demand."""
+
+    def __init__(self, texts: list[str]) -> None:
+        self._texts = texts
+        self._next = 0
+
+    def take(
+        self, max_items: int, token_budget: int | None
+    ) -> tuple[int, list[str]] | None:
+        """Return the next batch and its start offset, or ``None``."""
+        start = self._next
+        if start >= len(self._texts):
+            return None
+        end = start
+        tokens = 0
+        while end < len(self._texts) and end - start < max_items:
+            cost = estimate_tokens(self._texts[end])
+            if (
+                token_budget is not None
+                and end > start
+                and tokens + cost > token_budget
+            ):
+                break
+            tokens += cost
+            end += 1
+        self._next = end
+        return start, self._texts[start:end]
+
+
+def _is_overload(error: ModelProviderError) -> bool:
+    """Whether a smaller batch could succeed where this one failed."""
+    cause = error.__cause__
+    if isinstance(cause, httpx.TimeoutException):
+        return True
+    return (
+        isinstance(cause, httpx.HTTPStatusError)
+        and cause.response.status_code >= 500
+    )
+
+
+def _is_transient(error: ModelProviderError) -> bool:
+    """Whether the same request may succeed if it is simply sent again."""
+    cause = error.__cause__
+    if isinstance(cause, httpx.ConnectError):
+        return True
+    if (
+        isinstance(cause, httpx.HTTPStatusError)
+        and cause.response.status_code == 429
+    ):
+        return True
+    return _is_overload(error)
+
+
+async def _run_all(coros: list[Coroutine[Any, Any, None]]) -> None:
+    """Run coroutines concurrently; cancel the rest on first error."""
+    tasks = [asyncio.create_task(coro) for coro in coros]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
 class OllamaGateway:
     """Call Ollama chat and embedding endpoints."""
@@ -18,13 +161,54 @@ class OllamaGateway:
         embed_model: str,
         timeout_seconds: float = 120.0,
         batch_size: int = 50,
+        max_in_flight: int = 1,
+        token_budget: int | None = None,
+        adaptive_batching: bool = False,
+        max_retries: int = 0,
+        retry_backoff_seconds: float = 0.5,
     ) -> None:
-        """Store Ollama endpoint settings and model names."""
+        """Store Ollama endpoint settings and model names.
+
+        Args:
+            base_url: Ollama server URL.
+            chat_model: Model used for answer generation.
+            embed_model: Model used for embeddings.
+            timeout_seconds: Per-request HTTP timeout.
+            batch_size: Maximum texts per ``/api/embed`` request.
+            max_in_flight: Embedding batches sent concurrently by one
+                ``embed_many`` call. Match it to ``OLLAMA_NUM_PARALLEL``;
+                ``1`` sends batches one after another.
+            token_budget: When set, batches are also capped by estimated
+                token count, so dense chunks make smaller requests.
+            adaptive_batching: Tune *token_budget* online between 1/16x
+                and 4x its initial value: grow while per-token latency
+                improves, halve on timeouts or 5xx and retry the failed
+                batch in halves.
+            max_retries: Times one embedding batch is sent again after a
+                timeout, connection error, 429 or 5xx before the whole
+                ``embed_many`` call fails.
+            retry_backoff_seconds: Delay before the first retry; it
+                doubles with each further attempt, with jitter.
+        """
         self._base_url = base_url.rstrip("/")
         self._chat_model = chat_model
         self._embed_model = embed_model
         self._timeout = timeout_seconds
         self._batch_size = batch_size
+        self._max_in_flight = max(1, max_in_flight)
+        self._max_retries = max(0, max_retries)
+        self._retry_backoff = retry_backoff_seconds
+        self._budget = (
+            _TokenBudget(token_budget, adaptive_batching)
+            if token_budget is not None
+            else None
+        )
+        self._batches = 0
+        self._items = 0
+        self._seconds = 0.0
+        self._last_batch_items = 0
+        self._last_batch_seconds = 0.0
+        self._retries = 0
         self._client: httpx.AsyncClient | None = None
 
     async def start(self) -> None:
@@ -34,6 +218,13 @@ class OllamaGateway:
 
     async def stop(self) -> None:
         """Close HTTP client and release resources."""
+        stats = self.get_stats()
+        if stats.batches:
+            logger.info(
+                f"Embedding stats: {stats.items} items in {stats.batches} "
+                f"batches, {stats.items_per_second:.1f} items/s, "
+                f"token budget: {stats.token_budget}"
+            )
         if self._client is not None:
             await self._client.aclose()
             self._client = None
@@ -72,19 +263,39 @@ class OllamaGateway:
         return embeddings[0]
 
     async def embed_many(self, texts: list[str]) -> list[list[float]]:
-        """Embed many chunk texts with automatic batching."""
+        """Embed many chunk texts with automatic batching.
+
+        Batches are cut lazily, so each one is sized with the token budget
+        current at the moment it is sent. Up to ``max_in_flight`` batches
+        run concurrently; results are reassembled in input order. A batch
+        that fails transiently is retried on its own with exponential
+        backoff. If it still fails, the batches still in flight are
+        cancelled and the error is raised.
+        """
         if not texts:
             return []
 
-        all_embeddings: list[list[float]] = []
+        cursor = _BatchCursor(texts)
+        results: dict[int, list[list[float]]] = {}
 
-        for i in range(0, len(texts), self._batch_size):
-            batch = texts[i : i + self._batch_size]
-            payload = await self._post(
-                "/api/embed",
-                {"model": self._embed_model, "input": batch},
-            )
-            all_embeddings.extend(payload["embeddings"])  # type: ignore[arg-type]
+        async def drain() -> None:
+            while True:
+                budget = self._budget.current if self._budget else None
+                taken = cursor.take(self._batch_size, budget)
+                if taken is None:
+                    return
+                start, batch = taken
+                results[start] = await self._embed_sized(batch)
+
+        if self._max_in_flight == 1:
+            await drain()
+        else:
+            await _run_all([drain() for _ in range(self._max_in_flight)])
+        all_embeddings = [
+            embedding
+            for start in sorted(results)
+            for embedding in results[start]
+        ]
 
         if len(all_embeddings) != len(texts):
             raise ModelProviderError(
@@ -94,6 +305,90 @@ class OllamaGateway:
 
         return all_embeddings
 
+    def get_stats(self) -> EmbedBatchStats:
+        """Return current batch size and embedding throughput metrics."""
+        return EmbedBatchStats(
+            token_budget=self._budget.current if self._budget else None,
+            batches=self._batches,
+            items=self._items,
+            seconds=self._seconds,
+            shrinks=self._budget.shrinks if self._budget else 0,
+            last_batch_items=self._last_batch_items,
+            last_batch_seconds=self._last_batch_seconds,
+            retries=self._retries,
+        )
+
+    async def _embed_sized(
+        self, batch: list[str], attempt: int = 0
+    ) -> list[list[float]]:
+        """Embed one batch; split it on overload, else retry transients.
+
+        With adaptive batching an overloaded batch is retried in halves
+        right away, since resending it whole would likely fail again.
+        Other transient failures resend the same batch after a backoff.
+        """
+        started = time.perf_counter()
+        try:
+            embeddings = await self._embed_batch(batch)
+        except ModelProviderError as exc:
+            if (
+                self._budget is not None
+                and self._budget.adaptive
+                and len(batch) > 1
+                and _is_overload(exc)
+            ):
+                return await self._embed_halves(batch, exc)
+            if attempt >= self._max_retries or not _is_transient(exc):
+                raise
+            delay = self._retry_delay(attempt)
+            logger.warning(
+                f"Embedding batch of {len(batch)} failed ({exc}); "
+                f"retry {attempt + 1}/{self._max_retries} in {delay:.2f}s"
+            )
+            self._retries += 1
+            await asyncio.sleep(delay)
+            return await self._embed_sized(batch, attempt + 1)
+        elapsed = time.perf_counter() - started
+        self._batches += 1
+        self._items += len(batch)
+        self._seconds += elapsed
+        self._last_batch_items = len(batch)
+        self._last_batch_seconds = elapsed
+        if self._budget is not None:
+            self._budget.observe(
+                sum(estimate_tokens(text) for text in batch), elapsed
+            )
+        return embeddings
+
+    async def _embed_halves(
+        self, batch: list[str], error: ModelProviderError
+    ) -> list[list[float]]:
+        """Shrink the token budget and embed *batch* as two requests."""
+        assert self._budget is not None
+        self._budget.shrink()
+        logger.warning(
+            f"Embedding batch of {len(batch)} failed ({error}); "
+            f"retrying in halves, token budget now {self._budget.current}"
+        )
+        half = len(batch) // 2
+        return await self._embed_sized(batch[:half]) + await self._embed_sized(
+            batch[half:]
+        )
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter, so retries do not align."""
+        delay = min(
+            _MAX_RETRY_DELAY_SECONDS, self._retry_backoff * 2.0**attempt
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        payload = await self._post(
+            "/api/embed",
+            {"model": self._embed_model, "input": batch},
+        )
+        return payload["embeddings"]  # type: ignore[return-value]
+
     async def generate_structured(
         self,
         prompt: str,
@@ -1,15 +1,178 @@
 """PDF parsing implementation."""
 
+import math
+import multiprocessing
+import secrets
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from multiprocessing import shared_memory
+from typing import BinaryIO, cast
 
 from pypdf import PdfReader
 
+from findocbot.use_cases.ports import PDFSource
+
+# Per-process reader of the document last extracted, keyed by the shared
+# memory block it was copied from, so a worker reads each document once
+# however many of its page ranges it is given.
+_worker_document: tuple[str, PdfReader] | None = None
+
+
+def _worker_reader(block: str, size: int) -> PdfReader:
+    global _worker_document
+    if _worker_document is None or _worker_document[0] != block:
+        memory = shared_memory.SharedMemory(name=block)
+        try:
+            content = bytes(cast(memoryview, memory.buf)[:size])
+        finally:
+            memory.close()
+        _worker_document = (block, PdfReader(BytesIO(content)))
+    return _worker_document[1]
+
+
+def _extract_page_range(
+    block: str, size: int, start: int, end: int
+) -> list[str]:
+    reader = _worker_reader(block, size)
+    return [
+        (reader.pages[index].extract_text() or "").strip()
+        for index in range(start, end)
+    ]
+
+
+def _as_stream(content: PDFSource) -> BinaryIO:
+    """Wrap bytes, or rewind a file object so pypdf reads it in place."""
+    if isinstance(content, bytes):
+        return BytesIO(content)
+    content.seek(0)
+    return content
+
+
+def as_pdf_bytes(content: PDFSource) -> bytes:
+    """Return the PDF as bytes, reading a file object from the start."""
+    if isinstance(content, bytes):
+        return content
+    content.seek(0)
+    return content.read()
+
 
 class PyPDFParser:
     """Extract text from PDF bytes with pypdf."""
 
-    def extract_text(self, content: bytes) -> str:
+    def __init__(
+        self,
+        workers: int = 1,
+        parallel_min_pages: int = 32,
+    ) -> None:
+        """Configure optional page-parallel extraction.
+
+        Args:
+            workers: Worker processes used for documents with at least
+                *parallel_min_pages* pages. ``1`` keeps extraction in the
+                calling thread.
+            parallel_min_pages: Smaller documents are parsed serially,
+                since fanning out would cost more than it saves.
+        """
+        self._workers = workers
+        self._parallel_min_pages = parallel_min_pages
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def stop(self) -> None:
+        """Shut down the worker processes, if any were started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def extract_text(self, content: PDFSource) -> str:
         """Return concatenated page text."""
-        reader = PdfReader(BytesIO(content))
-        pages = [page.extract_text() or "" for page in reader.pages]
-        return "\n\n".join(text.strip() for text in pages if text.strip())
+        return "\n\n".join(text for text in self.iter_pages(content) if text)
+
+    def iter_pages(
+        self,
+        content: PDFSource,
+        on_skipped_page: Callable[[int, str], None] | None = None,
+    ) -> Iterator[str]:
+        """Yield stripped page text lazily, one page at a time.
+
+        Empty pages are yielded as ``""`` so callers can keep track of
+        page numbers. File objects are read in place rather than copied
+        into memory, except in parallel mode, where each worker process
+        needs its own copy of the bytes. Pages are never skipped, so
+        *on_skipped_page* is not called.
+        """
+        reader = PdfReader(_as_stream(content))
+        page_count = len(reader.pages)
+        if self._workers > 1 and page_count >= self._parallel_min_pages:
+            yield from self._iter_pages_parallel(
+                as_pdf_bytes(content), page_count
+            )
+            return
+        for page in reader.pages:
+            yield (page.extract_text() or "").strip()
+
+    def _iter_pages_parallel(
+        self, content: bytes, page_count: int
+    ) -> Iterator[str]:
+        """Fan page ranges out to worker processes; yield in page order.
+
+        Ranges are sized for roughly four tasks per worker so one slow,
+        image-heavy range does not leave the other workers idle. The PDF
+        is copied once into a shared memory block; tasks only carry its
+        name and a ``(start, end)`` range.
+        """
+        step = max(1, math.ceil(page_count / (self._workers * 4)))
+        memory = shared_memory.SharedMemory(
+            name=f"findocbot-{secrets.token_hex(8)}",
+            create=True,
+            size=len(content),
+        )
+        futures: list[Future[list[str]]] = []
+        try:
+            cast(memoryview, memory.buf)[: len(content)] = content
+            pool = self._executor()
+            futures.extend(
+                pool.submit(
+                    _extract_page_range,
+                    memory.name,
+                    len(content),
+                    start,
+                    min(start + step, page_count),
+                )
+                for start in range(0, page_count, step)
+            )
+            for future in futures:
+                try:
+                    pages = future.result()
+                except BrokenProcessPool:
+                    self._discard(pool)
+                    raise
+                yield from pages
+        finally:
+            for future in futures:
+                future.cancel()
+            memory.close()
+            memory.unlink()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it for the first document."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    # Forking an asyncio process with live threads is
+                    # unsafe.
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a pool whose worker died, so the next document respawns."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
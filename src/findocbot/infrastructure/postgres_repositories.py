@@ -1,63 +1,405 @@
 """PostgreSQL repository implementations."""
 
+import hashlib
+import json
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Literal
+from uuid import UUID
+
 import asyncpg
 
-from findocbot.domain.entities import ChatTurn, Chunk, Document
-from findocbot.domain.exceptions import StorageError
+from findocbot.domain.entities import ChatTurn, Chunk, Document, IngestJob
+from findocbot.domain.exceptions import DuplicateDocumentError, StorageError
 from findocbot.infrastructure.db import PostgresPool
-from findocbot.use_cases.ports import ChunkWithScore
+from findocbot.use_cases.ports import (
+    ChunkWithScore,
+    MinHashSketch,
+    SearchFilters,
+    TransactionScope,
+)
 
 
-def _vector_literal(values: list[float]) -> str:
-    return "[" + ",".join(f"{value:.9f}" for value in values) + "]"
+class _PostgresRepository:
+    """Repository that runs on the pool or on one borrowed connection."""
 
+    def __init__(
+        self, db: PostgresPool, connection: asyncpg.Connection | None = None
+    ) -> None:
+        """Store db dependency and an optional bound connection."""
+        self._db = db
+        self._connection = connection
 
-class PostgresDocumentRepository:
-    """Persist document metadata in PostgreSQL."""
+    @property
+    def _executor(self) -> Any:
+        """Bound connection inside a unit of work, otherwise the pool."""
+        if self._connection is not None:
+            return self._connection
+        return self._db.pool
 
-    def __init__(self, db: PostgresPool) -> None:
-        """Store db dependency."""
-        self._db = db
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[Any]:
+        """Yield a connection in a transaction, joining a bound one."""
+        if self._connection is not None:
+            yield self._connection
+            return
+        async with self._db.pool.acquire() as conn, conn.transaction():
+            yield conn
+
+
+def _row_to_document(row: Mapping[str, Any]) -> Document:
+    return Document(
+        id=str(row["id"]),
+        filename=row["filename"],
+        created_at=row["created_at"],
+        content_sha256=row["content_sha256"],
+    )
+
+
+def _row_to_chunk(
+    row: Mapping[str, Any], document_text: str | None = None
+) -> Chunk:
+    """Build a chunk, slicing span rows out of *document_text*."""
+    canonical = row.get("canonical_chunk_id")
+    start, end = row.get("span_start"), row.get("span_end")
+    text = row["content"]
+    if text is None:
+        text = document_text[start:end] if document_text is not None else ""
+    return Chunk(
+        id=str(row["id"]),
+        document_id=str(row["document_id"]),
+        chunk_index=row["chunk_index"],
+        section=row["section"],
+        text=text,
+        canonical_chunk_id=str(canonical) if canonical is not None else None,
+        span_start=start,
+        span_end=end,
+    )
+
+
+def _compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode())
+
+
+def _decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode()
+
+
+class DocumentTextCache:
+    """Decompressed texts of recently read documents, keyed by digest.
+
+    Keys are the SHA-256 of the text, so a replaced document can never
+    be served from a stale entry. Shared by all chunk repositories of a
+    process, including those bound to a unit of work.
+    """
+
+    def __init__(self, max_documents: int = 32) -> None:
+        """Keep at most *max_documents* texts, evicting the least recent."""
+        self._max_documents = max_documents
+        self._texts: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, digest: str) -> str | None:
+        """Return a cached text and mark it as recently used."""
+        text = self._texts.get(digest)
+        if text is not None:
+            self._texts.move_to_end(digest)
+        return text
+
+    def put(self, digest: str, text: str) -> None:
+        """Cache a text, evicting the least recently used beyond the cap."""
+        if self._max_documents <= 0:
+            return
+        self._texts[digest] = text
+        self._texts.move_to_end(digest)
+        while len(self._texts) > self._max_documents:
+            self._texts.popitem(last=False)
+
+
+class PostgresDocumentRepository(_PostgresRepository):
+    """Persist document metadata in PostgreSQL."""
 
     async def create(self, document: Document) -> None:
         """Insert document row."""
         try:
-            await self._db.pool.execute(
+            await self._executor.execute(
                 """
-                INSERT INTO documents (id, filename, created_at)
-                VALUES ($1, $2, $3)
+                INSERT INTO documents (
+                    id,
+                    filename,
+                    created_at,
+                    content_sha256
+                )
+                VALUES ($1, $2, $3, $4)
                 """,
                 document.id,
                 document.filename,
                 document.created_at,
+                document.content_sha256,
             )
+        except asyncpg.UniqueViolationError as exc:
+            raise DuplicateDocumentError(
+                "A document with the same content already exists"
+            ) from exc
         except asyncpg.PostgresError as exc:
             raise StorageError("Failed to persist document") from exc
 
     async def delete(self, document_id: str) -> None:
         """Delete document row by id."""
         try:
-            await self._db.pool.execute(
+            await self._executor.execute(
                 "DELETE FROM documents WHERE id = $1",
                 document_id,
             )
         except asyncpg.PostgresError as exc:
             raise StorageError("Failed to delete document") from exc
 
+    async def get(self, document_id: str) -> Document | None:
+        """Look up a document by id."""
+        try:
+            row = await self._executor.fetchrow(
+                """
+                SELECT id, filename, created_at, content_sha256
+                FROM documents
+                WHERE id = $1
+                """,
+                document_id,
+            )
+        except asyncpg.DataError:
+            # Not a valid UUID, so it cannot name an existing document.
+            return None
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to load document") from exc
+        return _row_to_document(row) if row is not None else None
+
+    async def update(self, document: Document) -> None:
+        """Rewrite filename and digest of an existing row."""
+        try:
+            await self._executor.execute(
+                """
+                UPDATE documents
+                SET filename = $2, content_sha256 = $3
+                WHERE id = $1
+                """,
+                document.id,
+                document.filename,
+                document.content_sha256,
+            )
+        except asyncpg.UniqueViolationError as exc:
+            raise DuplicateDocumentError(
+                "A document with the same content already exists"
+            ) from exc
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to update document") from exc
+
+    async def list_ids(self) -> list[str]:
+        """Return all document ids in upload order."""
+        try:
+            rows = await self._executor.fetch(
+                "SELECT id FROM documents ORDER BY created_at, id"
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to list documents") from exc
+        return [str(row["id"]) for row in rows]
+
+    async def get_by_digest(self, content_sha256: str) -> Document | None:
+        """Look up a document by the SHA-256 of its uploaded bytes."""
+        try:
+            row = await self._executor.fetchrow(
+                """
+                SELECT id, filename, created_at, content_sha256
+                FROM documents
+                WHERE content_sha256 = $1
+                """,
+                content_sha256,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to look up document") from exc
+        return _row_to_document(row) if row is not None else None
+
+    async def add_alias(self, document_id: str, filename: str) -> None:
+        """Insert an alias row; repeated aliases are ignored."""
+        try:
+            await self._executor.execute(
+                """
+                INSERT INTO document_aliases (document_id, filename)
+                VALUES ($1, $2)
+                ON CONFLICT DO NOTHING
+                """,
+                document_id,
+                filename,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to record document alias") from exc
+
+
+_CHUNK_COLUMNS = (
+    "id",
+    "document_id",
+    "chunk_index",
+    "section",
+    "content",
+    "embedding",
+    "canonical_chunk_id",
+    "span_start",
+    "span_end",
+)
+
+# Chunk columns of every read; span rows are materialized from the
+# document text named by ``text_sha256``.
+_CHUNK_SELECT = """
+    c.id,
+    c.document_id,
+    c.chunk_index,
+    c.section,
+    c.content,
+    c.canonical_chunk_id,
+    c.span_start,
+    c.span_end,
+    t.text_sha256
+"""
+
+
+def _valid_uuids(values: Sequence[str]) -> list[str]:
+    """Drop values that are not UUIDs; they cannot name a document."""
+    valid = []
+    for value in values:
+        try:
+            valid.append(str(UUID(value)))
+        except ValueError:
+            continue
+    return valid
+
+
+def _filter_sql(
+    filters: SearchFilters, first_param: int
+) -> tuple[str, str, list[Any]]:
+    """Return the join, conditions and parameters of a filtered search.
+
+    Parameters are numbered from ``$first_param``. ``documents`` is only
+    joined for upload-date filters. The conditions do not restrict
+    ``canonical_chunk_id``; see ``_scopes_linked_chunks``.
+    """
+    conditions = ["TRUE"]
+    params: list[Any] = []
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return f"${first_param + len(params) - 1}"
 
-class PostgresChunkRepository:
+    if filters.document_ids is not None:
+        ids = bind(_valid_uuids(filters.document_ids))
+        conditions.append(f"c.document_id = ANY({ids}::uuid[])")
+    if filters.section is not None:
+        section = bind(filters.section)
+        conditions.append(
+            f"starts_with(lower(c.section), lower({section}::text))"
+        )
+    if filters.uploaded_after is not None:
+        conditions.append(f"d.created_at >= {bind(filters.uploaded_after)}")
+    if filters.uploaded_before is not None:
+        conditions.append(f"d.created_at <= {bind(filters.uploaded_before)}")
+    join = (
+        "JOIN documents AS d ON d.id = c.document_id"
+        if filters.uploaded_after is not None
+        or filters.uploaded_before is not None
+        else ""
+    )
+    return join, " AND ".join(conditions), params
+
+
+def _scopes_linked_chunks(filters: SearchFilters) -> bool:
+    """Whether near-duplicate chunks must be searched as well.
+
+    A linked chunk is hidden behind its canonical chunk, which may belong
+    to another document or section. Filters on either would then lose
+    content of the documents the user asked about, so linked rows are
+    searched with their copied vectors and folded into their canonical
+    group, one hit per group.
+    """
+    return filters.document_ids is not None or filters.section is not None
+
+
+async def _apply_local_settings(
+    conn: asyncpg.Connection, settings: Mapping[str, str]
+) -> None:
+    """Set run-time parameters until the end of the open transaction.
+
+    This is ``SET LOCAL`` in one round trip; pooled connections keep
+    their server defaults for the next query.
+    """
+    await conn.execute(
+        """
+        SELECT set_config(name, value, true)
+        FROM unnest($1::text[], $2::text[]) AS s(name, value)
+        """,
+        list(settings),
+        list(settings.values()),
+    )
+
+
+class PostgresChunkRepository(_PostgresRepository):
     """Persist and search chunks with pgvector."""
 
-    def __init__(self, db: PostgresPool) -> None:
-        """Store db dependency."""
-        self._db = db
+    def __init__(
+        self,
+        db: PostgresPool,
+        copy_batch_size: int = 2000,
+        connection: asyncpg.Connection | None = None,
+        text_cache: DocumentTextCache | None = None,
+        exact_search_max_rows: int = 10_000,
+        hnsw_max_scan_tuples: int = 20_000,
+        ef_search: int | None = None,
+        embedding_index: Literal["vector", "halfvec"] = "vector",
+        rerank_factor: int = 1,
+    ) -> None:
+        """Store db dependency, bulk-load sizing and search planning.
+
+        Args:
+            db: Connection pool.
+            copy_batch_size: Chunks sent per binary ``COPY``; bounds the
+                records held client-side for very large documents.
+            connection: Connection of an open unit of work to run on
+                instead of the pool.
+            text_cache: Document texts that span chunks are sliced from.
+            exact_search_max_rows: Filtered searches estimated to match
+                at most this many chunks are answered by an exact scan.
+            hnsw_max_scan_tuples: Cap on tuples an iterative HNSW scan
+                visits while looking for chunks that pass the filters.
+            ef_search: Default ``hnsw.ef_search`` of searches; ``None``
+                keeps the server setting.
+            embedding_index: Column whose HNSW index serves approximate
+                searches: full-precision ``embedding`` or the
+                ``halfvec`` copy ``embedding_half``.
+            rerank_factor: With ``halfvec``, fetch this many times
+                ``top_k`` candidates and rank them by full-precision
+                distance; 1 keeps the half-precision ranking.
+        """
+        super().__init__(db, connection)
+        self._copy_batch_size = copy_batch_size
+        self._exact_search_max_rows = exact_search_max_rows
+        self._hnsw_max_scan_tuples = hnsw_max_scan_tuples
+        self._ef_search = ef_search
+        self._embedding_index = embedding_index
+        self._rerank_factor = (
+            max(rerank_factor, 1) if embedding_index == "halfvec" else 1
+        )
+        self._text_cache = (
+            text_cache if text_cache is not None else DocumentTextCache()
+        )
 
     async def add_chunks_with_embeddings(
         self,
         chunks: list[Chunk],
         embeddings: list[list[float]],
     ) -> None:
-        """Insert chunks and matching vectors in a single batch."""
+        """Bulk-load chunks and matching vectors in one transaction.
+
+        Rows are streamed straight into ``chunks`` with binary ``COPY``;
+        vectors travel as packed float32 via the pool's pgvector codec.
+        Chunks with a span are stored without their text.
+        """
         if len(chunks) != len(embeddings):
             raise ValueError("Chunks and embeddings count mismatch.")
 
@@ -65,31 +407,30 @@ class PostgresChunkRepository:
             return
 
         try:
-            async with self._db.pool.acquire() as conn:
-                async with conn.transaction():
-                    await conn.executemany(
-                        """
-                        INSERT INTO chunks (
-                            id,
-                            document_id,
-                            chunk_index,
-                            section,
-                            content,
-                            embedding
-                        )
-                        VALUES ($1, $2, $3, $4, $5, $6::vector)
-                        """,
-                        [
+            async with self._transaction() as conn:
+                for start in range(0, len(chunks), self._copy_batch_size):
+                    end = start + self._copy_batch_size
+                    await conn.copy_records_to_table(
+                        "chunks",
+                        records=[
                             (
                                 c.id,
                                 c.document_id,
                                 c.chunk_index,
                                 c.section,
-                                c.text,
-                                _vector_literal(e),
+                                c.text if c.span_start is None else None,
+                                e,
+                                c.canonical_chunk_id,
+                                c.span_start,
+                                c.span_end,
+                            )
+                            for c, e in zip(
+                                chunks[start:end],
+                                embeddings[start:end],
+                                strict=True,
                             )
-                            for c, e in zip(chunks, embeddings, strict=True)
                         ],
+                        columns=_CHUNK_COLUMNS,
                     )
         except asyncpg.PostgresError as exc:
             raise StorageError("Failed to persist chunks") from exc
@@ -98,42 +439,509 @@ class PostgresChunkRepository:
         self,
         embedding: list[float],
         top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
     ) -> list[ChunkWithScore]:
-        """Search by cosine distance and map rows to DTO."""
+        """Search canonical chunks that match *filters* by cosine distance.
+
+        Near-duplicates share their canonical chunk's vector and are not
+        in the partial HNSW index, so they are excluded here too.
+        Filtered searches are planned per query, see ``_search_filtered``.
+        HNSW scans use *ef_search*, or the repository default, raised to
+        at least *top_k*; it is set only for this query's transaction.
+        """
+        hnsw = self._hnsw_settings(top_k, ef_search)
         try:
-            rows = await self._db.pool.fetch(
+            if filters is not None and not filters.is_empty:
+                rows = await self._search_filtered(
+                    embedding, top_k, filters, hnsw
+                )
+            elif not hnsw:
+                rows = await self._executor.fetch(
+                    self._nearest_query(), embedding, top_k
+                )
+            else:
+                async with self._transaction() as conn:
+                    await _apply_local_settings(conn, hnsw)
+                    rows = await conn.fetch(
+                        self._nearest_query(), embedding, top_k
+                    )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to search chunks") from exc
+        chunks = await self._materialize(rows)
+        return [
+            ChunkWithScore(chunk=chunk, score=float(row["score"]))
+            for chunk, row in zip(chunks, rows, strict=True)
+        ]
+
+    def _hnsw_settings(
+        self, top_k: int, ef_search: int | None
+    ) -> dict[str, str]:
+        """Return the ``hnsw.ef_search`` to apply, if any.
+
+        A scan returns at most ``ef_search`` rows, so it is never set
+        below the number of candidates: *top_k*, times the rerank factor.
+        """
+        value = ef_search if ef_search is not None else self._ef_search
+        candidates = top_k * self._rerank_factor
+        if value is None:
+            if self._rerank_factor == 1:
+                return {}
+            value = candidates
+        return {"hnsw.ef_search": str(max(value, candidates))}
+
+    def _nearest_query(
+        self, join: str = "", where: str = "TRUE", include_linked: bool = False
+    ) -> str:
+        """Return the approximate nearest-chunk query.
+
+        The candidates come from the HNSW index of the configured
+        column, without joins that could keep the planner off it; the
+        relaxed order of an iterative scan is restored by the outer
+        sort. With half precision and a rerank factor, ``top_k`` times
+        the factor candidates are re-ordered by full-precision distance
+        and scored with it. With *include_linked*, matching linked
+        chunks, which are not in the index, are ranked exactly through
+        ``idx_chunks_canonical_chunk_id`` and merged in, keeping one
+        chunk per canonical group.
+        """
+        if self._embedding_index == "halfvec":
+            distance = "c.embedding_half <=> $1::vector::halfvec"
+        else:
+            distance = "c.embedding <=> $1::vector"
+        final = (
+            "(c.embedding <=> $1::vector)"
+            if self._rerank_factor > 1
+            else "n.distance"
+        )
+        canonical = f"""
+            SELECT c.id, c.id AS grp, FALSE AS linked, {distance} AS distance
+            FROM chunks AS c
+            {join}
+            WHERE c.canonical_chunk_id IS NULL AND {where}
+            ORDER BY distance
+            LIMIT $2 * {self._rerank_factor}
+        """
+        if include_linked:
+            candidates = f"""
+                nearest AS MATERIALIZED ({canonical}),
+                linked AS MATERIALIZED (
+                    SELECT
+                        c.id,
+                        c.canonical_chunk_id AS grp,
+                        TRUE AS linked,
+                        c.embedding <=> $1::vector AS distance
+                    FROM chunks AS c
+                    {join}
+                    WHERE c.canonical_chunk_id IS NOT NULL AND {where}
+                    ORDER BY distance
+                    LIMIT $2 * {self._rerank_factor}
+                ),
+                candidates AS (
+                    SELECT DISTINCT ON (grp) id, distance
+                    FROM (
+                        SELECT * FROM nearest
+                        UNION ALL
+                        SELECT * FROM linked
+                    ) AS found
+                    ORDER BY grp, linked
+                )
+            """
+        else:
+            candidates = f"candidates AS MATERIALIZED ({canonical})"
+        return f"""
+            WITH {candidates}
+            SELECT {_CHUNK_SELECT}, 1 - {final} AS score
+            FROM candidates AS n
+            JOIN chunks AS c ON c.id = n.id
+            LEFT JOIN document_texts AS t
+                ON t.document_id = c.document_id
+            ORDER BY {final}
+            LIMIT $2
+        """
+
+    async def _search_filtered(
+        self,
+        embedding: list[float],
+        top_k: int,
+        filters: SearchFilters,
+        hnsw: dict[str, str],
+    ) -> list[asyncpg.Record]:
+        """Pick exact or HNSW search from the estimated filtered size.
+
+        Postgres' row estimate for the filters decides. A small subset
+        is ranked exactly: ordering by the score expression, which the
+        HNSW index cannot serve, makes the planner filter first through
+        the B-tree indexes and sort what remains. A large subset uses
+        HNSW with pgvector's iterative scan, which keeps walking the
+        graph until ``top_k`` rows pass the filters instead of returning
+        fewer. The exact plan always ranks by full precision. Both keep
+        one chunk per near-duplicate group, preferring the canonical one.
+        """
+        include_linked = _scopes_linked_chunks(filters)
+        scope = "TRUE" if include_linked else "c.canonical_chunk_id IS NULL"
+        join, where, params = _filter_sql(filters, first_param=3)
+        async with self._transaction() as conn:
+            estimate_join, estimate_where, estimate_params = _filter_sql(
+                filters, first_param=1
+            )
+            plan = await conn.fetchval(
+                f"""
+                EXPLAIN (FORMAT JSON)
+                SELECT 1 FROM chunks AS c {estimate_join}
+                WHERE {scope} AND {estimate_where}
+                """,
+                *estimate_params,
+            )
+            estimate = json.loads(plan)[0]["Plan"]["Plan Rows"]
+            if estimate <= self._exact_search_max_rows:
+                query = f"""
+                    SELECT * FROM (
+                        SELECT DISTINCT ON (
+                            coalesce(c.canonical_chunk_id, c.id)
+                        )
+                            {_CHUNK_SELECT},
+                            1 - (c.embedding <=> $1::vector) AS score
+                        FROM chunks AS c
+                        LEFT JOIN document_texts AS t
+                            ON t.document_id = c.document_id
+                        {join}
+                        WHERE {scope} AND {where}
+                        ORDER BY
+                            coalesce(c.canonical_chunk_id, c.id),
+                            c.canonical_chunk_id IS NOT NULL
+                    ) AS matched
+                    ORDER BY score DESC
+                    LIMIT $2
                 """
-                SELECT
-                    id,
-                    document_id,
-                    chunk_index,
-                    section,
-                    content,
-                    1 - (embedding <=> $1::vector) AS score
-                FROM chunks
-                ORDER BY embedding <=> $1::vector
-                LIMIT $2
+            else:
+                await _apply_local_settings(
+                    conn,
+                    {
+                        **hnsw,
+                        "hnsw.iterative_scan": "relaxed_order",
+                        "hnsw.max_scan_tuples": str(
+                            self._hnsw_max_scan_tuples
+                        ),
+                    },
+                )
+                query = self._nearest_query(join, where, include_linked)
+            return list(await conn.fetch(query, embedding, top_k, *params))
+
+    async def list_by_document(self, document_id: str) -> list[Chunk]:
+        """Load a document's chunks without their vectors."""
+        try:
+            rows = await self._executor.fetch(
+                f"""
+                SELECT {_CHUNK_SELECT}
+                FROM chunks AS c
+                LEFT JOIN document_texts AS t
+                    ON t.document_id = c.document_id
+                WHERE c.document_id = $1
+                ORDER BY c.chunk_index
                 """,
-                _vector_literal(embedding),
-                top_k,
+                document_id,
             )
         except asyncpg.PostgresError as exc:
-            raise StorageError("Failed to search chunks") from exc
+            raise StorageError("Failed to load chunks") from exc
+        return await self._materialize(rows)
+
+    async def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Delete chunks by id in one statement."""
+        if not chunk_ids:
+            return
+        try:
+            await self._executor.execute(
+                "DELETE FROM chunks WHERE id = ANY($1::uuid[])",
+                chunk_ids,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to delete chunks") from exc
+
+    async def reindex_chunks(self, positions: dict[str, int]) -> None:
+        """Update ``chunk_index`` only, leaving vectors and HNSW untouched."""
+        if not positions:
+            return
+        try:
+            await self._executor.execute(
+                """
+                UPDATE chunks
+                SET chunk_index = moved.chunk_index
+                FROM unnest($1::uuid[], $2::integer[])
+                    AS moved(id, chunk_index)
+                WHERE chunks.id = moved.id
+                """,
+                list(positions),
+                list(positions.values()),
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to reindex chunks") from exc
+
+    async def add_sketches(self, sketches: dict[str, MinHashSketch]) -> None:
+        """Insert MinHash sketches of canonical chunks."""
+        if not sketches:
+            return
+        try:
+            await self._executor.executemany(
+                """
+                INSERT INTO chunk_minhash (chunk_id, signature, band_keys)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (chunk_id) DO NOTHING
+                """,
+                [
+                    (chunk_id, sketch.signature, sketch.band_keys)
+                    for chunk_id, sketch in sketches.items()
+                ],
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to persist chunk sketches") from exc
+
+    async def find_near_duplicate_candidates(
+        self, band_keys: list[int]
+    ) -> list[tuple[Chunk, MinHashSketch]]:
+        """Look up canonical chunks sharing a band through the GIN index."""
+        if not band_keys:
+            return []
+        try:
+            rows = await self._executor.fetch(
+                f"""
+                SELECT {_CHUNK_SELECT}, m.signature, m.band_keys
+                FROM chunk_minhash AS m
+                JOIN chunks AS c ON c.id = m.chunk_id
+                LEFT JOIN document_texts AS t
+                    ON t.document_id = c.document_id
+                WHERE m.band_keys && $1::bigint[]
+                    AND c.canonical_chunk_id IS NULL
+                """,
+                band_keys,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to look up chunk sketches") from exc
+        chunks = await self._materialize(rows)
         return [
-            ChunkWithScore(
-                chunk=Chunk(
-                    id=str(row["id"]),
-                    document_id=str(row["document_id"]),
-                    chunk_index=row["chunk_index"],
-                    section=row["section"],
-                    text=row["content"],
+            (
+                chunk,
+                MinHashSketch(
+                    signature=list(row["signature"]),
+                    band_keys=list(row["band_keys"]),
                 ),
-                score=float(row["score"]),
             )
+            for chunk, row in zip(chunks, rows, strict=True)
+        ]
+
+    async def get_embeddings(
+        self, chunk_ids: list[str]
+    ) -> dict[str, list[float]]:
+        """Load the vectors of existing chunks by id."""
+        if not chunk_ids:
+            return {}
+        try:
+            rows = await self._executor.fetch(
+                "SELECT id, embedding FROM chunks WHERE id = ANY($1::uuid[])",
+                chunk_ids,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to load chunk embeddings") from exc
+        return {str(row["id"]): row["embedding"] for row in rows}
+
+    async def respan_chunks(self, spans: dict[str, tuple[int, int]]) -> None:
+        """Set new spans and drop the inline text.
+
+        Chunks stored before span storage are migrated the same way.
+        """
+        if not spans:
+            return
+        try:
+            await self._executor.execute(
+                """
+                UPDATE chunks
+                SET span_start = moved.span_start,
+                    span_end = moved.span_end,
+                    content = NULL
+                FROM unnest($1::uuid[], $2::integer[], $3::integer[])
+                    AS moved(id, span_start, span_end)
+                WHERE chunks.id = moved.id
+                """,
+                list(spans),
+                [start for start, _ in spans.values()],
+                [end for _, end in spans.values()],
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to update chunk spans") from exc
+
+    async def _materialize(
+        self, rows: Sequence[Mapping[str, Any]]
+    ) -> list[Chunk]:
+        """Turn rows into chunks, loading uncached document texts once."""
+        digests = {
+            row["text_sha256"]
             for row in rows
+            if row["content"] is None and row["text_sha256"] is not None
+        }
+        texts = {digest: self._text_cache.get(digest) for digest in digests}
+        missing = [digest for digest, text in texts.items() if text is None]
+        if missing:
+            try:
+                loaded = await self._executor.fetch(
+                    """
+                    SELECT DISTINCT ON (text_sha256) text_sha256, content
+                    FROM document_texts
+                    WHERE text_sha256 = ANY($1::text[])
+                    """,
+                    missing,
+                )
+            except asyncpg.PostgresError as exc:
+                raise StorageError("Failed to load document text") from exc
+            for row in loaded:
+                text = _decompress_text(row["content"])
+                texts[row["text_sha256"]] = text
+                self._text_cache.put(row["text_sha256"], text)
+        return [
+            _row_to_chunk(row, texts.get(row["text_sha256"])) for row in rows
         ]
 
 
+def _compress_pages(pages: list[str]) -> bytes:
+    return zlib.compress(json.dumps(pages).encode())
+
+
+def _decompress_pages(data: bytes) -> list[str]:
+    pages: list[str] = json.loads(zlib.decompress(data))
+    return pages
+
+
+class PostgresPageTextStore(_PostgresRepository):
+    """Zlib-compressed page texts, one row per uploaded PDF digest."""
+
+    async def get(self, content_sha256: str) -> list[str] | None:
+        """Load and decompress the page texts of one upload."""
+        try:
+            data = await self._executor.fetchval(
+                "SELECT pages FROM page_texts WHERE content_sha256 = $1",
+                content_sha256,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to load page text") from exc
+        return _decompress_pages(data) if data is not None else None
+
+    async def put(self, content_sha256: str, pages: list[str]) -> None:
+        """Insert compressed page texts; an existing row is kept."""
+        try:
+            await self._executor.execute(
+                """
+                INSERT INTO page_texts (content_sha256, page_count, pages)
+                VALUES ($1, $2, $3)
+                ON CONFLICT DO NOTHING
+                """,
+                content_sha256,
+                len(pages),
+                _compress_pages(pages),
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to persist page text") from exc
+
+    async def delete(self, content_sha256: str) -> None:
+        """Delete the page texts of one upload."""
+        try:
+            await self._executor.execute(
+                "DELETE FROM page_texts WHERE content_sha256 = $1",
+                content_sha256,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to delete page text") from exc
+
+
+class PostgresDocumentTextStore(_PostgresRepository):
+    """Zlib-compressed normalized text, one row per document."""
+
+    async def get(self, document_id: str) -> str | None:
+        """Load and decompress the text of one document."""
+        try:
+            data = await self._executor.fetchval(
+                "SELECT content FROM document_texts WHERE document_id = $1",
+                document_id,
+            )
+        except asyncpg.DataError:
+            # Not a valid UUID, so it cannot name an existing document.
+            return None
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to load document text") from exc
+        return _decompress_text(data) if data is not None else None
+
+    async def put(self, document_id: str, text: str) -> None:
+        """Insert or replace the compressed text of one document."""
+        try:
+            await self._executor.execute(
+                """
+                INSERT INTO document_texts (
+                    document_id, text_sha256, length, content
+                )
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (document_id) DO UPDATE
+                SET text_sha256 = EXCLUDED.text_sha256,
+                    length = EXCLUDED.length,
+                    content = EXCLUDED.content
+                """,
+                document_id,
+                hashlib.sha256(text.encode()).hexdigest(),
+                len(text),
+                _compress_text(text),
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to persist document text") from exc
+
+    async def delete(self, document_id: str) -> None:
+        """Delete the text of one document."""
+        try:
+            await self._executor.execute(
+                "DELETE FROM document_texts WHERE document_id = $1",
+                document_id,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to delete document text") from exc
+
+
+class PostgresUnitOfWork:
+    """Run document and chunk writes on one connection and transaction."""
+
+    def __init__(
+        self,
+        db: PostgresPool,
+        copy_batch_size: int = 2000,
+        text_cache: DocumentTextCache | None = None,
+    ) -> None:
+        """Store db dependency, chunk bulk-load sizing and text cache."""
+        self._db = db
+        self._copy_batch_size = copy_batch_size
+        self._text_cache = (
+            text_cache if text_cache is not None else DocumentTextCache()
+        )
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[TransactionScope]:
+        """Yield repositories bound to a fresh transaction."""
+        try:
+            async with self._db.pool.acquire() as conn:
+                async with conn.transaction():
+                    yield TransactionScope(
+                        documents=PostgresDocumentRepository(
+                            self._db, connection=conn
+                        ),
+                        chunks=PostgresChunkRepository(
+                            self._db,
+                            copy_batch_size=self._copy_batch_size,
+                            connection=conn,
+                            text_cache=self._text_cache,
+                        ),
+                        pages=PostgresPageTextStore(self._db, connection=conn),
+                        texts=PostgresDocumentTextStore(
+                            self._db, connection=conn
+                        ),
+                    )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to commit upload") from exc
+
+
 class PostgresChatHistoryRepository:
     """Persist and load short chat history for prompt building."""
 
@@ -191,3 +999,253 @@ class PostgresChatHistoryRepository:
             for row in rows
         ]
         return list(reversed(items))
+
+
+_JOB_COLUMNS = """
+    id, filename, status, document_id, error, stage_seconds, attempts,
+    created_at, started_at, finished_at
+"""
+
+
+def _row_to_job(row: Mapping[str, Any]) -> IngestJob:
+    return IngestJob(
+        id=str(row["id"]),
+        filename=row["filename"],
+        status=row["status"],
+        document_id=(
+            str(row["document_id"]) if row["document_id"] is not None else None
+        ),
+        error=row["error"],
+        stage_seconds=json.loads(row["stage_seconds"]),
+        attempts=row["attempts"],
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+    )
+
+
+class PostgresIngestJobRepository:
+    """Ingestion job queue backed by a table and ``SKIP LOCKED`` claims."""
+
+    def __init__(
+        self,
+        db: PostgresPool,
+        stale_after_seconds: int,
+        max_attempts: int = 3,
+    ) -> None:
+        """Store db dependency and the running-job reclaim rules.
+
+        Args:
+            db: Connection pool.
+            stale_after_seconds: A ``running`` job without a heartbeat
+                for this long (its worker died) becomes claimable again.
+            max_attempts: Claims a job gets. A stale job that already
+                had them all, such as one that keeps crashing its
+                worker, is marked failed instead of claimed again.
+        """
+        self._db = db
+        self._stale_after_seconds = stale_after_seconds
+        self._max_attempts = max_attempts
+
+    async def enqueue(self, job: IngestJob, content: bytes) -> None:
+        """Insert a queued job row with the upload bytes."""
+        try:
+            await self._db.pool.execute(
+                """
+                INSERT INTO ingest_jobs (id, filename, content, created_at)
+                VALUES ($1, $2, $3, $4)
+                """,
+                job.id,
+                job.filename,
+                content,
+                job.created_at,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to enqueue ingestion job") from exc
+
+    async def claim_next(self) -> tuple[IngestJob, bytes] | None:
+        """Claim the oldest runnable job without blocking other workers.
+
+        Stale jobs that are out of attempts are failed in the same
+        statement.
+        """
+        try:
+            row = await self._db.pool.fetchrow(
+                f"""
+                WITH exhausted AS (
+                    UPDATE ingest_jobs
+                    SET status = 'failed',
+                        error = $3,
+                        content = NULL,
+                        finished_at = NOW()
+                    WHERE status = 'running'
+                      AND coalesce(heartbeat_at, started_at)
+                          < NOW() - make_interval(secs => $1)
+                      AND attempts >= $2
+                )
+                UPDATE ingest_jobs
+                SET status = 'running',
+                    started_at = NOW(),
+                    heartbeat_at = NOW(),
+                    attempts = attempts + 1
+                WHERE id = (
+                    SELECT id
+                    FROM ingest_jobs
+                    WHERE status = 'queued'
+                       OR (
+                           status = 'running'
+                           AND coalesce(heartbeat_at, started_at)
+                               < NOW() - make_interval(secs => $1)
+                           AND attempts < $2
+                       )
+                    ORDER BY created_at
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING {_JOB_COLUMNS}, content
+                """,
+                float(self._stale_after_seconds),
+                self._max_attempts,
+                f"Worker stopped responding on all {self._max_attempts} "
+                "attempts.",
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to claim ingestion job") from exc
+        if row is None:
+            return None
+        return _row_to_job(row), bytes(row["content"])
+
+    async def heartbeat(self, job_id: str) -> None:
+        """Keep a running job from being reclaimed as stale."""
+        try:
+            await self._db.pool.execute(
+                """
+                UPDATE ingest_jobs SET heartbeat_at = NOW()
+                WHERE id = $1 AND status = 'running'
+                """,
+                job_id,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to update ingestion job") from exc
+
+    async def complete(
+        self,
+        job_id: str,
+        attempt: int,
+        document_id: str,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        """Record success and release the stored upload bytes."""
+        return await self._finish(
+            job_id, attempt, "succeeded", document_id, None, stage_seconds
+        )
+
+    async def fail(
+        self,
+        job_id: str,
+        attempt: int,
+        error: str,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        """Record failure and release the stored upload bytes."""
+        return await self._finish(
+            job_id, attempt, "failed", None, error, stage_seconds
+        )
+
+    async def _finish(
+        self,
+        job_id: str,
+        attempt: int,
+        status: str,
+        document_id: str | None,
+        error: str | None,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        # A worker whose heartbeat lapsed may finish after the job was
+        # reclaimed; matching the claimed attempt leaves the new run be.
+        try:
+            finished = await self._db.pool.fetchval(
+                """
+                UPDATE ingest_jobs
+                SET status = $3,
+                    document_id = $4,
+                    error = $5,
+                    stage_seconds = $6::jsonb,
+                    content = NULL,
+                    finished_at = NOW()
+                WHERE id = $1 AND status = 'running' AND attempts = $2
+                RETURNING id
+                """,
+                job_id,
+                attempt,
+                status,
+                document_id,
+                error,
+                json.dumps(stage_seconds),
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to update ingestion job") from exc
+        return finished is not None
+
+    async def get(self, job_id: str) -> IngestJob | None:
+        """Load a job without its upload bytes."""
+        try:
+            row = await self._db.pool.fetchrow(
+                f"SELECT {_JOB_COLUMNS} FROM ingest_jobs WHERE id = $1",
+                job_id,
+            )
+        except asyncpg.DataError:
+            # Not a valid UUID, so it cannot name an existing job.
+            return None
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to load ingestion job") from exc
+        return _row_to_job(row) if row is not None else None
+
+
+class PostgresEmbeddingStore:
+    """Content-addressed embedding cache shared by all app processes."""
+
+    def __init__(self, db: PostgresPool) -> None:
+        """Store db dependency."""
+        self._db = db
+
+    async def get_many(
+        self, model: str, digests: list[str]
+    ) -> dict[str, list[float]]:
+        """Fetch stored vectors for *digests* in one round trip."""
+        if not digests:
+            return {}
+        try:
+            rows = await self._db.pool.fetch(
+                """
+                SELECT text_sha256, embedding
+                FROM embedding_cache
+                WHERE model = $1 AND text_sha256 = ANY($2::text[])
+                """,
+                model,
+                digests,
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to read embedding cache") from exc
+        return {row["text_sha256"]: row["embedding"] for row in rows}
+
+    async def put_many(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        """Insert vectors; digests already stored are left untouched."""
+        if not embeddings:
+            return
+        try:
+            await self._db.pool.executemany(
+                """
+                INSERT INTO embedding_cache (model, text_sha256, embedding)
+                VALUES ($1, $2, $3)
+                ON CONFLICT DO NOTHING
+                """,
+                [
+                    (model, digest, vector)
+                    for digest, vector in embeddings.items()
+                ],
+            )
+        except asyncpg.PostgresError as exc:
+            raise StorageError("Failed to write embedding cache") from exc
@@ -0,0 +1,287 @@
+"""PDF parsing in killable, resource-limited worker processes."""
+
+import logging
+import multiprocessing
+import queue
+import resource
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterator
+from io import BytesIO
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from types import FrameType
+from typing import Any
+
+from pypdf import PdfReader
+
+from findocbot.domain.exceptions import UnreadableDocumentError
+from findocbot.infrastructure.pdf_parser import as_pdf_bytes
+from findocbot.use_cases.ports import PDFSource
+
+logger = logging.getLogger(__name__)
+
+
+class _PageTimeoutError(Exception):
+    pass
+
+
+def _raise_page_timeout(signum: int, frame: FrameType | None) -> None:
+    raise _PageTimeoutError
+
+
+def _parse_document(
+    conn: Connection, content: bytes, page_timeout: float
+) -> None:
+    """Stream ``page``/``skip`` messages for one document, then ``done``."""
+    reader = PdfReader(BytesIO(content))
+    for index, page in enumerate(reader.pages):
+        signal.setitimer(signal.ITIMER_REAL, page_timeout)
+        try:
+            text = (page.extract_text() or "").strip()
+        except _PageTimeoutError:
+            conn.send(("skip", index, f"timed out after {page_timeout}s"))
+            continue
+        except MemoryError:
+            raise
+        except Exception as exc:
+            conn.send(("skip", index, type(exc).__name__))
+            continue
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        conn.send(("page", index, text))
+    conn.send(("done",))
+
+
+def _sandbox_main(
+    conn: Connection,
+    memory_limit_bytes: int | None,
+    page_timeout: float,
+) -> None:
+    """Worker loop: parse documents sent over *conn* until ``None``."""
+    if memory_limit_bytes is not None:
+        resource.setrlimit(
+            resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes)
+        )
+    signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while (content := conn.recv()) is not None:
+        try:
+            _parse_document(conn, content, page_timeout)
+        except MemoryError:
+            # The heap may be fragmented past use; exit so it is replaced.
+            conn.send(("error", "memory limit exceeded", True))
+            return
+        except Exception as exc:
+            conn.send((
+                "error",
+                f"malformed PDF ({type(exc).__name__})",
+                False,
+            ))
+
+
+class _SandboxWorker:
+    """One parser subprocess and the parent end of its pipe."""
+
+    def __init__(
+        self,
+        context: Any,
+        memory_limit_bytes: int | None,
+        page_timeout: float,
+    ) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process: BaseProcess = context.Process(
+            target=_sandbox_main,
+            args=(child_conn, memory_limit_bytes, page_timeout),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.documents = 0
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class SandboxedPDFParser:
+    """Extract PDF text in subprocesses that can be capped and killed.
+
+    Each document is parsed by one worker from a small pool. Workers run
+    under an address-space limit (``RLIMIT_AS``) and a per-page alarm; a
+    page that times out or raises is skipped and reported instead of
+    failing the document. A document that keeps the caller waiting on
+    its worker past the wall-clock budget kills the worker, and workers
+    are recycled after a fixed number of documents to bound slow leaks
+    in pypdf.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout_seconds: float = 120.0,
+        page_timeout_seconds: float = 10.0,
+        memory_limit_mb: int | None = 1024,
+        recycle_after: int = 50,
+    ) -> None:
+        """Configure the worker pool and its limits.
+
+        Args:
+            workers: Maximum concurrent parser processes; further callers
+                wait for a free worker.
+            timeout_seconds: Budget for waiting on the worker over one
+                whole document. Time the consumer spends between pages
+                is not counted.
+            page_timeout_seconds: Budget for one page before it is skipped.
+            memory_limit_mb: Address-space cap per worker, or ``None``.
+            recycle_after: Documents a worker parses before it is replaced.
+        """
+        self._timeout = timeout_seconds
+        self._page_timeout = page_timeout_seconds
+        self._memory_limit = (
+            memory_limit_mb * 1024 * 1024
+            if memory_limit_mb is not None
+            else None
+        )
+        self._recycle_after = recycle_after
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle: queue.SimpleQueue[_SandboxWorker] = queue.SimpleQueue()
+
+    def extract_text(self, content: PDFSource) -> str:
+        """Return concatenated page text."""
+        return "\n\n".join(text for text in self.iter_pages(content) if text)
+
+    def iter_pages(
+        self,
+        content: PDFSource,
+        on_skipped_page: Callable[[int, str], None] | None = None,
+    ) -> Iterator[str]:
+        """Yield page texts from a sandboxed worker, in page order.
+
+        Skipped pages are yielded as ``""`` and passed to
+        *on_skipped_page* with their zero-based index and the reason.
+        The timeout clock only runs while waiting for the next page, so
+        a slow consumer, such as a streaming upload waiting on the
+        embedding provider, does not use up the parser's budget.
+
+        Raises:
+            UnreadableDocumentError: The PDF is malformed, or its worker
+                ran out of time or memory.
+        """
+        data = as_pdf_bytes(content)
+        self._slots.acquire()
+        worker: _SandboxWorker | None = None
+        finished = False
+        try:
+            worker = self._acquire_worker()
+            try:
+                worker.conn.send(data)
+            except OSError:
+                # Died after the liveness check; one fresh worker retries.
+                worker.kill()
+                worker = self._spawn_worker()
+                self._send(worker, data)
+            budget = self._timeout
+            while True:
+                waiting_since = time.monotonic()
+                message = self._receive(worker, budget)
+                budget -= time.monotonic() - waiting_since
+                if message[0] == "done":
+                    finished = True
+                    return
+                if message[0] == "error":
+                    finished = not message[2]
+                    raise UnreadableDocumentError(
+                        f"Could not parse PDF: {message[1]}."
+                    )
+                if message[0] == "skip":
+                    logger.warning(
+                        f"Skipped PDF page {message[1] + 1}: {message[2]}"
+                    )
+                    if on_skipped_page is not None:
+                        on_skipped_page(message[1], message[2])
+                    yield ""
+                else:
+                    yield message[2]
+        finally:
+            if worker is not None:
+                self._release_worker(worker, reusable=finished)
+            self._slots.release()
+
+    def stop(self) -> None:
+        """Stop idle workers; busy workers stop when released."""
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+    def _acquire_worker(self) -> _SandboxWorker:
+        """Return a live idle worker, or start one.
+
+        Idle workers can die between documents, for example when the
+        kernel OOM killer picks them, so dead ones are discarded here.
+        """
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn_worker()
+            if worker.process.is_alive():
+                return worker
+            worker.kill()
+
+    def _spawn_worker(self) -> _SandboxWorker:
+        return _SandboxWorker(
+            self._context, self._memory_limit, self._page_timeout
+        )
+
+    @staticmethod
+    def _send(worker: _SandboxWorker, data: bytes) -> None:
+        try:
+            worker.conn.send(data)
+        except OSError as exc:
+            raise UnreadableDocumentError(
+                "PDF parser worker crashed."
+            ) from exc
+
+    def _release_worker(self, worker: _SandboxWorker, reusable: bool) -> None:
+        worker.documents += 1
+        if not reusable or not worker.process.is_alive():
+            # Mid-document: the pipe holds unread pages, so the worker
+            # cannot be reused.
+            worker.kill()
+        elif worker.documents >= self._recycle_after:
+            worker.stop()
+        else:
+            self._idle.put(worker)
+
+    def _receive(
+        self, worker: _SandboxWorker, budget: float
+    ) -> tuple[Any, ...]:
+        if budget <= 0 or not worker.conn.poll(budget):
+            raise UnreadableDocumentError(
+                f"PDF parsing exceeded {self._timeout:g}s."
+            )
+        try:
+            message: tuple[Any, ...] = worker.conn.recv()
+        except (EOFError, OSError) as exc:
+            # Killed from outside, typically by the kernel OOM killer.
+            raise UnreadableDocumentError(
+                "PDF parser worker crashed."
+            ) from exc
+        return message
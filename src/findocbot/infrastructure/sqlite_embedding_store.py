@@ -0,0 +1,122 @@
+"""Single-host embedding store backed by a local SQLite file."""
+
+import asyncio
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+
+from findocbot.domain.exceptions import StorageError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    text_sha256 TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    PRIMARY KEY (model, text_sha256)
+) WITHOUT ROWID
+"""
+
+# SQLite's default limit on host parameters is 999 in older builds.
+_LOOKUP_BATCH = 500
+
+
+def _pack(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class SqliteEmbeddingStore:
+    """Embedding cache for deployments without a shared Postgres.
+
+    Vectors are stored as float32 blobs, matching pgvector's precision.
+    The connection runs in WAL mode so several processes on one host can
+    read while one writes; calls are serialized per process and run in a
+    worker thread to keep the event loop free.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Remember the database path; the file is opened lazily."""
+        self._path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def get_many(
+        self, model: str, digests: list[str]
+    ) -> dict[str, list[float]]:
+        """Return stored embeddings for the digests that are present."""
+        if not digests:
+            return {}
+        return await asyncio.to_thread(self._get_many, model, digests)
+
+    async def put_many(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        """Store embeddings by digest; existing entries are kept."""
+        if not embeddings:
+            return
+        await asyncio.to_thread(self._put_many, model, embeddings)
+
+    def close(self) -> None:
+        """Close the underlying connection if it was opened."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self._path, check_same_thread=False, timeout=30.0
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _get_many(
+        self, model: str, digests: list[str]
+    ) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        try:
+            with self._lock:
+                connection = self._connect()
+                for start in range(0, len(digests), _LOOKUP_BATCH):
+                    batch = digests[start : start + _LOOKUP_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = connection.execute(
+                        "SELECT text_sha256, embedding FROM embedding_cache "
+                        f"WHERE model = ? AND text_sha256 IN ({placeholders})",
+                        [model, *batch],
+                    )
+                    found.update(
+                        (digest, _unpack(blob)) for digest, blob in rows
+                    )
+        except sqlite3.Error as exc:
+            raise StorageError("Failed to read embedding cache") from exc
+        return found
+
+    def _put_many(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO embedding_cache "
+                        "(model, text_sha256, embedding) VALUES (?, ?, ?)",
+                        [
+                            (model, digest, _pack(vector))
+                            for digest, vector in embeddings.items()
+                        ],
+                    )
+        except sqlite3.Error as exc:
+            raise StorageError("Failed to write embedding cache") from exc
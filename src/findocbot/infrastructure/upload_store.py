@@ -0,0 +1,143 @@
+"""Resumable upload parts on the local filesystem."""
+
+import asyncio
+import json
+import os
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, cast
+from uuid import UUID
+
+from findocbot.domain.entities import UploadSession
+from findocbot.domain.exceptions import StorageError
+
+
+def _parse_id(upload_id: str) -> str | None:
+    """Return the canonical id, or ``None`` if it is not a UUID.
+
+    Ids become file names, so anything else is rejected before it can
+    name a path outside the upload directory.
+    """
+    try:
+        return str(UUID(upload_id))
+    except ValueError:
+        return None
+
+
+class LocalUploadStore:
+    """One ``<id>.part`` data file and ``<id>.json`` progress file each.
+
+    Data is fsynced before the progress file is atomically replaced, so
+    after a crash ``received`` never counts bytes that were not written.
+    All processes sharing *directory* see the same uploads.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        """Store the directory; it is created on first use."""
+        self._directory = Path(directory)
+
+    async def create(self, session: UploadSession) -> None:
+        """Create an empty data file and the progress file."""
+        await asyncio.to_thread(self._create_sync, session)
+
+    async def get(self, upload_id: str) -> UploadSession | None:
+        """Load upload progress."""
+        return await asyncio.to_thread(self._get_sync, upload_id)
+
+    async def write(self, upload_id: str, offset: int, data: bytes) -> None:
+        """Write *data* at *offset*, fsync, then record the progress."""
+        await asyncio.to_thread(self._write_sync, upload_id, offset, data)
+
+    async def open(self, upload_id: str) -> BinaryIO:
+        """Open the data file for reading."""
+        path = self._data_path(upload_id)
+        return cast(BinaryIO, await asyncio.to_thread(path.open, "rb"))
+
+    async def delete(self, upload_id: str) -> None:
+        """Remove the data and progress files."""
+        await asyncio.to_thread(self._delete_sync, upload_id)
+
+    async def purge(self, created_before: datetime) -> int:
+        """Remove uploads that were created before *created_before*."""
+        return await asyncio.to_thread(self._purge_sync, created_before)
+
+    def _data_path(self, upload_id: str) -> Path:
+        return self._directory / f"{upload_id}.part"
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self._directory / f"{upload_id}.json"
+
+    def _save(self, session: UploadSession) -> None:
+        temporary = self._directory / f"{session.id}.json.tmp"
+        temporary.write_text(
+            json.dumps({
+                "id": session.id,
+                "filename": session.filename,
+                "size": session.size,
+                "received": session.received,
+                "created_at": session.created_at.isoformat(),
+            }),
+            encoding="utf-8",
+        )
+        os.replace(temporary, self._meta_path(session.id))
+
+    def _create_sync(self, session: UploadSession) -> None:
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self._data_path(session.id).touch()
+            self._save(session)
+        except OSError as exc:
+            raise StorageError("Failed to create upload") from exc
+
+    def _get_sync(self, upload_id: str) -> UploadSession | None:
+        canonical = _parse_id(upload_id)
+        if canonical is None:
+            return None
+        try:
+            raw = self._meta_path(canonical).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            raise StorageError("Failed to load upload") from exc
+        entry = json.loads(raw)
+        return UploadSession(
+            id=entry["id"],
+            filename=entry["filename"],
+            size=entry["size"],
+            received=entry["received"],
+            created_at=datetime.fromisoformat(entry["created_at"]),
+        )
+
+    def _write_sync(self, upload_id: str, offset: int, data: bytes) -> None:
+        session = self._get_sync(upload_id)
+        if session is None:
+            raise StorageError("Upload disappeared while writing")
+        try:
+            with self._data_path(session.id).open("r+b") as part:
+                part.seek(offset)
+                part.write(data)
+                part.flush()
+                os.fsync(part.fileno())
+            received = max(session.received, offset + len(data))
+            self._save(replace(session, received=received))
+        except OSError as exc:
+            raise StorageError("Failed to store upload bytes") from exc
+
+    def _delete_sync(self, upload_id: str) -> None:
+        canonical = _parse_id(upload_id)
+        if canonical is None:
+            return
+        for path in (self._meta_path(canonical), self._data_path(canonical)):
+            path.unlink(missing_ok=True)
+
+    def _purge_sync(self, created_before: datetime) -> int:
+        if not self._directory.exists():
+            return 0
+        purged = 0
+        for meta in self._directory.glob("*.json"):
+            session = self._get_sync(meta.stem)
+            if session is not None and session.created_at < created_before:
+                self._delete_sync(session.id)
+                purged += 1
+        return purged
@@ -1,13 +1,23 @@
 """Application entrypoint."""
 
+import argparse
+import asyncio
+import signal
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 import uvicorn
 from fastapi import FastAPI
 
 from findocbot.adapters.api.routes import build_router
-from findocbot.config import load_settings
+from findocbot.adapters.cli.ingest import (
+    CHECKPOINT_NAME,
+    IngestCheckpoint,
+    ingest_directory,
+)
+from findocbot.config import Settings, load_settings
+from findocbot.domain.exceptions import FinDocBotError
 from findocbot.infrastructure.container import AppContainer, create_container
 
 
@@ -36,8 +46,183 @@ def create_app(
     return app
 
 
-def run() -> None:
-    """Run the application with the default host and port."""
+async def run_worker(settings: Settings) -> None:
+    """Consume queued ingestion jobs until SIGINT or SIGTERM.
+
+    ``ingest_async`` is forced on so the container builds its worker pool
+    with ``settings.ingest_workers`` consumers. ``INGEST_WORKERS=0`` only
+    keeps API processes from consuming, so this entrypoint runs at least
+    one consumer.
+    """
+    container = create_container(
+        settings.model_copy(
+            update={
+                "ingest_async": True,
+                "ingest_workers": max(1, settings.ingest_workers),
+            }
+        )
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await container.startup()
+    try:
+        await stop.wait()
+    finally:
+        await container.shutdown()
+
+
+async def run_rechunk(settings: Settings, document_ids: list[str]) -> None:
+    """Re-chunk *document_ids*, or every document when empty.
+
+    Documents that cannot be re-chunked are reported and skipped so one
+    legacy upload does not abort a corpus-wide run.
+    """
+    container = create_container(
+        settings.model_copy(update={"ingest_async": False})
+    )
+    rechunk = container.rechunk_document
+    if rechunk is None:
+        raise SystemExit("Re-chunking is not configured.")
+    await container.startup()
+    try:
+        for document_id in document_ids or await rechunk.document_ids():
+            try:
+                result = await rechunk.execute(document_id)
+            except FinDocBotError as error:
+                print(f"{document_id}: skipped ({error})")
+                continue
+            print(
+                f"{document_id}: {result.chunks} chunks, "
+                f"{result.reused} reused, {result.embedded} embedded, "
+                f"{result.removed} removed"
+            )
+    finally:
+        await container.shutdown()
+
+
+async def run_ingest(
+    settings: Settings,
+    directory: Path,
+    checkpoint: Path | None,
+    batch_files: int,
+    retry_failed: bool,
+) -> None:
+    """Load every PDF under *directory*, resuming from *checkpoint*.
+
+    Parsing uses the sandboxed parser's process pool with
+    ``bulk_parse_concurrency`` workers, whatever ``PDF_SANDBOX_ENABLED``
+    says, so documents are parsed on several cores.
+    """
+    container = create_container(
+        settings.model_copy(
+            update={
+                "ingest_async": False,
+                "pdf_sandbox_enabled": True,
+                "pdf_sandbox_workers": settings.bulk_parse_concurrency,
+            }
+        )
+    )
+    if container.bulk_upload is None:
+        raise SystemExit("Bulk upload is not configured.")
+    await container.startup()
+    try:
+        progress = await ingest_directory(
+            container.bulk_upload,
+            directory,
+            IngestCheckpoint(checkpoint or directory / CHECKPOINT_NAME),
+            batch_files=batch_files,
+            retry_failed=retry_failed,
+        )
+    finally:
+        await container.shutdown()
+    if progress.total_files == 0:
+        print("Nothing to ingest.")
+
+
+def run(argv: list[str] | None = None) -> None:
+    """Run a ``findocbot`` subcommand; ``serve`` is the default."""
+    parser = argparse.ArgumentParser(prog="findocbot")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="Serve the HTTP API (default).")
+    worker = commands.add_parser(
+        "worker", help="Consume queued ingestion jobs."
+    )
+    worker.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Consumer loops (default: INGEST_WORKERS).",
+    )
+    rechunk = commands.add_parser(
+        "rechunk",
+        help="Rebuild chunks from cached page text with current settings.",
+    )
+    rechunk.add_argument(
+        "document_ids",
+        nargs="*",
+        help="Documents to re-chunk (default: all).",
+    )
+    ingest = commands.add_parser(
+        "ingest", help="Load every PDF under a directory, resumably."
+    )
+    ingest.add_argument("directory", type=Path)
+    ingest.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help=f"Progress log (default: DIRECTORY/{CHECKPOINT_NAME}).",
+    )
+    ingest.add_argument(
+        "--batch-files",
+        type=int,
+        default=16,
+        help="Files embedded and committed together.",
+    )
+    ingest.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Parser processes (default: BULK_PARSE_CONCURRENCY).",
+    )
+    ingest.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Retry files that failed in an earlier run.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        settings = load_settings()
+        if args.concurrency is not None:
+            if args.concurrency < 1:
+                parser.error("--concurrency must be at least 1")
+            settings = settings.model_copy(
+                update={"ingest_workers": args.concurrency}
+            )
+        asyncio.run(run_worker(settings))
+        return
+    if args.command == "rechunk":
+        asyncio.run(run_rechunk(load_settings(), args.document_ids))
+        return
+    if args.command == "ingest":
+        settings = load_settings()
+        if args.parse_workers is not None:
+            settings = settings.model_copy(
+                update={"bulk_parse_concurrency": args.parse_workers}
+            )
+        asyncio.run(
+            run_ingest(
+                settings,
+                args.directory,
+                args.checkpoint,
+                args.batch_files,
+                args.retry_failed,
+            )
+        )
+        return
+
     uvicorn.run(
         "findocbot.main:create_app",
         factory=True,
@@ -1,6 +1,14 @@
 """Use-case exports."""
 
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
+from findocbot.use_cases.ingest_jobs import (
+    EnqueueUploadUseCase,
+    GetIngestJobUseCase,
+    ProcessIngestJobUseCase,
+)
+from findocbot.use_cases.rechunk_document import RechunkDocumentUseCase
+from findocbot.use_cases.replace_document import ReplaceDocumentUseCase
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
 )
@@ -8,6 +16,12 @@ from findocbot.use_cases.upload_pdf import UploadPDFUseCase
 
 __all__ = [
     "AnswerQuestionUseCase",
+    "BulkUploadUseCase",
+    "EnqueueUploadUseCase",
+    "GetIngestJobUseCase",
+    "ProcessIngestJobUseCase",
+    "RechunkDocumentUseCase",
+    "ReplaceDocumentUseCase",
     "SearchSimilarChunksUseCase",
     "UploadPDFUseCase",
 ]
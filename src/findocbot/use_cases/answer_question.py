@@ -10,6 +10,7 @@ from findocbot.use_cases.dto import AskResponseDTO, SearchResultDTO
 from findocbot.use_cases.ports import (
     ChatHistoryRepositoryPort,
     ModelProviderGateway,
+    SearchFilters,
 )
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
@@ -55,26 +56,52 @@ class AnswerQuestionUseCase:
         search_use_case: SearchSimilarChunksUseCase,
         history: ChatHistoryRepositoryPort,
         max_history_pairs: int = 5,
+        ef_search: int | None = None,
     ) -> None:
-        """Store dependencies for RAG answer generation."""
+        """Store dependencies for RAG answer generation.
+
+        Args:
+            provider: Embeds the question and generates the answer.
+            search_use_case: Retrieves context chunks.
+            history: Stores and lists dialog turns.
+            max_history_pairs: Recent turns included in the prompt.
+            ef_search: Default HNSW candidate list size of context
+                retrieval; ``None`` uses the repository default.
+        """
         self._provider = provider
         self._search_use_case = search_use_case
         self._history = history
         self._max_history_pairs = max_history_pairs
+        self._ef_search = ef_search
 
     async def execute(
         self,
         session_id: str,
         question: str,
         top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
     ) -> AskResponseDTO:
-        """Generate contextual answer and store interaction."""
+        """Generate contextual answer and store interaction.
+
+        Args:
+            session_id: Dialog whose recent turns are used and extended.
+            question: User question.
+            top_k: Number of chunks used as context.
+            filters: Restrict the context to documents, a section or an
+                upload-date range.
+            ef_search: HNSW candidate list size for this question,
+                overriding the default.
+        """
         clean_question = question.strip()
         if not clean_question:
             raise InvalidQueryError("Question cannot be empty.")
 
         sources = await self._search_use_case.execute(
-            clean_question, top_k=top_k
+            clean_question,
+            top_k=top_k,
+            filters=filters,
+            ef_search=ef_search if ef_search is not None else self._ef_search,
         )
         recent_turns = await self._history.list_recent(
             session_id=session_id,
@@ -0,0 +1,357 @@
+"""Bulk upload of many PDFs with cross-document embedding batches."""
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+
+from findocbot.domain.entities import Chunk, Document
+from findocbot.domain.exceptions import (
+    DuplicateDocumentError,
+    EmptyDocumentError,
+    FinDocBotError,
+    InfrastructureError,
+    UnreadableDocumentError,
+)
+from findocbot.use_cases.dto import BulkUploadItemDTO, IngestStats
+from findocbot.use_cases.near_duplicates import (
+    DedupedChunks,
+    NearDuplicateFilter,
+    embed_chunks,
+)
+from findocbot.use_cases.ports import (
+    ChunkerPort,
+    DocumentRepositoryPort,
+    ModelProviderGateway,
+    PDFParserPort,
+    PDFSource,
+    TransactionScope,
+    UnitOfWorkPort,
+)
+from findocbot.use_cases.upload_pdf import iter_chunk_parts, sha256_hex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _ParsedFile:
+    """A new document with its pages, chunks and, later, embeddings."""
+
+    index: int
+    digest: str
+    document: Document
+    pages: list[str]
+    chunks: list[Chunk]
+    text: str | None = None
+    embedded: DedupedChunks = field(default_factory=DedupedChunks)
+
+    def unlink(self, chunk_ids: set[str]) -> None:
+        """Make chunks linked to *chunk_ids* canonical again.
+
+        They already hold a copy of the canonical vector.
+        """
+        self.embedded.chunks = [
+            replace(chunk, canonical_chunk_id=None)
+            if chunk.canonical_chunk_id in chunk_ids
+            else chunk
+            for chunk in self.embedded.chunks
+        ]
+
+
+class BulkUploadUseCase:
+    """Ingest many PDFs in one pass, sharing embedding batches.
+
+    Unlike calling ``UploadPDFUseCase`` per file, files are handled in
+    groups whose chunks are embedded in one ``embed_many`` call, so the
+    gateway sends full batches instead of a small tail batch per
+    document, and each group is written in one unit of work with a
+    single bulk chunk load.
+    """
+
+    def __init__(
+        self,
+        parser: PDFParserPort,
+        chunker: ChunkerPort,
+        provider: ModelProviderGateway,
+        documents: DocumentRepositoryPort,
+        unit_of_work: UnitOfWorkPort,
+        parse_concurrency: int = 4,
+        record_aliases: bool = True,
+        store_page_text: bool = True,
+        near_duplicates: NearDuplicateFilter | None = None,
+        store_chunk_spans: bool = False,
+        batch_files: int = 16,
+    ) -> None:
+        """Store dependencies for bulk ingestion.
+
+        Args:
+            parser: PDF text extractor.
+            chunker: Splits extracted text into chunks.
+            provider: Embedding provider.
+            documents: Document repository for digest lookups and
+                aliases.
+            unit_of_work: Writes documents, chunks and page text.
+            parse_concurrency: Files parsed at the same time. Parsing
+                runs in threads, so it only scales past one core with a
+                process-backed parser such as ``SandboxedPDFParser``.
+            record_aliases: Remember the filename of a duplicate upload as
+                an alias of the existing document.
+            store_page_text: Cache extracted page texts for re-chunking.
+            near_duplicates: When set, chunks that nearly repeat a stored
+                chunk, or one earlier in the request, are linked to it or
+                skipped instead of embedded.
+            store_chunk_spans: Store each document's normalized text once
+                and chunks as spans into it instead of inline text.
+            batch_files: Files parsed, embedded and committed together.
+                Pages, chunks and vectors of one group are held in
+                memory at a time, and each group is its own transaction.
+        """
+        self._parser = parser
+        self._chunker = chunker
+        self._provider = provider
+        self._documents = documents
+        self._unit_of_work = unit_of_work
+        self._parse_slots = asyncio.Semaphore(parse_concurrency)
+        self._record_aliases = record_aliases
+        self._store_page_text = store_page_text
+        self._near_duplicates = near_duplicates
+        self._store_chunk_spans = store_chunk_spans
+        self._batch_files = batch_files
+
+    async def execute(
+        self,
+        files: Sequence[tuple[str, PDFSource]],
+        stats: IngestStats | None = None,
+    ) -> list[BulkUploadItemDTO]:
+        """Ingest *files* and return one result per file, in order.
+
+        Files that are unreadable or empty are reported as ``failed``
+        without affecting the others; files whose bytes are already
+        stored, or repeated within the request, are ``duplicate``.
+        Provider and storage failures are raised, since they are not
+        specific to any one file; groups committed before the failure
+        stay, and their files are duplicates when sent again.
+        """
+        stats = stats if stats is not None else IngestStats()
+        results: list[BulkUploadItemDTO] = []
+        for start in range(0, len(files), self._batch_files):
+            results.extend(
+                await self._execute_group(
+                    files[start : start + self._batch_files], stats
+                )
+            )
+        return results
+
+    async def _execute_group(
+        self, files: Sequence[tuple[str, PDFSource]], stats: IngestStats
+    ) -> list[BulkUploadItemDTO]:
+        """Ingest one group of files in one unit of work."""
+        results: list[BulkUploadItemDTO | None] = [None] * len(files)
+        digests = await asyncio.gather(
+            *(asyncio.to_thread(sha256_hex, content) for _, content in files)
+        )
+
+        first_by_digest: dict[str, int] = {}
+        to_parse: list[int] = []
+        for index, ((filename, _), digest) in enumerate(
+            zip(files, digests, strict=True)
+        ):
+            existing = await self._documents.get_by_digest(digest)
+            if existing is not None:
+                results[index] = await self._duplicate(existing, filename)
+            elif digest not in first_by_digest:
+                first_by_digest[digest] = index
+                to_parse.append(index)
+
+        with stats.measure("parse"):
+            parsed = await asyncio.gather(
+                *(
+                    self._parse(index, *files[index], digests[index])
+                    for index in to_parse
+                )
+            )
+        ready: list[_ParsedFile] = []
+        for index, outcome in zip(to_parse, parsed, strict=True):
+            if isinstance(outcome, _ParsedFile):
+                ready.append(outcome)
+            else:
+                results[index] = BulkUploadItemDTO(
+                    filename=files[index][0],
+                    status="failed",
+                    error=str(outcome),
+                )
+        stats.pages += sum(len(item.pages) for item in ready)
+        stats.chunks += sum(len(item.chunks) for item in ready)
+
+        await self._embed(ready, stats)
+        with stats.measure("persist"):
+            for item in await self._persist(ready):
+                results[item.index] = BulkUploadItemDTO(
+                    filename=item.document.filename,
+                    status="created",
+                    document_id=item.document.id,
+                    pages=len(item.pages),
+                    chunks=len(item.embedded.chunks),
+                )
+        for index, (filename, _) in enumerate(files):
+            if results[index] is None:
+                results[index] = await self._resolve_repeat(
+                    filename,
+                    digests[index],
+                    results[first_by_digest[digests[index]]],
+                )
+        return [item for item in results if item is not None]
+
+    async def _parse(
+        self, index: int, filename: str, content: PDFSource, digest: str
+    ) -> _ParsedFile | FinDocBotError:
+        """Parse and chunk one file in a thread, bounded by the slots."""
+        async with self._parse_slots:
+            try:
+                return await asyncio.to_thread(
+                    self._parse_sync, index, filename, content, digest
+                )
+            except InfrastructureError:
+                raise
+            except FinDocBotError as error:
+                return error
+            except Exception as exc:
+                # pypdf raises its own errors for malformed files; keep
+                # them from failing the rest of the batch.
+                logger.warning(f"Could not parse {filename}: {exc!r}")
+                return UnreadableDocumentError(
+                    f"Could not parse PDF ({type(exc).__name__})."
+                )
+
+    def _parse_sync(
+        self, index: int, filename: str, content: PDFSource, digest: str
+    ) -> _ParsedFile:
+        pages = list(self._parser.iter_pages(content))
+        if not any(pages):
+            raise EmptyDocumentError("Uploaded PDF does not contain text.")
+        document = Document.create(filename=filename, content_sha256=digest)
+        chunks = [
+            Chunk.create(
+                document_id=document.id,
+                chunk_index=chunk_index,
+                text=chunk_text,
+                section=section,
+                span=span,
+            )
+            for chunk_index, (chunk_text, section, span) in enumerate(
+                iter_chunk_parts(self._chunker, pages, self._store_chunk_spans)
+            )
+            if chunk_text.strip()
+        ]
+        return _ParsedFile(
+            index=index,
+            digest=digest,
+            document=document,
+            pages=pages,
+            chunks=chunks,
+            text=(
+                self._chunker.normalize(pages)
+                if self._store_chunk_spans
+                else None
+            ),
+        )
+
+    async def _embed(
+        self, ready: list[_ParsedFile], stats: IngestStats
+    ) -> None:
+        """Embed all chunks in one call so batches span documents."""
+        chunks = [chunk for item in ready for chunk in item.chunks]
+        if not chunks:
+            return
+        session = (
+            self._near_duplicates.session()
+            if self._near_duplicates is not None
+            else None
+        )
+        with stats.measure("embed"):
+            embedded = await embed_chunks(self._provider, chunks, session)
+        stats.near_duplicates += embedded.linked + embedded.skipped
+        owners = {chunk.id: item for item in ready for chunk in item.chunks}
+        for chunk, vector in zip(
+            embedded.chunks, embedded.embeddings, strict=True
+        ):
+            target = owners[chunk.id].embedded
+            target.chunks.append(chunk)
+            target.embeddings.append(vector)
+            if chunk.id in embedded.sketches:
+                target.sketches[chunk.id] = embedded.sketches[chunk.id]
+
+    async def _persist(self, ready: list[_ParsedFile]) -> list[_ParsedFile]:
+        """Write all documents in one transaction; return those created.
+
+        If a concurrent upload of the same bytes wins the insert race,
+        the batch is retried one document per transaction so that only
+        the losing file becomes a duplicate.
+        """
+        if not ready:
+            return []
+        try:
+            async with self._unit_of_work.begin() as tx:
+                await self._write(tx, ready)
+        except DuplicateDocumentError:
+            created: list[_ParsedFile] = []
+            lost: set[str] = set()
+            for item in ready:
+                # Chunks may be linked to a chunk of a file that lost.
+                item.unlink(lost)
+                try:
+                    async with self._unit_of_work.begin() as tx:
+                        await self._write(tx, [item])
+                except DuplicateDocumentError:
+                    lost.update(chunk.id for chunk in item.embedded.chunks)
+                    continue
+                created.append(item)
+            return created
+        return ready
+
+    async def _write(
+        self, tx: TransactionScope, items: list[_ParsedFile]
+    ) -> None:
+        embedded = DedupedChunks()
+        for item in items:
+            await tx.documents.create(item.document)
+            embedded.extend(item.embedded)
+        await embedded.save(tx.chunks)
+        for item in items:
+            if self._store_page_text:
+                await tx.pages.put(item.digest, item.pages)
+            if item.text is not None:
+                await tx.texts.put(item.document.id, item.text)
+
+    async def _duplicate(
+        self, existing: Document, filename: str
+    ) -> BulkUploadItemDTO:
+        if self._record_aliases and filename != existing.filename:
+            await self._documents.add_alias(existing.id, filename)
+        return BulkUploadItemDTO(
+            filename=filename, status="duplicate", document_id=existing.id
+        )
+
+    async def _resolve_repeat(
+        self,
+        filename: str,
+        digest: str,
+        first: BulkUploadItemDTO | None,
+    ) -> BulkUploadItemDTO:
+        """Report a file whose bytes appeared earlier in the request.
+
+        Also covers a file that lost the insert race to a concurrent
+        upload, in which case *first* is still unset.
+        """
+        if first is not None and first.status == "failed":
+            return BulkUploadItemDTO(
+                filename=filename, status="failed", error=first.error
+            )
+        existing = await self._documents.get_by_digest(digest)
+        if existing is None:
+            return BulkUploadItemDTO(
+                filename=filename,
+                status="failed",
+                error="Concurrent upload of the same content failed.",
+            )
+        return await self._duplicate(existing, filename)
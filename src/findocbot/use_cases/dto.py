@@ -1,6 +1,9 @@
 """Use-case data transfer objects."""
 
-from dataclasses import dataclass
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import Literal
 
 
@@ -23,3 +26,74 @@ class AskResponseDTO:
     answer: str
     sources: list[SearchResultDTO]
     confidence: Literal["high", "medium", "low"] = "medium"
+
+
+@dataclass(frozen=True)
+class RechunkResultDTO:
+    """Outcome of rebuilding one document's chunks from cached text."""
+
+    document_id: str
+    chunks: int
+    reused: int
+    embedded: int
+    removed: int
+
+
+@dataclass(frozen=True)
+class ReplaceResultDTO:
+    """Outcome of replacing a document with a revised PDF.
+
+    ``changed_pages`` holds zero-based indexes into the new version of
+    pages that are new or differ from the previous version.
+    """
+
+    document_id: str
+    filename: str
+    pages: int
+    changed_pages: list[int]
+    removed_pages: int
+    chunks: RechunkResultDTO
+
+
+BulkUploadStatus = Literal["created", "duplicate", "failed"]
+
+
+@dataclass(frozen=True)
+class BulkUploadItemDTO:
+    """Outcome of one file of a bulk upload."""
+
+    filename: str
+    status: BulkUploadStatus
+    document_id: str | None = None
+    pages: int = 0
+    chunks: int = 0
+    error: str | None = None
+
+
+@dataclass
+class IngestStats:
+    """Per-stage wall time and volume counters of one ingestion run.
+
+    In streaming mode parsing, chunking and embedding overlap, so
+    ``stage_seconds`` holds the busy time of each stage rather than
+    slices of the end-to-end latency.
+    """
+
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    pages: int = 0
+    chunks: int = 0
+    near_duplicates: int = 0
+    skipped_pages: dict[int, str] = field(default_factory=dict)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` body to *stage*."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[stage] = (
+                self.stage_seconds.get(stage, 0.0)
+                + time.perf_counter()
+                - started
+            )
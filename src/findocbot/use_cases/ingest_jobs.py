@@ -0,0 +1,157 @@
+"""Asynchronous ingestion job use cases."""
+
+import asyncio
+import contextlib
+import logging
+import os
+from typing import BinaryIO
+
+from findocbot.domain.entities import IngestJob
+from findocbot.domain.exceptions import (
+    FinDocBotError,
+    InfrastructureError,
+    UploadTooLargeError,
+)
+from findocbot.use_cases.dto import IngestStats
+from findocbot.use_cases.ports import IngestJobRepositoryPort, PDFSource
+from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+
+logger = logging.getLogger(__name__)
+
+
+def _size(content: BinaryIO) -> int:
+    return content.seek(0, os.SEEK_END)
+
+
+def _read_all(content: BinaryIO) -> bytes:
+    content.seek(0)
+    return content.read()
+
+
+class EnqueueUploadUseCase:
+    """Persist an upload and queue it for background ingestion."""
+
+    def __init__(
+        self, jobs: IngestJobRepositoryPort, max_bytes: int = 512 * 1024**2
+    ) -> None:
+        """Store job queue dependency and payload limit.
+
+        Args:
+            jobs: Durable job queue.
+            max_bytes: Largest upload the queue accepts. The bytes are
+                held in memory to enqueue and to process, and stored as
+                one ``BYTEA`` value, which Postgres caps at 1 GB.
+        """
+        self._jobs = jobs
+        self.max_bytes = max_bytes
+
+    async def execute(self, filename: str, content: PDFSource) -> IngestJob:
+        """Enqueue *content* and return the queued job.
+
+        Raises:
+            UploadTooLargeError: *content* exceeds ``max_bytes``; it is
+                rejected before being read.
+        """
+        size = (
+            len(content)
+            if isinstance(content, bytes)
+            else await asyncio.to_thread(_size, content)
+        )
+        if size > self.max_bytes:
+            raise UploadTooLargeError(
+                "Queued uploads are limited to "
+                f"{self.max_bytes // 1024 // 1024} MB."
+            )
+        job = IngestJob.create(filename=filename)
+        if not isinstance(content, bytes):
+            content = await asyncio.to_thread(_read_all, content)
+        await self._jobs.enqueue(job, content)
+        return job
+
+
+class GetIngestJobUseCase:
+    """Look up the state of a queued ingestion."""
+
+    def __init__(self, jobs: IngestJobRepositoryPort) -> None:
+        """Store job queue dependency."""
+        self._jobs = jobs
+
+    async def execute(self, job_id: str) -> IngestJob | None:
+        """Return the job, or ``None`` if it does not exist."""
+        return await self._jobs.get(job_id)
+
+
+class ProcessIngestJobUseCase:
+    """Claim one queued job and run the upload pipeline for it."""
+
+    def __init__(
+        self,
+        jobs: IngestJobRepositoryPort,
+        upload: UploadPDFUseCase,
+        heartbeat_seconds: float = 60.0,
+    ) -> None:
+        """Store job queue and upload pipeline dependencies.
+
+        Args:
+            jobs: Durable job queue.
+            upload: Ingests a claimed job's PDF.
+            heartbeat_seconds: Interval of heartbeats while a job runs;
+                keep it well below the queue's stale-job timeout.
+        """
+        self._jobs = jobs
+        self._upload = upload
+        self._heartbeat_seconds = heartbeat_seconds
+
+    async def run_next(self) -> bool:
+        """Process the next queued job; return ``False`` if none is queued.
+
+        Domain and infrastructure failures are recorded on the job rather
+        than raised, so one bad upload never stops a consumer loop.
+        """
+        claimed = await self._jobs.claim_next()
+        if claimed is None:
+            return False
+        job, content = claimed
+        stats = IngestStats()
+        heartbeat = asyncio.create_task(self._keep_alive(job.id))
+        try:
+            document = await self._upload.execute(
+                job.filename, content, stats=stats
+            )
+        except FinDocBotError as error:
+            finished = await self._jobs.fail(
+                job.id, job.attempts, str(error), stats.stage_seconds
+            )
+        except Exception:
+            logger.exception(f"Ingestion job {job.id} crashed")
+            finished = await self._jobs.fail(
+                job.id,
+                job.attempts,
+                "Internal ingestion error.",
+                stats.stage_seconds,
+            )
+        else:
+            finished = await self._jobs.complete(
+                job.id, job.attempts, document.id, stats.stage_seconds
+            )
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+        if not finished:
+            # Our heartbeat lapsed and another worker owns the job now.
+            logger.warning(
+                f"Ingestion job {job.id} was reclaimed; "
+                f"dropping the result of attempt {job.attempts}"
+            )
+        return True
+
+    async def _keep_alive(self, job_id: str) -> None:
+        """Heartbeat *job_id* until cancelled."""
+        while True:
+            await asyncio.sleep(self._heartbeat_seconds)
+            try:
+                await self._jobs.heartbeat(job_id)
+            except InfrastructureError:
+                # A missed beat only risks a reclaim; keep ingesting.
+                logger.warning(f"Heartbeat of ingestion job {job_id} failed")
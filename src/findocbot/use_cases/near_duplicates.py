@@ -0,0 +1,220 @@
+"""Link or skip chunks that nearly repeat already stored chunks."""
+
+import asyncio
+from collections.abc import Collection
+from dataclasses import dataclass, field, replace
+from typing import Literal
+
+from findocbot.domain.entities import Chunk
+from findocbot.use_cases.ports import (
+    ChunkRepositoryPort,
+    MinHashSketch,
+    ModelProviderGateway,
+    NearDuplicateDetectorPort,
+)
+
+NearDuplicatePolicy = Literal["link", "skip"]
+
+
+@dataclass
+class DedupedChunks:
+    """Chunks ready to store, with vectors, after near-duplicate checks.
+
+    Linked chunks carry ``canonical_chunk_id`` and a copy of the
+    canonical vector; skipped chunks are left out entirely.
+    """
+
+    chunks: list[Chunk] = field(default_factory=list)
+    embeddings: list[list[float]] = field(default_factory=list)
+    sketches: dict[str, MinHashSketch] = field(default_factory=dict)
+    embedded: int = 0
+    linked: int = 0
+    skipped: int = 0
+
+    def extend(self, other: "DedupedChunks") -> None:
+        """Append the chunks, vectors and counts of *other*."""
+        self.chunks.extend(other.chunks)
+        self.embeddings.extend(other.embeddings)
+        self.sketches.update(other.sketches)
+        self.embedded += other.embedded
+        self.linked += other.linked
+        self.skipped += other.skipped
+
+    async def save(self, chunks: ChunkRepositoryPort) -> None:
+        """Insert the chunks and index the sketches of new canonicals."""
+        await chunks.add_chunks_with_embeddings(self.chunks, self.embeddings)
+        if self.sketches:
+            await chunks.add_sketches(self.sketches)
+
+
+async def embed_chunks(
+    provider: ModelProviderGateway,
+    chunks: list[Chunk],
+    session: "NearDuplicateSession | None" = None,
+) -> DedupedChunks:
+    """Embed *chunks*, through *session* when near-duplicate checks are on."""
+    if session is not None:
+        return await session.embed(provider, chunks)
+    embeddings = (
+        await provider.embed_many([chunk.text for chunk in chunks])
+        if chunks
+        else []
+    )
+    return DedupedChunks(
+        chunks=list(chunks), embeddings=embeddings, embedded=len(chunks)
+    )
+
+
+class NearDuplicateSession:
+    """Near-duplicate checks for one upload, bulk load or re-chunk.
+
+    Remembers the canonical chunks of earlier batches of the same run,
+    which are not yet visible through the repository until it commits.
+    """
+
+    def __init__(
+        self,
+        detector: NearDuplicateDetectorPort,
+        chunks: ChunkRepositoryPort,
+        policy: NearDuplicatePolicy,
+        exclude: Collection[str] = (),
+    ) -> None:
+        """Start with an empty run-local index."""
+        self._detector = detector
+        self._chunks = chunks
+        self._policy = policy
+        self._exclude = set(exclude)
+        self._local: dict[int, list[tuple[Chunk, MinHashSketch]]] = {}
+        self._local_ids: set[str] = set()
+        self._vectors: dict[str, list[float]] = {}
+
+    async def embed(
+        self, provider: ModelProviderGateway, chunks: list[Chunk]
+    ) -> DedupedChunks:
+        """Embed the chunks of *chunks* that repeat nothing seen before.
+
+        Candidates come from the run so far and from canonical chunks in
+        storage that share an LSH band; only canonical chunks are ever
+        candidates, so links never chain.
+        """
+        sketches = await asyncio.to_thread(
+            lambda: [self._detector.sketch(chunk.text) for chunk in chunks]
+        )
+        stored = await self._chunks.find_near_duplicate_candidates(
+            sorted({key for sketch in sketches for key in sketch.band_keys})
+        )
+        index: dict[int, list[tuple[Chunk, MinHashSketch]]] = {}
+        for candidate, sketch in stored:
+            if candidate.id not in self._exclude:
+                for key in sketch.band_keys:
+                    index.setdefault(key, []).append((candidate, sketch))
+
+        matches = [
+            self._match(chunk, sketch, index)
+            for chunk, sketch in zip(chunks, sketches, strict=True)
+        ]
+        external = {
+            match.id
+            for match in matches
+            if match is not None
+            and match.id not in self._local_ids
+            and match.id not in self._vectors
+        }
+        self._vectors.update(
+            await self._chunks.get_embeddings(sorted(external))
+        )
+        # A canonical chunk deleted since it was found cannot lend its
+        # vector; its near-duplicates are embedded themselves instead.
+        lost = external - self._vectors.keys()
+        matches = [
+            None if match is not None and match.id in lost else match
+            for match in matches
+        ]
+        return await self._assemble(provider, chunks, sketches, matches)
+
+    def _match(
+        self,
+        chunk: Chunk,
+        sketch: MinHashSketch,
+        index: dict[int, list[tuple[Chunk, MinHashSketch]]],
+    ) -> Chunk | None:
+        """Find the canonical chunk *chunk* repeats, or register it."""
+        for key in sketch.band_keys:
+            for pool in (self._local, index):
+                for candidate, other in pool.get(key, ()):
+                    if self._detector.is_near_duplicate(
+                        chunk.text, sketch, candidate.text, other
+                    ):
+                        return candidate
+        for key in sketch.band_keys:
+            self._local.setdefault(key, []).append((chunk, sketch))
+        self._local_ids.add(chunk.id)
+        return None
+
+    async def _assemble(
+        self,
+        provider: ModelProviderGateway,
+        chunks: list[Chunk],
+        sketches: list[MinHashSketch],
+        matches: list[Chunk | None],
+    ) -> DedupedChunks:
+        fresh = [
+            chunk
+            for chunk, match in zip(chunks, matches, strict=True)
+            if match is None
+        ]
+        if fresh:
+            vectors = await provider.embed_many([c.text for c in fresh])
+            self._vectors.update(
+                (chunk.id, vector)
+                for chunk, vector in zip(fresh, vectors, strict=True)
+            )
+        result = DedupedChunks(embedded=len(fresh))
+        for chunk, sketch, match in zip(
+            chunks, sketches, matches, strict=True
+        ):
+            if match is None:
+                result.chunks.append(chunk)
+                result.embeddings.append(self._vectors[chunk.id])
+                result.sketches[chunk.id] = sketch
+            elif self._policy == "skip":
+                result.skipped += 1
+            else:
+                result.chunks.append(
+                    replace(chunk, canonical_chunk_id=match.id)
+                )
+                result.embeddings.append(self._vectors[match.id])
+                result.linked += 1
+        return result
+
+
+class NearDuplicateFilter:
+    """Detect near-duplicate chunks at ingest and apply a policy.
+
+    ``link`` stores a near-duplicate with a reference to its canonical
+    chunk and a copy of that chunk's vector, so it is never embedded and
+    stays out of the vector index; ``skip`` does not store it at all.
+    """
+
+    def __init__(
+        self,
+        detector: NearDuplicateDetectorPort,
+        chunks: ChunkRepositoryPort,
+        policy: NearDuplicatePolicy = "link",
+    ) -> None:
+        """Store dependencies.
+
+        Args:
+            detector: Sketches chunk texts and compares sketches.
+            chunks: Committed chunks to look candidates up in.
+            policy: What to do with a near-duplicate chunk.
+        """
+        self._detector = detector
+        self._chunks = chunks
+        self._policy = policy
+
+    def session(self, exclude: Collection[str] = ()) -> NearDuplicateSession:
+        """Start a run; chunks in *exclude* are never used as canonicals."""
+        return NearDuplicateSession(
+            self._detector, self._chunks, self._policy, exclude
+        )
@@ -1,9 +1,22 @@
 """Abstractions for use-case dependencies."""
 
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractAsyncContextManager
 from dataclasses import dataclass
-from typing import Any, Protocol
+from datetime import datetime
+from typing import Any, BinaryIO, Protocol
 
-from findocbot.domain.entities import ChatTurn, Chunk, Document
+from findocbot.domain.entities import (
+    ChatTurn,
+    Chunk,
+    Document,
+    IngestJob,
+    UploadSession,
+)
+
+# Uploaded PDF: in-memory bytes or a seekable binary file (e.g. a spooled
+# upload). Consumers rewind file objects before reading them.
+PDFSource = bytes | BinaryIO
 
 
 @dataclass(frozen=True)
@@ -14,12 +27,66 @@ class ChunkWithScore:
     score: float
 
 
+@dataclass(frozen=True)
+class SearchFilters:
+    """Restrict a vector search to part of the corpus.
+
+    Fields left as ``None`` do not filter. ``section`` matches chunks
+    whose section heading starts with it, ignoring case; the upload
+    bounds are inclusive and compare with the document's ``created_at``.
+    """
+
+    document_ids: tuple[str, ...] | None = None
+    section: str | None = None
+    uploaded_after: datetime | None = None
+    uploaded_before: datetime | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether no field restricts the search."""
+        return (
+            self.document_ids is None
+            and self.section is None
+            and self.uploaded_after is None
+            and self.uploaded_before is None
+        )
+
+
+@dataclass(frozen=True)
+class MinHashSketch:
+    """MinHash signature of a chunk and its LSH band keys."""
+
+    signature: list[int]
+    band_keys: list[int]
+
+
+@dataclass(frozen=True)
+class ChunkSpan:
+    """Chunk text as the slice ``[start, end)`` of the normalized text."""
+
+    text: str
+    section: str | None
+    start: int
+    end: int
+
+
 class PDFParserPort(Protocol):
     """Extract plain text from PDF bytes."""
 
-    def extract_text(self, content: bytes) -> str:
+    def extract_text(self, content: PDFSource) -> str:
         """Return extracted text."""
 
+    def iter_pages(
+        self,
+        content: PDFSource,
+        on_skipped_page: Callable[[int, str], None] | None = None,
+    ) -> Iterator[str]:
+        """Yield extracted text page by page, in page order.
+
+        A page that cannot be extracted may be yielded as ``""`` and
+        reported to *on_skipped_page* with its index and the reason.
+        """
+
 
 class ChunkerPort(Protocol):
     """Split extracted text into semantic chunks."""
@@ -27,6 +94,33 @@ class ChunkerPort(Protocol):
     def split(self, text: str) -> list[tuple[str, str | None]]:
         """Return tuples of chunk text and optional section label."""
 
+    def iter_chunks(
+        self, pages: Iterable[str]
+    ) -> Iterator[tuple[str, str | None]]:
+        """Yield the same tuples as ``split`` from a stream of page texts."""
+
+    def normalize(self, pages: Iterable[str]) -> str:
+        """Return the document text that chunk spans point into."""
+
+    def iter_spans(self, pages: Iterable[str]) -> Iterator[ChunkSpan]:
+        """Yield the chunks of ``iter_chunks`` as slices of ``normalize``."""
+
+
+class NearDuplicateDetectorPort(Protocol):
+    """Sketch chunk texts and decide whether two are near-duplicates."""
+
+    def sketch(self, text: str) -> MinHashSketch:
+        """Return the MinHash signature and band keys of *text*."""
+
+    def is_near_duplicate(
+        self,
+        text: str,
+        sketch: MinHashSketch,
+        other_text: str,
+        other_sketch: MinHashSketch,
+    ) -> bool:
+        """Return whether *text* may share the vector of *other_text*."""
+
 
 class ModelProviderGateway(Protocol):
     """Model provider abstraction for embeddings and generation."""
@@ -49,15 +143,54 @@ class ModelProviderGateway(Protocol):
         """Generate a JSON-structured response matching the given schema."""
 
 
+class EmbeddingStorePort(Protocol):
+    """Durable embedding cache keyed by model and normalized text digest."""
+
+    async def get_many(
+        self, model: str, digests: list[str]
+    ) -> dict[str, list[float]]:
+        """Return stored embeddings for the digests that are present."""
+
+    async def put_many(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        """Store embeddings by digest; existing entries are kept."""
+
+
 class DocumentRepositoryPort(Protocol):
     """Persistence operations for documents."""
 
     async def create(self, document: Document) -> None:
-        """Persist a document."""
+        """Persist a document.
+
+        Raises:
+            DuplicateDocumentError: A document with the same
+                ``content_sha256`` already exists.
+        """
 
     async def delete(self, document_id: str) -> None:
         """Remove a document by id."""
 
+    async def get(self, document_id: str) -> Document | None:
+        """Return a document by id, or ``None`` if unknown."""
+
+    async def update(self, document: Document) -> None:
+        """Overwrite the filename and digest of an existing document.
+
+        Raises:
+            DuplicateDocumentError: Another document already has the new
+                ``content_sha256``.
+        """
+
+    async def list_ids(self) -> list[str]:
+        """Return the ids of all documents, oldest first."""
+
+    async def get_by_digest(self, content_sha256: str) -> Document | None:
+        """Return the document uploaded with these exact bytes, if any."""
+
+    async def add_alias(self, document_id: str, filename: str) -> None:
+        """Record another filename the same content was uploaded under."""
+
 
 class ChunkRepositoryPort(Protocol):
     """Persistence operations for chunks with vectors."""
@@ -73,8 +206,82 @@ class ChunkRepositoryPort(Protocol):
         self,
         embedding: list[float],
         top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
     ) -> list[ChunkWithScore]:
-        """Return top-k similar chunks."""
+        """Return the top-k similar chunks that match *filters*.
+
+        *ef_search* trades recall for latency in approximate indexes;
+        ``None`` uses the repository default. Exact backends ignore it.
+        """
+
+    async def list_by_document(self, document_id: str) -> list[Chunk]:
+        """Return a document's chunks ordered by ``chunk_index``."""
+
+    async def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Remove chunks by id."""
+
+    async def reindex_chunks(self, positions: dict[str, int]) -> None:
+        """Move existing chunks to new ``chunk_index`` values by id."""
+
+    async def add_sketches(self, sketches: dict[str, MinHashSketch]) -> None:
+        """Index the MinHash sketches of stored canonical chunks by id."""
+
+    async def find_near_duplicate_candidates(
+        self, band_keys: list[int]
+    ) -> list[tuple[Chunk, MinHashSketch]]:
+        """Return canonical chunks sharing at least one LSH band key."""
+
+    async def get_embeddings(
+        self, chunk_ids: list[str]
+    ) -> dict[str, list[float]]:
+        """Return the stored vectors of the chunks that exist."""
+
+    async def respan_chunks(self, spans: dict[str, tuple[int, int]]) -> None:
+        """Point existing chunks at new spans of their document's text."""
+
+
+class PageTextStorePort(Protocol):
+    """Extracted page texts of uploaded PDFs, keyed by content digest."""
+
+    async def get(self, content_sha256: str) -> list[str] | None:
+        """Return the stored page texts, or ``None`` if absent."""
+
+    async def put(self, content_sha256: str, pages: list[str]) -> None:
+        """Store page texts; an existing entry is kept."""
+
+    async def delete(self, content_sha256: str) -> None:
+        """Remove stored page texts, if any."""
+
+
+class DocumentTextStorePort(Protocol):
+    """Normalized document texts that chunk spans point into."""
+
+    async def get(self, document_id: str) -> str | None:
+        """Return the stored text, or ``None`` if absent."""
+
+    async def put(self, document_id: str, text: str) -> None:
+        """Store the text, replacing an existing one."""
+
+    async def delete(self, document_id: str) -> None:
+        """Remove the stored text, if any."""
+
+
+@dataclass(frozen=True)
+class TransactionScope:
+    """Repositories bound to one open transaction."""
+
+    documents: DocumentRepositoryPort
+    chunks: ChunkRepositoryPort
+    pages: PageTextStorePort
+    texts: DocumentTextStorePort
+
+
+class UnitOfWorkPort(Protocol):
+    """Group document, chunk and page-text writes into one transaction."""
+
+    def begin(self) -> AbstractAsyncContextManager[TransactionScope]:
+        """Open a transaction; commit on clean exit, roll back on error."""
 
 
 class ChatHistoryRepositoryPort(Protocol):
@@ -89,3 +296,70 @@ class ChatHistoryRepositoryPort(Protocol):
         limit: int,
     ) -> list[ChatTurn]:
         """Return recent turns ordered from oldest to newest."""
+
+
+class IngestJobRepositoryPort(Protocol):
+    """Durable queue of pending PDF ingestions."""
+
+    async def enqueue(self, job: IngestJob, content: bytes) -> None:
+        """Persist a queued job together with the uploaded bytes."""
+
+    async def claim_next(self) -> tuple[IngestJob, bytes] | None:
+        """Atomically mark the oldest runnable job as running.
+
+        Returns ``None`` when the queue is empty. Concurrent consumers
+        must never receive the same job.
+        """
+
+    async def heartbeat(self, job_id: str) -> None:
+        """Signal that a running job's worker is still alive."""
+
+    async def complete(
+        self,
+        job_id: str,
+        attempt: int,
+        document_id: str,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        """Mark a job as succeeded and drop its stored upload.
+
+        Only the claim numbered *attempt* may finish the job; returns
+        ``False`` and changes nothing once another worker reclaimed it.
+        """
+
+    async def fail(
+        self,
+        job_id: str,
+        attempt: int,
+        error: str,
+        stage_seconds: dict[str, float],
+    ) -> bool:
+        """Mark a job as failed and drop its stored upload.
+
+        Guarded by *attempt* like :meth:`complete`.
+        """
+
+    async def get(self, job_id: str) -> IngestJob | None:
+        """Return a job by id, or ``None`` if unknown."""
+
+
+class UploadPartStorePort(Protocol):
+    """Bytes and progress of resumable uploads, on disk or in a blob store."""
+
+    async def create(self, session: UploadSession) -> None:
+        """Register an empty upload."""
+
+    async def get(self, upload_id: str) -> UploadSession | None:
+        """Return the upload with its durable progress, if it exists."""
+
+    async def write(self, upload_id: str, offset: int, data: bytes) -> None:
+        """Durably store *data* at *offset* and advance ``received``."""
+
+    async def open(self, upload_id: str) -> BinaryIO:
+        """Open the stored bytes for reading; the caller closes the file."""
+
+    async def delete(self, upload_id: str) -> None:
+        """Remove an upload and its bytes, if present."""
+
+    async def purge(self, created_before: datetime) -> int:
+        """Remove uploads created before *created_before*; return count."""
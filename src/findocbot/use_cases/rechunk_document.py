@@ -0,0 +1,280 @@
+"""Rebuild a document's chunks from its cached page text."""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from findocbot.domain.entities import Chunk
+from findocbot.domain.exceptions import (
+    DocumentChangedError,
+    DocumentNotFoundError,
+    PageTextUnavailableError,
+)
+from findocbot.use_cases.dto import RechunkResultDTO
+from findocbot.use_cases.near_duplicates import (
+    DedupedChunks,
+    NearDuplicateFilter,
+    embed_chunks,
+)
+from findocbot.use_cases.ports import (
+    ChunkerPort,
+    ChunkRepositoryPort,
+    DocumentRepositoryPort,
+    ModelProviderGateway,
+    PageTextStorePort,
+    TransactionScope,
+    UnitOfWorkPort,
+)
+from findocbot.use_cases.upload_pdf import ChunkPart, iter_chunk_parts
+
+ChunkLayout = list[tuple[str, int, int | None, int | None]]
+
+
+def _layout(chunks: list[Chunk]) -> ChunkLayout:
+    return [
+        (chunk.id, chunk.chunk_index, chunk.span_start, chunk.span_end)
+        for chunk in chunks
+    ]
+
+
+@dataclass
+class ChunkReconciliation:
+    """Chunk changes prepared and embedded before a transaction opens.
+
+    Embedding can take far longer than the writes, so it runs without
+    holding a pooled connection; ``apply`` then only checks that the
+    stored chunks are still the ones the plan was made from and writes.
+    """
+
+    document_id: str
+    stored: ChunkLayout
+    embedded: DedupedChunks
+    removed: list[str]
+    positions: dict[str, int]
+    spans: dict[str, tuple[int, int]]
+    total: int
+    reused: int
+    text: str | None = None
+
+    async def apply(self, tx: TransactionScope) -> RechunkResultDTO:
+        """Write the prepared changes in *tx*.
+
+        Raises:
+            DocumentChangedError: The document's chunks changed since
+                the plan was made.
+        """
+        current = await tx.chunks.list_by_document(self.document_id)
+        if _layout(current) != self.stored:
+            raise DocumentChangedError(
+                f"Document {self.document_id} changed during the update; "
+                "retry it."
+            )
+        await tx.chunks.delete_chunks(self.removed)
+        await tx.chunks.reindex_chunks(self.positions)
+        await tx.chunks.respan_chunks(self.spans)
+        await self.embedded.save(tx.chunks)
+        # Stored after reconciling: the chunks above may still be spans
+        # into the previous text.
+        if self.text is not None:
+            await tx.texts.put(self.document_id, self.text)
+        return RechunkResultDTO(
+            document_id=self.document_id,
+            chunks=self.total - self.embedded.skipped,
+            reused=self.reused,
+            embedded=self.embedded.embedded,
+            removed=len(self.removed),
+        )
+
+
+async def plan_reconciliation(
+    chunks: ChunkRepositoryPort,
+    provider: ModelProviderGateway,
+    document_id: str,
+    parts: Iterable[ChunkPart],
+    near_duplicates: NearDuplicateFilter | None = None,
+    stored: list[Chunk] | None = None,
+) -> ChunkReconciliation:
+    """Plan making a document's stored chunks match *parts*.
+
+    Stored chunks whose text and section reappear in *parts* keep their
+    row and vector and are only moved to their new index and, for span
+    parts, their new span; chunks that no longer appear are deleted, and
+    only genuinely new text is embedded, here, outside any transaction.
+    Indexes are assigned as in ``UploadPDFUseCase``: blank parts are
+    dropped after numbering.
+
+    Args:
+        chunks: Committed chunks to plan from.
+        provider: Embedding provider for new chunk texts.
+        document_id: Document whose chunk set is replaced.
+        parts: Chunker output for the document's current text; span
+            parts must point into the text stored with it.
+        near_duplicates: When set, new chunks that nearly repeat a stored
+            chunk are linked to it or skipped instead of embedded.
+        stored: The document's chunks, when the caller already listed
+            them to build *parts*.
+    """
+    if stored is None:
+        stored = await chunks.list_by_document(document_id)
+    unmatched: dict[tuple[str, str | None], list[Chunk]] = {}
+    for chunk in stored:
+        unmatched.setdefault((chunk.text, chunk.section), []).append(chunk)
+
+    positions: dict[str, int] = {}
+    spans: dict[str, tuple[int, int]] = {}
+    new_chunks: list[Chunk] = []
+    total = 0
+    for index, (text, section, span) in enumerate(parts):
+        if not text.strip():
+            continue
+        total += 1
+        candidates = unmatched.get((text, section))
+        if not candidates:
+            new_chunks.append(
+                Chunk.create(
+                    document_id=document_id,
+                    chunk_index=index,
+                    text=text,
+                    section=section,
+                    span=span,
+                )
+            )
+            continue
+        kept = candidates.pop(0)
+        if kept.chunk_index != index:
+            positions[kept.id] = index
+        if span is not None and (kept.span_start, kept.span_end) != span:
+            spans[kept.id] = span
+
+    removed = [chunk.id for group in unmatched.values() for chunk in group]
+    embedded = await embed_chunks(
+        provider,
+        new_chunks,
+        # Chunks deleted on apply must not become canonical chunks.
+        near_duplicates.session(exclude=removed)
+        if near_duplicates is not None
+        else None,
+    )
+    return ChunkReconciliation(
+        document_id=document_id,
+        stored=_layout(stored),
+        embedded=embedded,
+        removed=removed,
+        positions=positions,
+        spans=spans,
+        total=total,
+        reused=total - len(new_chunks),
+    )
+
+
+async def plan_rechunk(
+    chunks: ChunkRepositoryPort,
+    chunker: ChunkerPort,
+    provider: ModelProviderGateway,
+    document_id: str,
+    pages: list[str],
+    near_duplicates: NearDuplicateFilter | None = None,
+    store_chunk_spans: bool = False,
+) -> ChunkReconciliation:
+    """Chunk *pages* and plan reconciling the stored chunks with them.
+
+    Args:
+        chunks: Committed chunks to plan from.
+        chunker: Splits the page text into chunks.
+        provider: Embedding provider for new chunk texts.
+        document_id: Document whose chunk set is replaced.
+        pages: Current page texts of the document.
+        near_duplicates: Links or skips new chunks that nearly repeat
+            stored ones.
+        store_chunk_spans: Store the normalized text and chunks as spans.
+    """
+    parts = await asyncio.to_thread(
+        lambda: list(iter_chunk_parts(chunker, pages, store_chunk_spans))
+    )
+    plan = await plan_reconciliation(
+        chunks, provider, document_id, parts, near_duplicates
+    )
+    if store_chunk_spans:
+        plan.text = await asyncio.to_thread(chunker.normalize, pages)
+    return plan
+
+
+class RechunkDocumentUseCase:
+    """Re-chunk stored documents with the current chunker settings."""
+
+    def __init__(
+        self,
+        chunker: ChunkerPort,
+        provider: ModelProviderGateway,
+        documents: DocumentRepositoryPort,
+        chunks: ChunkRepositoryPort,
+        page_texts: PageTextStorePort,
+        unit_of_work: UnitOfWorkPort,
+        near_duplicates: NearDuplicateFilter | None = None,
+        store_chunk_spans: bool = False,
+    ) -> None:
+        """Store dependencies for re-chunking.
+
+        Args:
+            chunker: Splits the cached page text into chunks.
+            provider: Embedding provider for chunks whose text changed.
+            documents: Document repository for id lookups.
+            chunks: Committed chunks to plan the re-chunk from.
+            page_texts: Cached page texts to re-chunk.
+            unit_of_work: Swaps the chunk set in one transaction.
+            near_duplicates: Links or skips new chunks that nearly repeat
+                stored ones.
+            store_chunk_spans: Store the normalized text and turn the
+                chunks into spans over it, including chunks stored
+                before span storage was enabled.
+        """
+        self._chunker = chunker
+        self._provider = provider
+        self._documents = documents
+        self._chunks = chunks
+        self._page_texts = page_texts
+        self._unit_of_work = unit_of_work
+        self._near_duplicates = near_duplicates
+        self._store_chunk_spans = store_chunk_spans
+
+    async def document_ids(self) -> list[str]:
+        """Return the ids of all documents, oldest first."""
+        return await self._documents.list_ids()
+
+    async def execute(self, document_id: str) -> RechunkResultDTO:
+        """Rebuild chunks from cached page text without parsing the PDF.
+
+        New chunks are embedded before the transaction opens, which then
+        only writes.
+
+        Raises:
+            DocumentNotFoundError: No document has this id.
+            PageTextUnavailableError: The document was uploaded before
+                page text caching, or with caching disabled.
+            DocumentChangedError: The document's chunks changed while
+                new ones were being embedded.
+        """
+        document = await self._documents.get(document_id)
+        if document is None:
+            raise DocumentNotFoundError(f"Document {document_id} not found.")
+        pages = (
+            await self._page_texts.get(document.content_sha256)
+            if document.content_sha256 is not None
+            else None
+        )
+        if pages is None:
+            raise PageTextUnavailableError(
+                "Document has no cached page text; re-upload it to "
+                "enable re-chunking."
+            )
+        plan = await plan_rechunk(
+            self._chunks,
+            self._chunker,
+            self._provider,
+            document.id,
+            pages,
+            self._near_duplicates,
+            self._store_chunk_spans,
+        )
+        async with self._unit_of_work.begin() as tx:
+            return await plan.apply(tx)
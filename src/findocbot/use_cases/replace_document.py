@@ -0,0 +1,473 @@
+"""Replace a document with a revised PDF, re-embedding only changes."""
+
+import asyncio
+import hashlib
+from bisect import bisect_right
+from dataclasses import replace
+from difflib import SequenceMatcher
+from typing import NamedTuple
+
+from findocbot.domain.entities import Chunk, Document
+from findocbot.domain.exceptions import (
+    DocumentNotFoundError,
+    EmptyDocumentError,
+)
+from findocbot.use_cases.dto import RechunkResultDTO, ReplaceResultDTO
+from findocbot.use_cases.near_duplicates import NearDuplicateFilter
+from findocbot.use_cases.ports import (
+    ChunkerPort,
+    ChunkRepositoryPort,
+    DocumentRepositoryPort,
+    ModelProviderGateway,
+    PageTextStorePort,
+    PDFParserPort,
+    PDFSource,
+    TransactionScope,
+    UnitOfWorkPort,
+)
+from findocbot.use_cases.rechunk_document import (
+    ChunkReconciliation,
+    plan_rechunk,
+    plan_reconciliation,
+)
+from findocbot.use_cases.upload_pdf import ChunkPart, sha256_hex
+
+# (old_start, old_end, new_start, new_end) page ranges.
+PageBlock = tuple[int, int, int, int]
+# Pages are joined like paragraphs in the chunker's normalized text.
+_PAGE_SEPARATOR = "\n\n"
+
+
+class _PageDiff(NamedTuple):
+    """How the pages of a revision line up with the previous version."""
+
+    changed: list[int]
+    removed: int
+    blocks: list[PageBlock]
+    moved: dict[int, int]
+
+
+class _Window(NamedTuple):
+    """Old text around changed pages and the stored chunks it covers."""
+
+    block: PageBlock
+    start: int
+    end: int
+    affected: list[tuple[Chunk, int, int]]
+
+
+def _page_digests(pages: list[str]) -> list[str]:
+    return [hashlib.sha256(page.encode()).hexdigest() for page in pages]
+
+
+def _diff_pages(old: list[str], new: list[str]) -> _PageDiff:
+    """Compare two versions page by page through their digests.
+
+    Pages are aligned rather than compared by position, so an inserted
+    page does not mark every later page as changed.
+
+    Returns:
+        Zero-based indexes of new or modified pages in *new*; the number
+        of pages of *old* that have no counterpart in *new*; the page
+        ranges that differ; and the new index of every unchanged page.
+    """
+    matcher = SequenceMatcher(
+        a=_page_digests(old), b=_page_digests(new), autojunk=False
+    )
+    changed: list[int] = []
+    blocks: list[PageBlock] = []
+    moved: dict[int, int] = {}
+    removed = 0
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == "equal":
+            moved.update(
+                zip(
+                    range(old_start, old_end),
+                    range(new_start, new_end),
+                    strict=True,
+                )
+            )
+            continue
+        changed.extend(range(new_start, new_end))
+        blocks.append((old_start, old_end, new_start, new_end))
+        removed += max(0, (old_end - old_start) - (new_end - new_start))
+    return _PageDiff(changed, removed, blocks, moved)
+
+
+class _PagedText:
+    """A document's normalized text and where each page lies in it."""
+
+    def __init__(self, chunker: ChunkerPort, pages: list[str]) -> None:
+        texts = [chunker.normalize([page]) for page in pages]
+        self.text = _PAGE_SEPARATOR.join(text for text in texts if text)
+        self._extents: list[tuple[int, int] | None] = []
+        self._pages: list[int] = []
+        self._starts: list[int] = []
+        position = 0
+        for index, text in enumerate(texts):
+            if not text:
+                self._extents.append(None)
+                continue
+            if self._pages:
+                position += len(_PAGE_SEPARATOR)
+            self._extents.append((position, position + len(text)))
+            self._pages.append(index)
+            self._starts.append(position)
+            position += len(text)
+
+    def page_at(self, offset: int) -> int:
+        """Return the page holding the character at *offset*."""
+        return self._pages[max(0, bisect_right(self._starts, offset) - 1)]
+
+    def extent(self, start: int, end: int) -> tuple[int, int] | None:
+        """Return the text extent of pages ``[start, end)``, if any."""
+        found = [item for item in self._extents[start:end] if item]
+        return (found[0][0], found[-1][1]) if found else None
+
+    def end_before(self, page: int) -> int:
+        """Return where the text of the pages before *page* ends."""
+        found = self.extent(0, page)
+        return found[1] if found is not None else 0
+
+    def start_of(self, page: int) -> int:
+        """Return the offset of *page*, or where it would start if blank."""
+        found = self._extents[page]
+        return found[0] if found is not None else self.end_before(page)
+
+
+class _RangedRechunk:
+    """Chunk only the text around changed pages, keeping other chunks.
+
+    Each changed page range is widened to the stored chunks overlapping
+    it, and only the new text of that window is chunked; ranges whose
+    windows overlap are merged. Chunks outside every window keep their
+    text and boundaries and only move to their new spans.
+    """
+
+    def __init__(
+        self,
+        chunker: ChunkerPort,
+        old_pages: list[str],
+        new_pages: list[str],
+        diff: _PageDiff,
+    ) -> None:
+        """Lay out both versions' pages in their normalized texts."""
+        self._chunker = chunker
+        self._old = _PagedText(chunker, old_pages)
+        self._new = _PagedText(chunker, new_pages)
+        self._diff = diff
+        self.text = self._new.text
+        self._consistent = self.text == chunker.normalize(new_pages)
+
+    def parts(self, stored: list[Chunk]) -> list[ChunkPart] | None:
+        """Return chunk parts of the whole revision, in order.
+
+        Returns ``None`` when the stored chunks are not spans into the
+        previous text or a section heading changed, which both need the
+        whole document re-chunked.
+        """
+        located = [
+            (chunk, chunk.span_start, chunk.span_end)
+            for chunk in stored
+            if chunk.span_start is not None and chunk.span_end is not None
+        ]
+        if (
+            not self._consistent
+            or not located
+            or len(located) != len(stored)
+            or any(self._old.text[s:e] != c.text for c, s, e in located)
+        ):
+            return None
+        windows = self._windows(located)
+        affected = {chunk.id for w in windows for chunk, _, _ in w.affected}
+        kept = [item for item in located if item[0].id not in affected]
+
+        parts: list[ChunkPart] = []
+        for chunk, start, end in kept:
+            moved = self._shift(start, start)
+            if moved is None:
+                return None
+            parts.append((
+                chunk.text,
+                chunk.section,
+                (moved, moved + end - start),
+            ))
+        for window in windows:
+            section = next(
+                (c.section for c, s, _ in reversed(kept) if s < window.start),
+                None,
+            )
+            chunked = self._chunk_window(window, section)
+            if chunked is None:
+                return None
+            parts.extend(chunked)
+        parts.sort(key=lambda part: part[2] or (0, 0))
+        return parts
+
+    def _shift(self, offset: int, at: int) -> int | None:
+        """Move *offset* in the unchanged page holding *at* to the new text."""
+        page = self._old.page_at(at)
+        new_page = self._diff.moved.get(page)
+        if new_page is None:
+            return None
+        return offset - self._old.start_of(page) + self._new.start_of(new_page)
+
+    def _windows(self, located: list[tuple[Chunk, int, int]]) -> list[_Window]:
+        windows: list[_Window] = []
+        for block in self._diff.blocks:
+            window = self._widen(located, block)
+            while windows and windows[-1].end > window.start:
+                previous = windows.pop()
+                merged = (
+                    previous.block[0],
+                    window.block[1],
+                    previous.block[2],
+                    window.block[3],
+                )
+                window = self._widen(located, merged)
+            windows.append(window)
+        return windows
+
+    def _widen(
+        self, located: list[tuple[Chunk, int, int]], block: PageBlock
+    ) -> _Window:
+        """Widen the old text of *block* to the stored chunks touching it."""
+        extent = self._old.extent(block[0], block[1])
+        if extent is None:
+            # Only blank pages or nothing at all was there: chunks that
+            # straddle the gap are the ones the new pages split.
+            point = self._old.end_before(block[0])
+            extent = (point, point)
+            affected = [item for item in located if item[1] < point < item[2]]
+        else:
+            affected = [
+                item
+                for item in located
+                if item[1] < extent[1] and item[2] > extent[0]
+            ]
+        return _Window(
+            block,
+            min([extent[0], *(start for _, start, _ in affected)]),
+            max([extent[1], *(end for _, _, end in affected)]),
+            affected,
+        )
+
+    def _chunk_window(
+        self, window: _Window, section: str | None
+    ) -> list[ChunkPart] | None:
+        """Chunk the new text of *window*, continuing *section*."""
+        if any(chunk.section != section for chunk, _, _ in window.affected):
+            return None
+        bounds = self._new_bounds(window)
+        if bounds is None:
+            return None
+        begin, finish = bounds
+        text = self._new.text[begin:finish]
+        if not text:
+            return []
+        if self._chunker.normalize([text]) != text:
+            return None
+        parts: list[ChunkPart] = []
+        for piece in self._chunker.iter_spans([text]):
+            if piece.section not in (None, section):
+                return None
+            span = (begin + piece.start, begin + piece.end)
+            parts.append((piece.text, section, span))
+        return parts
+
+    def _new_bounds(self, window: _Window) -> tuple[int, int] | None:
+        """Return where *window* lies in the new text, without blanks."""
+        old_start, old_end, new_start, new_end = window.block
+        point = self._old.end_before(old_start)
+        zone = self._old.extent(old_start, old_end) or (point, point)
+        point = self._new.end_before(new_start)
+        begin, finish = self._new.extent(new_start, new_end) or (point, point)
+        if window.start < zone[0]:
+            shifted = self._shift(window.start, window.start)
+            if shifted is None:
+                return None
+            begin = shifted
+        if window.end > zone[1]:
+            shifted = self._shift(window.end, window.end - 1)
+            if shifted is None:
+                return None
+            finish = shifted
+        text = self._new.text
+        while begin < finish and text[begin].isspace():
+            begin += 1
+        while finish > begin and text[finish - 1].isspace():
+            finish -= 1
+        return begin, finish
+
+
+class ReplaceDocumentUseCase:
+    """Swap a document's content for a revision, such as a 10-K/A."""
+
+    def __init__(
+        self,
+        parser: PDFParserPort,
+        chunker: ChunkerPort,
+        provider: ModelProviderGateway,
+        documents: DocumentRepositoryPort,
+        chunks: ChunkRepositoryPort,
+        page_texts: PageTextStorePort,
+        unit_of_work: UnitOfWorkPort,
+        near_duplicates: NearDuplicateFilter | None = None,
+        store_chunk_spans: bool = False,
+        store_page_text: bool = True,
+    ) -> None:
+        """Store dependencies for the replace workflow.
+
+        Args:
+            parser: PDF text extractor for the revised upload.
+            chunker: Splits the revised text into chunks.
+            provider: Embedding provider for chunks whose text changed.
+            documents: Document repository for id lookups.
+            chunks: Committed chunks to plan the re-chunk from.
+            page_texts: Cached page texts of the previous version.
+            unit_of_work: Swaps document, page text and chunks atomically.
+            near_duplicates: Links or skips new chunks that nearly repeat
+                stored ones.
+            store_chunk_spans: Store the revised normalized text and
+                chunks as spans into it.
+            store_page_text: Cache the revised page texts, so the next
+                revision can be diffed against them.
+        """
+        self._parser = parser
+        self._chunker = chunker
+        self._provider = provider
+        self._documents = documents
+        self._chunks = chunks
+        self._page_texts = page_texts
+        self._unit_of_work = unit_of_work
+        self._near_duplicates = near_duplicates
+        self._store_chunk_spans = store_chunk_spans
+        self._store_page_text = store_page_text
+
+    async def execute(
+        self, document_id: str, filename: str, content: PDFSource
+    ) -> ReplaceResultDTO:
+        """Replace the content of *document_id* with *content*.
+
+        The document keeps its id. Page digests of the new version are
+        diffed against the cached previous version; when no page text
+        changed, chunks are left as they are. Otherwise, with span
+        storage, only the text of changed pages and the stored chunks
+        overlapping them is re-chunked; chunks elsewhere keep their rows,
+        boundaries and index entries and move to their new spans. Chunks
+        stored without spans, or a changed section heading, fall back to
+        re-chunking the whole text and reconciling it with the stored
+        chunks. Either way only new chunk text is embedded, before the
+        transaction that swaps the document opens.
+
+        Raises:
+            DocumentNotFoundError: No document has this id.
+            DuplicateDocumentError: Another document already holds these
+                exact bytes.
+            EmptyDocumentError: The revised PDF contains no text.
+            DocumentChangedError: The document's chunks changed while
+                new ones were being embedded.
+        """
+        document = await self._documents.get(document_id)
+        if document is None:
+            raise DocumentNotFoundError(f"Document {document_id} not found.")
+        digest = await asyncio.to_thread(sha256_hex, content)
+        old_pages = (
+            await self._page_texts.get(document.content_sha256)
+            if document.content_sha256 is not None
+            else None
+        )
+        if digest == document.content_sha256 and old_pages is not None:
+            new_pages = old_pages
+        else:
+            new_pages = await asyncio.to_thread(
+                lambda: list(self._parser.iter_pages(content))
+            )
+        if not any(new_pages):
+            raise EmptyDocumentError("Uploaded PDF does not contain text.")
+
+        if old_pages is None:
+            diff = None
+            changed, removed = list(range(len(new_pages))), 0
+        else:
+            diff = _diff_pages(old_pages, new_pages)
+            changed, removed = diff.changed, diff.removed
+        revised = replace(document, filename=filename, content_sha256=digest)
+        plan = (
+            await self._plan(document.id, new_pages, old_pages, diff)
+            if changed or removed
+            else None
+        )
+        async with self._unit_of_work.begin() as tx:
+            await self._swap_document(tx, document, revised, digest, new_pages)
+            if plan is not None:
+                chunks = await plan.apply(tx)
+            else:
+                kept = len(await tx.chunks.list_by_document(document.id))
+                chunks = RechunkResultDTO(
+                    document_id=document.id,
+                    chunks=kept,
+                    reused=kept,
+                    embedded=0,
+                    removed=0,
+                )
+        return ReplaceResultDTO(
+            document_id=document.id,
+            filename=filename,
+            pages=len(new_pages),
+            changed_pages=changed,
+            removed_pages=removed,
+            chunks=chunks,
+        )
+
+    async def _swap_document(
+        self,
+        tx: TransactionScope,
+        document: Document,
+        revised: Document,
+        digest: str,
+        pages: list[str],
+    ) -> None:
+        """Point the document at the new digest and its page text."""
+        old_digest = document.content_sha256
+        if old_digest is not None and old_digest != digest:
+            # Drop the old page text first: it references the old digest.
+            await tx.pages.delete(old_digest)
+        if revised != document:
+            await tx.documents.update(revised)
+        if self._store_page_text:
+            await tx.pages.put(digest, pages)
+
+    async def _plan(
+        self,
+        document_id: str,
+        pages: list[str],
+        old_pages: list[str] | None,
+        diff: _PageDiff | None,
+    ) -> ChunkReconciliation:
+        if self._store_chunk_spans and old_pages is not None and diff:
+            stored = await self._chunks.list_by_document(document_id)
+            ranged = await asyncio.to_thread(
+                _RangedRechunk, self._chunker, old_pages, pages, diff
+            )
+            parts = await asyncio.to_thread(ranged.parts, stored)
+            if parts is not None:
+                plan = await plan_reconciliation(
+                    self._chunks,
+                    self._provider,
+                    document_id,
+                    parts,
+                    self._near_duplicates,
+                    stored=stored,
+                )
+                plan.text = ranged.text
+                return plan
+        return await plan_rechunk(
+            self._chunks,
+            self._chunker,
+            self._provider,
+            document_id,
+            pages,
+            self._near_duplicates,
+            self._store_chunk_spans,
+        )
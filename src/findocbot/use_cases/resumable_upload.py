@@ -0,0 +1,179 @@
+"""Resumable uploads: create, send byte ranges, then ingest on finalize."""
+
+import asyncio
+from collections.abc import AsyncIterable
+from datetime import UTC, datetime, timedelta
+from weakref import WeakValueDictionary
+
+from findocbot.domain.entities import Document, IngestJob, UploadSession
+from findocbot.domain.exceptions import (
+    UploadConflictError,
+    UploadNotFoundError,
+    UploadTooLargeError,
+)
+from findocbot.use_cases.ingest_jobs import EnqueueUploadUseCase
+from findocbot.use_cases.ports import UploadPartStorePort
+from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+
+
+class ResumableUploadUseCase:
+    """Receive a large PDF in byte ranges and ingest it once complete.
+
+    A client creates an upload with the total size, sends ranges in
+    order, and after a dropped connection asks for ``received`` and
+    continues from there. Bytes are written to the part store in blocks
+    of at most ``write_block_bytes``, so memory per request stays bounded
+    regardless of the range size. Ingestion starts only on ``finalize``.
+    """
+
+    def __init__(
+        self,
+        store: UploadPartStorePort,
+        upload: UploadPDFUseCase,
+        enqueue: EnqueueUploadUseCase | None = None,
+        max_bytes: int = 2 * 1024**3,
+        ttl_seconds: int = 86400,
+        write_block_bytes: int = 1024 * 1024,
+    ) -> None:
+        """Store dependencies and limits.
+
+        Args:
+            store: Holds upload bytes and progress.
+            upload: Ingests the assembled PDF on finalize.
+            enqueue: When set, finalize queues the PDF for background
+                ingestion instead.
+            max_bytes: Largest accepted upload. With *enqueue*, it is
+                lowered to the queue's limit, so an upload the queue
+                would refuse is rejected when it is created.
+            ttl_seconds: Uploads older than this are purged when a new
+                one is created.
+            write_block_bytes: Bytes buffered before each durable write.
+        """
+        self._store = store
+        self._upload = upload
+        self._enqueue = enqueue
+        self._max_bytes = (
+            min(max_bytes, enqueue.max_bytes)
+            if enqueue is not None
+            else max_bytes
+        )
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._write_block_bytes = write_block_bytes
+        # One writer per upload in this process; unused locks are dropped.
+        self._locks: WeakValueDictionary[str, asyncio.Lock] = (
+            WeakValueDictionary()
+        )
+
+    async def create(self, filename: str, size: int) -> UploadSession:
+        """Start an upload of *size* bytes.
+
+        Raises:
+            UploadTooLargeError: *size* exceeds the configured maximum.
+        """
+        if size > self._max_bytes:
+            raise UploadTooLargeError(
+                f"Upload exceeds {self._max_bytes // 1024 // 1024} MB limit."
+            )
+        await self._store.purge(datetime.now(tz=UTC) - self._ttl)
+        session = UploadSession.create(filename=filename, size=size)
+        await self._store.create(session)
+        return session
+
+    async def status(self, upload_id: str) -> UploadSession:
+        """Return the upload with the number of bytes stored so far.
+
+        Raises:
+            UploadNotFoundError: No such upload, or it has expired.
+        """
+        session = await self._store.get(upload_id)
+        if session is None:
+            raise UploadNotFoundError(f"Upload {upload_id} not found.")
+        return session
+
+    async def append(
+        self, upload_id: str, offset: int, blocks: AsyncIterable[bytes]
+    ) -> UploadSession:
+        """Store the bytes of *blocks* starting at *offset*.
+
+        *offset* may repeat bytes that were already received, so a range
+        whose response was lost can simply be sent again, but it may not
+        leave a gap. Bytes written before the stream breaks off are kept.
+
+        Raises:
+            UploadNotFoundError: No such upload, or it has expired.
+            UploadConflictError: *offset* is past the received bytes.
+            UploadTooLargeError: The range ends past the declared size.
+        """
+        lock = self._locks.get(upload_id)
+        if lock is None:
+            lock = self._locks[upload_id] = asyncio.Lock()
+        async with lock:
+            session = await self.status(upload_id)
+            if offset > session.received:
+                raise UploadConflictError(
+                    f"Range starts at {offset}, but only "
+                    f"{session.received} bytes were received."
+                )
+            await self._write_blocks(session, offset, blocks)
+            return await self.status(upload_id)
+
+    async def abort(self, upload_id: str) -> None:
+        """Discard an upload and its bytes."""
+        await self.status(upload_id)
+        await self._store.delete(upload_id)
+
+    async def finalize(self, upload_id: str) -> Document | IngestJob:
+        """Ingest the complete upload and delete its bytes.
+
+        Returns the document, or the queued job when ingestion runs in
+        the background. On failure the bytes are kept, so finalize can be
+        retried until the upload expires.
+
+        Raises:
+            UploadNotFoundError: No such upload, or it has expired.
+            UploadConflictError: Not all bytes have been received.
+        """
+        session = await self.status(upload_id)
+        if not session.complete:
+            raise UploadConflictError(
+                f"Upload is incomplete: {session.received} of "
+                f"{session.size} bytes received."
+            )
+        content = await self._store.open(session.id)
+        try:
+            result: Document | IngestJob
+            if self._enqueue is not None:
+                result = await self._enqueue.execute(session.filename, content)
+            else:
+                result = await self._upload.execute(session.filename, content)
+        finally:
+            await asyncio.to_thread(content.close)
+        await self._store.delete(session.id)
+        return result
+
+    async def _write_blocks(
+        self,
+        session: UploadSession,
+        offset: int,
+        blocks: AsyncIterable[bytes],
+    ) -> None:
+        position = offset
+        pending = bytearray()
+        try:
+            async for block in blocks:
+                if position + len(pending) + len(block) > session.size:
+                    raise UploadTooLargeError(
+                        f"Range ends past the declared size of "
+                        f"{session.size} bytes."
+                    )
+                pending.extend(block)
+                if len(pending) >= self._write_block_bytes:
+                    await self._store.write(
+                        session.id, position, bytes(pending)
+                    )
+                    position += len(pending)
+                    pending.clear()
+        finally:
+            # Keep what arrived before a disconnect or an oversized block.
+            if pending:
+                await self._store.write(session.id, position, bytes(pending))
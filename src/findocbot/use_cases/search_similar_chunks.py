@@ -2,7 +2,11 @@
 
 from findocbot.domain.exceptions import InvalidQueryError
 from findocbot.use_cases.dto import SearchResultDTO
-from findocbot.use_cases.ports import ChunkRepositoryPort, ModelProviderGateway
+from findocbot.use_cases.ports import (
+    ChunkRepositoryPort,
+    ModelProviderGateway,
+    SearchFilters,
+)
 
 
 class SearchSimilarChunksUseCase:
@@ -17,15 +21,34 @@ class SearchSimilarChunksUseCase:
         self._provider = provider
         self._chunks = chunks
 
-    async def execute(self, query: str, top_k: int) -> list[SearchResultDTO]:
-        """Embed query and return matching chunks."""
+    async def execute(
+        self,
+        query: str,
+        top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
+    ) -> list[SearchResultDTO]:
+        """Embed query and return matching chunks.
+
+        Args:
+            query: Text to search for.
+            top_k: Number of chunks to return.
+            filters: Restrict results to documents, a section or an
+                upload-date range.
+            ef_search: HNSW candidate list size; higher finds more of
+                the true nearest chunks at more latency. ``None`` uses
+                the repository default.
+        """
         clean_query = query.strip()
         if not clean_query:
             raise InvalidQueryError("Query cannot be empty.")
 
         query_embedding = await self._provider.embed_one(clean_query)
         matches = await self._chunks.search_by_embedding(
-            query_embedding, top_k=top_k
+            query_embedding,
+            top_k=top_k,
+            filters=filters,
+            ef_search=ef_search,
         )
         return [
             SearchResultDTO(
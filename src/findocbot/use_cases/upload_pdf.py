@@ -1,18 +1,115 @@
 """Upload PDF use case."""
 
 import asyncio
+import hashlib
+import pickle
+import tempfile
+from collections.abc import Callable, Coroutine, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
 
 from findocbot.domain.entities import Chunk, Document
-from findocbot.domain.exceptions import EmptyDocumentError
+from findocbot.domain.exceptions import (
+    DuplicateDocumentError,
+    EmptyDocumentError,
+)
+from findocbot.use_cases.dto import IngestStats
+from findocbot.use_cases.near_duplicates import (
+    DedupedChunks,
+    NearDuplicateFilter,
+    NearDuplicateSession,
+    embed_chunks,
+)
 from findocbot.use_cases.ports import (
     ChunkerPort,
-    ChunkRepositoryPort,
     DocumentRepositoryPort,
     ModelProviderGateway,
     PDFParserPort,
+    PDFSource,
+    TransactionScope,
+    UnitOfWorkPort,
 )
 
 
+@dataclass(frozen=True)
+class IngestPipelineOptions:
+    """Batch and queue bounds for the streaming ingestion mode."""
+
+    embed_batch_size: int = 50
+    # Rows per insert statement; persistence itself runs after embedding.
+    persist_batch_size: int = 500
+    queue_size: int = 4
+
+
+_HASH_READ_SIZE = 1024 * 1024
+
+# Chunk text, section and, with span storage, its span in the document's
+# normalized text.
+ChunkPart = tuple[str, str | None, tuple[int, int] | None]
+
+
+def sha256_hex(content: PDFSource) -> str:
+    """Hash an upload, reading file objects in 1 MB blocks."""
+    if isinstance(content, bytes):
+        return hashlib.sha256(content).hexdigest()
+    digest = hashlib.sha256()
+    content.seek(0)
+    while block := content.read(_HASH_READ_SIZE):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_chunk_parts(
+    chunker: ChunkerPort, pages: Iterable[str], spans: bool
+) -> Iterator[ChunkPart]:
+    """Chunk *pages*, as slices of ``chunker.normalize`` when *spans*."""
+    if not spans:
+        for text, section in chunker.iter_chunks(pages):
+            yield text, section, None
+        return
+    for span in chunker.iter_spans(pages):
+        yield span.text, span.section, (span.start, span.end)
+
+
+def _take(chunks: Iterator[Chunk], count: int) -> list[Chunk]:
+    """Pull up to *count* chunks from a lazy chunk stream."""
+    return list(islice(chunks, count))
+
+
+def _measured_pages(
+    pages: Iterator[str],
+    stats: IngestStats,
+    keep: Callable[[str], None] | None,
+) -> Iterator[str]:
+    """Count pages and attribute time spent producing them to parsing.
+
+    Every page is also passed to *keep*, when set, so it can be stored
+    once the upload commits.
+    """
+    while True:
+        with stats.measure("parse"):
+            page = next(pages, None)
+        if page is None:
+            return
+        stats.pages += 1
+        if keep is not None:
+            keep(page)
+        yield page
+
+
+async def _run_stages(*stages: Coroutine[Any, Any, None]) -> None:
+    """Run pipeline stages concurrently; cancel the rest on first error."""
+    tasks = [asyncio.create_task(stage) for stage in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
 class UploadPDFUseCase:
     """Extract, chunk, embed, and save uploaded PDF."""
 
@@ -22,54 +119,351 @@ class UploadPDFUseCase:
         chunker: ChunkerPort,
         provider: ModelProviderGateway,
         documents: DocumentRepositoryPort,
-        chunks: ChunkRepositoryPort,
+        unit_of_work: UnitOfWorkPort,
+        pipeline: IngestPipelineOptions | None = None,
+        record_aliases: bool = True,
+        store_page_text: bool = True,
+        near_duplicates: NearDuplicateFilter | None = None,
+        store_chunk_spans: bool = False,
     ) -> None:
-        """Store dependencies for upload workflow."""
+        """Store dependencies for upload workflow.
+
+        Args:
+            parser: PDF text extractor.
+            chunker: Splits extracted text into chunks.
+            provider: Embedding provider.
+            documents: Document repository for digest lookups and
+                aliases.
+            unit_of_work: Writes the document and its chunks in one
+                transaction.
+            pipeline: When set, ingest in streaming mode: parse/chunk
+                overlaps embedding, and the embedded batches are
+                persisted once embedding is done, instead of running
+                each stage over the whole document in turn.
+            record_aliases: Remember the filename of a duplicate upload as
+                an alias of the existing document.
+            store_page_text: Cache the extracted page texts with the
+                document so it can later be re-chunked without parsing.
+            near_duplicates: When set, chunks that nearly repeat a stored
+                chunk are linked to it or skipped instead of embedded.
+            store_chunk_spans: Store the document's normalized text once
+                and chunks as spans into it instead of inline text.
+        """
         self._parser = parser
         self._chunker = chunker
         self._provider = provider
         self._documents = documents
-        self._chunks = chunks
+        self._unit_of_work = unit_of_work
+        self._pipeline = pipeline
+        self._record_aliases = record_aliases
+        self._store_page_text = store_page_text
+        self._near_duplicates = near_duplicates
+        self._store_chunk_spans = store_chunk_spans
 
-    async def execute(self, filename: str, content: bytes) -> Document:
+    async def execute(
+        self,
+        filename: str,
+        content: PDFSource,
+        stats: IngestStats | None = None,
+    ) -> Document:
         """Run upload pipeline and return created document.
 
-        CPU-bound PDF parsing and chunking are offloaded to a thread
-        so they do not block the event loop.
+        Uploads whose bytes match an existing document short-circuit to
+        that document without parsing or embedding anything. CPU-bound
+        PDF parsing and chunking are offloaded to a thread so they do not
+        block the event loop. *content* may be a seekable file, such as a
+        spooled upload, which is then read in place instead of being
+        copied into memory. When *stats* is given it is filled with
+        per-stage timings and counts.
         """
-        text = (
-            await asyncio.to_thread(self._parser.extract_text, content)
-        ).strip()
+        stats = stats if stats is not None else IngestStats()
+        digest = await asyncio.to_thread(sha256_hex, content)
+        existing = await self._documents.get_by_digest(digest)
+        if existing is not None:
+            return await self._reuse(existing, filename)
+
+        document = Document.create(filename=filename, content_sha256=digest)
+        try:
+            if self._pipeline is not None:
+                return await self._execute_pipelined(
+                    document, content, self._pipeline, stats
+                )
+            return await self._execute_sequential(document, content, stats)
+        except DuplicateDocumentError:
+            # A concurrent upload of the same bytes won the insert race.
+            existing = await self._documents.get_by_digest(digest)
+            if existing is None:
+                raise
+            return await self._reuse(existing, filename)
+
+    def _iter_pages(
+        self,
+        content: PDFSource,
+        stats: IngestStats,
+        keep: Callable[[str], None] | None,
+    ) -> Iterator[str]:
+        """Parse lazily, recording timings and skipped pages in *stats*."""
+        return _measured_pages(
+            self._parser.iter_pages(
+                content, on_skipped_page=stats.skipped_pages.__setitem__
+            ),
+            stats,
+            keep,
+        )
+
+    def _keeps_pages(self, document: Document) -> bool:
+        """Whether ``_save_pages`` stores anything for *document*."""
+        return self._store_chunk_spans or (
+            self._store_page_text and document.content_sha256 is not None
+        )
+
+    def _session(self) -> NearDuplicateSession | None:
+        if self._near_duplicates is None:
+            return None
+        return self._near_duplicates.session()
+
+    async def _save_pages(
+        self, tx: TransactionScope, document: Document, pages: list[str]
+    ) -> None:
+        if self._store_page_text and document.content_sha256 is not None:
+            await tx.pages.put(document.content_sha256, pages)
+        if self._store_chunk_spans:
+            text = await asyncio.to_thread(self._chunker.normalize, pages)
+            await tx.texts.put(document.id, text)
+
+    def _chunk_text(self, text: str, pages: list[str]) -> list[ChunkPart]:
+        if self._store_chunk_spans:
+            return list(iter_chunk_parts(self._chunker, pages, spans=True))
+        return [
+            (chunk_text, section, None)
+            for chunk_text, section in self._chunker.split(text)
+        ]
+
+    async def _reuse(self, existing: Document, filename: str) -> Document:
+        if self._record_aliases and filename != existing.filename:
+            await self._documents.add_alias(existing.id, filename)
+        return existing
+
+    async def _execute_sequential(
+        self,
+        document: Document,
+        content: PDFSource,
+        stats: IngestStats,
+    ) -> Document:
+        """Run each stage over the whole document in turn."""
+        pages: list[str] = []
+        await asyncio.to_thread(
+            lambda: list(self._iter_pages(content, stats, pages.append))
+        )
+        text = "\n\n".join(page for page in pages if page).strip()
         if not text:
             raise EmptyDocumentError("Uploaded PDF does not contain text.")
 
-        document = Document.create(filename=filename)
-
-        chunk_parts = await asyncio.to_thread(self._chunker.split, text)
+        with stats.measure("chunk"):
+            chunk_parts = await asyncio.to_thread(
+                self._chunk_text, text, pages
+            )
         built_chunks = [
             Chunk.create(
                 document_id=document.id,
                 chunk_index=index,
                 text=chunk_text,
                 section=section,
+                span=span,
             )
-            for index, (chunk_text, section) in enumerate(chunk_parts)
+            for index, (chunk_text, section, span) in enumerate(chunk_parts)
             if chunk_text.strip()
         ]
+        stats.chunks = len(built_chunks)
 
-        embeddings = await self._provider.embed_many([
-            c.text for c in built_chunks
-        ])
+        with stats.measure("embed"):
+            embedded = await embed_chunks(
+                self._provider, built_chunks, self._session()
+            )
+        stats.near_duplicates = embedded.linked + embedded.skipped
         # Persist the document only after embedding succeeds so that
         # a provider failure does not leave an orphan document row.
-        await self._documents.create(document)
-        try:
-            await self._chunks.add_chunks_with_embeddings(
-                built_chunks, embeddings
+        with stats.measure("persist"):
+            async with self._unit_of_work.begin() as tx:
+                await tx.documents.create(document)
+                await embedded.save(tx.chunks)
+                await self._save_pages(tx, document, pages)
+        return document
+
+    async def _execute_pipelined(
+        self,
+        document: Document,
+        content: PDFSource,
+        options: IngestPipelineOptions,
+        stats: IngestStats,
+    ) -> Document:
+        """Stream pages → chunks → embedding batches → bounded inserts.
+
+        Parsing and chunking run lazily in a worker thread, one embedding
+        batch at a time, so only ``queue_size`` batches are ever held in
+        memory. Embedded batches, and page texts when they are stored,
+        are staged in temporary files, and the transaction is opened
+        only once embedding is done: holding a pool connection while
+        waiting on the provider would starve the near-duplicate lookups
+        and other uploads of connections. All
+        writes share that transaction, so a failure in any stage leaves
+        neither the document nor its chunks.
+        """
+        page_spool = _Spool()
+        built_chunks = (
+            Chunk.create(
+                document_id=document.id,
+                chunk_index=index,
+                text=chunk_text,
+                section=section,
+                span=span,
             )
-        except Exception:
-            # Remove the orphan document row if chunk persistence fails,
-            # since document + chunks are not written in one transaction.
-            await self._documents.delete(document.id)
-            raise
+            for index, (chunk_text, section, span) in enumerate(
+                iter_chunk_parts(
+                    self._chunker,
+                    self._iter_pages(
+                        content,
+                        stats,
+                        page_spool.write
+                        if self._keeps_pages(document)
+                        else None,
+                    ),
+                    self._store_chunk_spans,
+                )
+            )
+            if chunk_text.strip()
+        )
+        with page_spool, _Spool() as spool:
+            run = _PipelineRun(
+                document=document,
+                provider=self._provider,
+                spool=spool,
+                options=options,
+                stats=stats,
+                near_duplicates=self._session(),
+            )
+            await _run_stages(run.parse_and_chunk(built_chunks), run.embed())
+            if not run.has_content:
+                raise EmptyDocumentError("Uploaded PDF does not contain text.")
+            async with self._unit_of_work.begin() as tx:
+                await run.persist(tx)
+                if len(page_spool):
+                    # The stores keep a document's pages in one row, so
+                    # they are read back only for this write.
+                    pages = await asyncio.to_thread(page_spool.read_all)
+                    await self._save_pages(tx, document, pages)
         return document
+
+
+class _Spool:
+    """Items staged in an anonymous temporary file, read back in order."""
+
+    def __init__(self) -> None:
+        """Open the file; it is removed when closed."""
+        self._file = tempfile.TemporaryFile()
+        self._items = 0
+
+    def __enter__(self) -> "_Spool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._items
+
+    def write(self, item: Any) -> None:
+        """Append one item."""
+        pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._items += 1
+
+    def rewind(self) -> None:
+        """Position the spool before the first item."""
+        self._file.seek(0)
+
+    def read(self) -> Any:
+        """Return the next item after ``rewind``."""
+        return pickle.load(self._file)
+
+    def read_all(self) -> list[Any]:
+        """Return every item."""
+        self.rewind()
+        return [self.read() for _ in range(self._items)]
+
+
+class _PipelineRun:
+    """Stages of one streaming upload and their bounded hand-off queue."""
+
+    def __init__(
+        self,
+        document: Document,
+        provider: ModelProviderGateway,
+        spool: _Spool,
+        options: IngestPipelineOptions,
+        stats: IngestStats,
+        near_duplicates: NearDuplicateSession | None = None,
+    ) -> None:
+        """Create an empty queue sized by *options*.
+
+        Embedded batches are staged in *spool* until ``persist``.
+        """
+        self._document = document
+        self._provider = provider
+        self._spool = spool
+        self._options = options
+        self._stats = stats
+        self._near_duplicates = near_duplicates
+        self._to_embed: asyncio.Queue[list[Chunk] | None] = asyncio.Queue(
+            maxsize=options.queue_size
+        )
+        self.has_content = False
+
+    async def parse_and_chunk(self, built_chunks: Iterator[Chunk]) -> None:
+        """Pull embedding-sized chunk batches from the lazy parser."""
+        while batch := await asyncio.to_thread(self._take_batch, built_chunks):
+            self._stats.chunks += len(batch)
+            await self._to_embed.put(batch)
+        await self._to_embed.put(None)
+
+    async def embed(self) -> None:
+        """Embed each batch as soon as it is available and stage it."""
+        while (batch := await self._to_embed.get()) is not None:
+            with self._stats.measure("embed"):
+                embedded = await embed_chunks(
+                    self._provider, batch, self._near_duplicates
+                )
+            self._stats.near_duplicates += embedded.linked + embedded.skipped
+            # A document whose chunks were all skipped as near-duplicates
+            # is still created.
+            self.has_content |= bool(embedded.chunks or embedded.skipped)
+            await asyncio.to_thread(self._spool.write, embedded)
+
+    async def persist(self, tx: TransactionScope) -> None:
+        """Create the document and insert the staged chunks in *tx*.
+
+        Runs after embedding, not alongside it. Chunks are inserted in
+        batches of ``persist_batch_size``, which bounds the rows held in
+        memory and sent per statement.
+        """
+        with self._stats.measure("persist"):
+            await tx.documents.create(self._document)
+            self._spool.rewind()
+            pending = DedupedChunks()
+            for _ in range(len(self._spool)):
+                pending.extend(await asyncio.to_thread(self._spool.read))
+                if len(pending.chunks) >= self._options.persist_batch_size:
+                    await pending.save(tx.chunks)
+                    pending = DedupedChunks()
+            if pending.chunks:
+                await pending.save(tx.chunks)
+
+    def _take_batch(self, built_chunks: Iterator[Chunk]) -> list[Chunk]:
+        """Take the next batch; time outside page parsing is chunking."""
+        parse_before = self._stats.stage_seconds.get("parse", 0.0)
+        with self._stats.measure("chunk"):
+            batch = _take(built_chunks, self._options.embed_batch_size)
+        parse_spent = (
+            self._stats.stage_seconds.get("parse", 0.0) - parse_before
+        )
+        self._stats.stage_seconds["chunk"] -= parse_spent
+        return batch
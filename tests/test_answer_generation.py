@@ -5,9 +5,11 @@ from findocbot.infrastructure.in_memory import (
     InMemoryChunkRepository,
     InMemoryDocumentRepository,
     InMemoryHistoryRepository,
+    InMemoryUnitOfWork,
 )
 from findocbot.infrastructure.pdf_parser import PyPDFParser
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
+from findocbot.use_cases.ports import ChunkWithScore, SearchFilters
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
 )
@@ -71,7 +73,7 @@ async def test_answer_generation_contains_keywords() -> None:
         chunker=chunker,
         provider=provider,
         documents=docs,
-        chunks=chunks,
+        unit_of_work=InMemoryUnitOfWork(docs, chunks),
     )
     search = SearchSimilarChunksUseCase(provider=provider, chunks=chunks)
     ask = AnswerQuestionUseCase(
@@ -91,3 +93,41 @@ async def test_answer_generation_contains_keywords() -> None:
 
     assert "revenue" in response.answer.lower()
     assert "20 percent" in response.answer.lower()
+
+
+class _RecordingChunkRepository(InMemoryChunkRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.ef_searches: list[int | None] = []
+
+    async def search_by_embedding(
+        self,
+        embedding: list[float],
+        top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
+    ) -> list[ChunkWithScore]:
+        self.ef_searches.append(ef_search)
+        return await super().search_by_embedding(
+            embedding, top_k, filters, ef_search
+        )
+
+
+async def test_ask_uses_its_ef_search_unless_the_request_overrides() -> None:
+    provider = FakeProviderGateway()
+    chunks = _RecordingChunkRepository()
+    ask = AnswerQuestionUseCase(
+        provider=provider,
+        search_use_case=SearchSimilarChunksUseCase(
+            provider=provider, chunks=chunks
+        ),
+        history=InMemoryHistoryRepository(),
+        ef_search=100,
+    )
+
+    await ask.execute(session_id="s", question="Revenue?", top_k=3)
+    await ask.execute(
+        session_id="s", question="Revenue?", top_k=3, ef_search=16
+    )
+
+    assert chunks.ef_searches == [100, 16]
@@ -1,5 +1,7 @@
 """API error-path tests: use-case exceptions map to HTTP status codes."""
 
+from collections.abc import AsyncIterator
+
 import httpx
 from fpdf import FPDF
 
@@ -11,11 +13,12 @@ from findocbot.infrastructure.in_memory import (
     InMemoryChunkRepository,
     InMemoryDocumentRepository,
     InMemoryHistoryRepository,
+    InMemoryUnitOfWork,
 )
 from findocbot.infrastructure.pdf_parser import PyPDFParser
 from findocbot.main import create_app
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
-from findocbot.use_cases.ports import ChunkWithScore
+from findocbot.use_cases.ports import ChunkWithScore, SearchFilters
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
 )
@@ -54,7 +57,11 @@ class _FailingEmbedProvider(_StubProvider):
 
 class _FailingSearchChunkRepository(InMemoryChunkRepository):
     async def search_by_embedding(
-        self, embedding: list[float], top_k: int
+        self,
+        embedding: list[float],
+        top_k: int,
+        filters: SearchFilters | None = None,
+        ef_search: int | None = None,
     ) -> list[ChunkWithScore]:
         raise StorageError("database unavailable")
 
@@ -81,7 +88,7 @@ def _build_app(
         chunker=ParagraphTokenChunker(chunk_tokens=120, overlap_ratio=0.1),
         provider=provider,
         documents=documents,
-        chunks=chunks,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
     )
     container = AppContainer(
         settings=Settings(),
@@ -156,3 +163,37 @@ async def test_upload_oversized_file_returns_413() -> None:
         )
         assert resp.status_code == 413
         assert "50 MB" in resp.json()["detail"]
+
+
+async def test_upload_stops_reading_an_oversized_body_early() -> None:
+    sent: list[int] = []
+
+    async def body() -> AsyncIterator[bytes]:
+        yield (
+            b"--b\r\nContent-Disposition: form-data; name=file; "
+            b'filename="big.pdf"\r\nContent-Type: application/pdf\r\n\r\n'
+        )
+        for _ in range(200):
+            sent.append(1)
+            yield b"0" * 1024 * 1024
+
+    async with httpx.AsyncClient(
+        transport=_build_app(), base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            "/documents/upload",
+            content=body(),
+            headers={"Content-Type": "multipart/form-data; boundary=b"},
+        )
+        declared = await client.post(
+            "/documents/upload",
+            content=b"--b--\r\n",
+            headers={
+                "Content-Type": "multipart/form-data; boundary=b",
+                "Content-Length": str(60 * 1024 * 1024),
+            },
+        )
+
+    assert resp.status_code == 413
+    assert len(sent) <= 51
+    assert declared.status_code == 413
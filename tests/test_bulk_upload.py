@@ -0,0 +1,174 @@
+"""Bulk ingestion of many PDFs with shared embedding batches."""
+
+import io
+
+from fpdf import FPDF
+
+from findocbot.domain.entities import Document
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
+from findocbot.use_cases.dto import IngestStats
+from findocbot.use_cases.upload_pdf import sha256_hex
+
+
+class _BatchRecordingProvider:
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+def _build_pdf_bytes(text: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.multi_cell(0, 10, text=text)
+    return bytes(pdf.output())
+
+
+def _build(
+    documents: InMemoryDocumentRepository | None = None,
+    batch_files: int = 16,
+) -> tuple[
+    BulkUploadUseCase,
+    _BatchRecordingProvider,
+    InMemoryDocumentRepository,
+    InMemoryChunkRepository,
+]:
+    provider = _BatchRecordingProvider()
+    documents = documents or InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository()
+    bulk = BulkUploadUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=30, overlap_ratio=0.1),
+        provider=provider,
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
+        batch_files=batch_files,
+    )
+    return bulk, provider, documents, chunks
+
+
+def _filing(name: str) -> bytes:
+    return _build_pdf_bytes(
+        "\n\n".join(
+            f"{name} paragraph {n}: revenue and margins by segment." * 2
+            for n in range(3)
+        )
+    )
+
+
+async def test_bulk_upload_reports_each_file_and_batches_across_docs() -> None:
+    bulk, provider, documents, chunks = _build()
+    existing = Document.create("old.pdf", sha256_hex(_filing("old")))
+    await documents.create(existing)
+    stats = IngestStats()
+
+    results = await bulk.execute(
+        [
+            ("a.pdf", _filing("alpha")),
+            ("old-copy.pdf", _filing("old")),
+            ("broken.pdf", b"%PDF-1.4 garbage"),
+            ("b.pdf", io.BytesIO(_filing("beta"))),
+            ("a-again.pdf", _filing("alpha")),
+        ],
+        stats=stats,
+    )
+
+    assert [(r.filename, r.status) for r in results] == [
+        ("a.pdf", "created"),
+        ("old-copy.pdf", "duplicate"),
+        ("broken.pdf", "failed"),
+        ("b.pdf", "created"),
+        ("a-again.pdf", "duplicate"),
+    ]
+    assert results[1].document_id == existing.id
+    assert results[4].document_id == results[0].document_id
+    assert results[2].error
+    assert documents.aliases[existing.id] == {"old-copy.pdf"}
+    # Chunks of both new documents went to the provider in one call.
+    assert provider.calls == [results[0].chunks + results[3].chunks]
+    assert len(chunks.items) == stats.chunks == provider.calls[0]
+    assert {item.chunk.document_id for item in chunks.items} == {
+        results[0].document_id,
+        results[3].document_id,
+    }
+
+
+async def test_bulk_upload_embeds_and_commits_one_group_at_a_time() -> None:
+    bulk, provider, _, chunks = _build(batch_files=2)
+
+    results = await bulk.execute([
+        ("a.pdf", _filing("alpha")),
+        ("b.pdf", _filing("beta")),
+        ("c.pdf", _filing("gamma")),
+        ("a-again.pdf", _filing("alpha")),
+        ("broken.pdf", b"%PDF-1.4 garbage"),
+    ])
+
+    assert [r.status for r in results] == [
+        "created",
+        "created",
+        "created",
+        "duplicate",
+        "failed",
+    ]
+    # A repeat in a later group resolves to the committed document.
+    assert results[3].document_id == results[0].document_id
+    assert provider.calls == [
+        results[0].chunks + results[1].chunks,
+        results[2].chunks,
+    ]
+    assert len(chunks.items) == sum(provider.calls)
+
+
+class _StaleDigestDocuments(InMemoryDocumentRepository):
+    """Misses the first lookup per digest, as if another upload raced."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.looked_up: set[str] = set()
+
+    async def get_by_digest(self, content_sha256: str) -> Document | None:
+        if content_sha256 not in self.looked_up:
+            self.looked_up.add(content_sha256)
+            return None
+        return await super().get_by_digest(content_sha256)
+
+
+async def test_bulk_upload_isolates_a_lost_insert_race() -> None:
+    documents = _StaleDigestDocuments()
+    winner = Document.create("winner.pdf", sha256_hex(_filing("raced")))
+    await documents.create(winner)
+    bulk, _, _, chunks = _build(documents)
+
+    results = await bulk.execute([
+        ("fresh.pdf", _filing("fresh")),
+        ("raced.pdf", _filing("raced")),
+    ])
+
+    assert [r.status for r in results] == ["created", "duplicate"]
+    assert results[1].document_id == winner.id
+    assert {item.chunk.document_id for item in chunks.items} == {
+        results[0].document_id
+    }
@@ -1,6 +1,14 @@
 """Direct tests for ParagraphTokenChunker — the most complex logic."""
 
-from findocbot.infrastructure.chunking import ParagraphTokenChunker
+import random
+
+import pytest
+from reference_chunker import ReferenceChunker
+
+from findocbot.infrastructure.chunking import (
+    TOKEN_PATTERN,
+    ParagraphTokenChunker,
+)
 
 
 def _chunk_texts(chunks: list[tuple[str, str | None]]) -> list[str]:
@@ -141,3 +149,122 @@ class TestParagraphTokenChunker:
         texts = _chunk_texts(result)
         assert len(texts) >= 1
         assert "Real content" in texts[0]
+
+    def test_iter_chunks_over_pages_matches_split_of_joined_text(
+        self,
+    ) -> None:
+        chunker = ParagraphTokenChunker(
+            chunk_tokens=20, overlap_ratio=0.2, min_chunk_tokens=8
+        )
+        pages = [
+            "Section A\nalpha beta gamma.\n\n" + "delta " * 30,
+            "",
+            "Chapter B\n" + "epsilon " * 7 + "\n\n\nzeta eta",
+            "theta",
+        ]
+        streamed = list(chunker.iter_chunks(iter(pages)))
+        assert streamed == chunker.split(
+            "\n\n".join(page for page in pages if page)
+        )
+
+    def test_iter_spans_slices_normalized_text(self) -> None:
+        chunker = ParagraphTokenChunker(
+            chunk_tokens=20, overlap_ratio=0.2, min_chunk_tokens=8
+        )
+        pages = [
+            "Section A\nforward-looking (net)  margin.\n\n" + "delta " * 30,
+            "",
+            "Chapter B\n" + "epsilon " * 7 + "\n\n\nzeta eta",
+            "theta",
+        ]
+        text = chunker.normalize(pages)
+        spans = list(chunker.iter_spans(iter(pages)))
+        chunks = list(chunker.iter_chunks(pages))
+
+        assert [(s.text, s.start, s.end) for s in spans] == [
+            (text[s.start : s.end], s.start, s.end) for s in spans
+        ]
+        assert [s.section for s in spans] == _chunk_sections(chunks)
+        # Same tokens; spans keep the source spacing instead of re-joining.
+        assert [TOKEN_PATTERN.findall(s.text) for s in spans] == [
+            TOKEN_PATTERN.findall(c) for c in _chunk_texts(chunks)
+        ]
+        assert "forward-looking (net)  margin" in spans[0].text
+
+
+_WORDS = [
+    "revenue",
+    "net",
+    "income",
+    "EBITDA",
+    "2023",
+    "Q4",
+    "cash_flow",
+    "liabilities",
+    "€12.5m",
+    "Umsatz",
+    "доход",
+    "a",
+]
+_PUNCTUATION = [".", ",", ";", "%", "(", ")", "—", "$"]
+
+
+def _random_paragraph(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.08:
+        return " \t "
+    if kind < 0.2:
+        header = rng.choice(["Section", "CHAPTER", "section", "Sectional"])
+        return f"{header} {rng.randint(1, 9)}\n" + _random_sentence(rng, 12)
+    length = rng.choice([3, 8, 20, 45, 90, 250])
+    return _random_sentence(rng, length)
+
+
+def _random_sentence(rng: random.Random, length: int) -> str:
+    tokens = [
+        rng.choice(_PUNCTUATION) if rng.random() < 0.15 else rng.choice(_WORDS)
+        for _ in range(rng.randint(1, length))
+    ]
+    glue = rng.choice([" ", "  ", "\n", ""])
+    return glue.join(tokens)
+
+
+def _random_document(rng: random.Random) -> str:
+    paragraphs: list[str] = []
+    for _ in range(rng.randint(0, 60)):
+        if paragraphs and rng.random() < 0.1:
+            paragraphs.append(rng.choice(paragraphs))
+        else:
+            paragraphs.append(_random_paragraph(rng))
+    separators = ["\n\n", "\n\n\n", "\n\n  \n\n", "\n \n\n"]
+    text = ""
+    for paragraph in paragraphs:
+        text += paragraph + rng.choice(separators)
+    return text
+
+
+@pytest.mark.parametrize(
+    ("chunk_tokens", "overlap_ratio", "min_chunk_tokens"),
+    [
+        (300, 0.15, 80),
+        (40, 0.15, 10),
+        (12, 0.5, 1),
+        (25, 0.0, 30),
+        (8, 0.25, 4),
+    ],
+)
+def test_matches_reference_chunker_on_random_corpus(
+    chunk_tokens: int, overlap_ratio: float, min_chunk_tokens: int
+) -> None:
+    rng = random.Random(chunk_tokens * 1000 + min_chunk_tokens)
+    options = {
+        "chunk_tokens": chunk_tokens,
+        "overlap_ratio": overlap_ratio,
+        "min_chunk_tokens": min_chunk_tokens,
+    }
+    chunker = ParagraphTokenChunker(**options)
+    reference = ReferenceChunker(**options)
+
+    for _ in range(100):
+        text = _random_document(rng)
+        assert chunker.split(text) == reference.split(text), text
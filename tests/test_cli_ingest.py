@@ -0,0 +1,131 @@
+"""Resumable directory ingestion behind ``findocbot ingest``."""
+
+import io
+from pathlib import Path
+
+import pytest
+from fpdf import FPDF
+
+from findocbot.adapters.cli.ingest import (
+    IngestCheckpoint,
+    ingest_directory,
+)
+from findocbot.domain.exceptions import ModelProviderError
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
+
+
+class _FlakyProvider:
+    def __init__(self, fail_on_call: int | None = None) -> None:
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ModelProviderError("Ollama went away")
+        return [[1.0, 0.0] for _ in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+def _write_pdf(path: Path, text: str) -> None:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.multi_cell(0, 10, text=text)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(pdf.output()))
+
+
+def _bulk(
+    provider: _FlakyProvider, documents: InMemoryDocumentRepository
+) -> BulkUploadUseCase:
+    chunks = InMemoryChunkRepository()
+    return BulkUploadUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=60, overlap_ratio=0.1),
+        provider=provider,
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
+    )
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    root = tmp_path / "filings"
+    _write_pdf(root / "2023" / "10-K.pdf", "FY2023 revenue was 10bn.")
+    _write_pdf(root / "2024" / "10-K.PDF", "FY2024 revenue was 12bn.")
+    _write_pdf(root / "2024" / "10-Q.pdf", "Q1 2024 revenue was 3bn.")
+    (root / "2024" / "readme.txt").write_text("not a filing")
+    (root / "2024" / "broken.pdf").write_bytes(b"%PDF-1.4 truncated")
+    return root
+
+
+async def test_ingest_resumes_after_crash(
+    corpus: Path, tmp_path: Path
+) -> None:
+    documents = InMemoryDocumentRepository()
+    checkpoint_path = tmp_path / "ingest.jsonl"
+    out = io.StringIO()
+
+    # The provider dies on the second batch, like a crash mid-run.
+    with pytest.raises(ModelProviderError):
+        await ingest_directory(
+            _bulk(_FlakyProvider(fail_on_call=2), documents),
+            corpus,
+            IngestCheckpoint(checkpoint_path),
+            batch_files=1,
+            out=out,
+        )
+    assert len(documents.items) == 1
+    with checkpoint_path.open("a") as log:
+        log.write('{"key": "torn')  # partial line from the crash
+
+    provider = _FlakyProvider()
+    progress = await ingest_directory(
+        _bulk(provider, documents),
+        corpus,
+        IngestCheckpoint(checkpoint_path),
+        batch_files=2,
+        out=out,
+    )
+
+    assert progress.total_files == 3  # only files not yet checkpointed
+    assert (progress.created, progress.failed) == (2, 1)
+    assert len(documents.items) == 3
+    assert "failed: " in out.getvalue()
+    assert "pages/s" in out.getvalue()
+
+    again = await ingest_directory(
+        _bulk(provider, documents),
+        corpus,
+        IngestCheckpoint(checkpoint_path),
+        out=out,
+    )
+    assert again.total_files == 0
+
+    retried = await ingest_directory(
+        _bulk(provider, documents),
+        corpus,
+        IngestCheckpoint(checkpoint_path),
+        retry_failed=True,
+        out=out,
+    )
+    assert (retried.total_files, retried.failed) == (1, 1)
@@ -0,0 +1,137 @@
+"""Content-hash deduplication of uploaded PDFs."""
+
+import asyncio
+import hashlib
+import io
+
+from fpdf import FPDF
+
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.upload_pdf import (
+    IngestPipelineOptions,
+    UploadPDFUseCase,
+)
+
+
+class _CountingProvider:
+    def __init__(self) -> None:
+        self.embedded = 0
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.embedded += len(texts)
+        # Yield so concurrent uploads interleave before persisting.
+        await asyncio.sleep(0)
+        return [[1.0, 0.0] for _ in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+def _build_pdf_bytes(text: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.multi_cell(0, 10, text=text)
+    return bytes(pdf.output())
+
+
+def _build(
+    pipeline: IngestPipelineOptions | None = None,
+    record_aliases: bool = True,
+) -> tuple[
+    UploadPDFUseCase,
+    _CountingProvider,
+    InMemoryDocumentRepository,
+    InMemoryChunkRepository,
+]:
+    provider = _CountingProvider()
+    documents = InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository()
+    upload = UploadPDFUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=120, overlap_ratio=0.1),
+        provider=provider,
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
+        pipeline=pipeline,
+        record_aliases=record_aliases,
+    )
+    return upload, provider, documents, chunks
+
+
+async def test_reupload_of_identical_bytes_returns_existing_document() -> None:
+    upload, provider, documents, chunks = _build()
+    pdf_bytes = _build_pdf_bytes("Revenue grew by 20 percent.")
+
+    first = await upload.execute("10-K.pdf", pdf_bytes)
+    embedded_after_first = provider.embedded
+    second = await upload.execute("10-K (copy).pdf", pdf_bytes)
+
+    assert second.id == first.id
+    assert second.filename == "10-K.pdf"
+    assert provider.embedded == embedded_after_first
+    assert len(documents.items) == 1
+    assert len(chunks.items) == embedded_after_first
+    assert documents.aliases == {first.id: {"10-K (copy).pdf"}}
+
+
+async def test_alias_recording_can_be_disabled() -> None:
+    upload, _, documents, _ = _build(record_aliases=False)
+    pdf_bytes = _build_pdf_bytes("Revenue grew by 20 percent.")
+
+    await upload.execute("a.pdf", pdf_bytes)
+    await upload.execute("b.pdf", pdf_bytes)
+
+    assert documents.aliases == {}
+
+
+async def test_concurrent_identical_uploads_converge_on_one_document() -> None:
+    upload, _, documents, _ = _build(pipeline=IngestPipelineOptions())
+    pdf_bytes = _build_pdf_bytes("Profit remained stable.")
+
+    first, second = await asyncio.gather(
+        upload.execute("a.pdf", pdf_bytes),
+        upload.execute("b.pdf", pdf_bytes),
+    )
+
+    assert first.id == second.id
+    assert list(documents.items) == [first.id]
+
+
+async def test_file_upload_and_bytes_upload_share_digest() -> None:
+    upload, provider, documents, _ = _build()
+    assert not documents.items
+    pdf_bytes = _build_pdf_bytes("Dividend was raised to 1.20 per share.")
+
+    first = await upload.execute("a.pdf", io.BytesIO(pdf_bytes))
+    embedded = provider.embedded
+    second = await upload.execute("b.pdf", pdf_bytes)
+
+    assert second.id == first.id
+    assert provider.embedded == embedded
+    assert first.content_sha256 == hashlib.sha256(pdf_bytes).hexdigest()
+
+
+async def test_different_bytes_create_separate_documents() -> None:
+    upload, _, documents, _ = _build()
+
+    first = await upload.execute("a.pdf", _build_pdf_bytes("Revenue."))
+    second = await upload.execute("b.pdf", _build_pdf_bytes("Profit."))
+
+    assert first.id != second.id
+    assert len(documents.items) == 2
@@ -5,10 +5,15 @@ import logging
 
 import pytest
 
+from findocbot.domain.exceptions import ModelProviderError, StorageError
 from findocbot.infrastructure.cached_embedding_gateway import (
     CachedEmbeddingGateway,
 )
+from findocbot.infrastructure.in_memory import InMemoryEmbeddingStore
 from findocbot.infrastructure.ollama_gateway import OllamaGateway
+from findocbot.infrastructure.sqlite_embedding_store import (
+    SqliteEmbeddingStore,
+)
 
 
 class MockGateway:
@@ -263,3 +268,136 @@ async def test_ollama_gateway_batching() -> None:
     result = await gateway.embed_many([])
     assert result == []
     await gateway.stop()
+
+
+class FailingStore:
+    """Embedding store whose backend is unavailable."""
+
+    async def get_many(
+        self, model: str, digests: list[str]
+    ) -> dict[str, list[float]]:
+        """Fail every lookup."""
+        raise StorageError("store down")
+
+    async def put_many(
+        self, model: str, embeddings: dict[str, list[float]]
+    ) -> None:
+        """Fail every write."""
+        raise StorageError("store down")
+
+
+@pytest.mark.asyncio
+async def test_store_serves_partial_hits_and_dedupes_misses() -> None:
+    """Only distinct texts missing from the store reach the provider."""
+    mock = MockGateway()
+    store = InMemoryEmbeddingStore()
+    cached = CachedEmbeddingGateway(gateway=mock, store=store, model="m")
+
+    await cached.embed_many(["alpha", "beta"])
+    sent: list[list[str]] = []
+    original = mock.embed_many
+
+    async def recording(texts: list[str]) -> list[list[float]]:
+        sent.append(texts)
+        return await original(texts)
+
+    mock.embed_many = recording  # type: ignore[method-assign]
+    result = await cached.embed_many(["alpha", "gamma", "gamma  ", "beta"])
+
+    assert sent == [["gamma"]]
+    assert result == [
+        [5.0, 1.0, 2.0],
+        [5.0, 1.0, 2.0],
+        [5.0, 1.0, 2.0],
+        [4.0, 1.0, 2.0],
+    ]
+    stats = cached.get_stats()
+    assert stats.store_hits == 2
+    assert stats.store_misses == 3
+
+    await cached.embed_many(["alpha", "alpha  "])
+    assert cached.get_stats().store_hits == 3  # counted once, like misses
+
+
+@pytest.mark.asyncio
+async def test_store_is_shared_by_embed_one_and_keyed_by_model() -> None:
+    """Chunk vectors answer queries; another model never reuses them."""
+    mock = MockGateway()
+    store = InMemoryEmbeddingStore()
+    chunks = CachedEmbeddingGateway(gateway=mock, store=store, model="m")
+    await chunks.embed_many(["net revenue"])
+
+    queries = CachedEmbeddingGateway(gateway=mock, store=store, model="m")
+    assert await queries.embed_one("net   revenue") == [11.0, 1.0, 2.0]
+    assert mock.embed_one_calls == 0
+    assert mock.embed_many_calls == 1
+
+    other = CachedEmbeddingGateway(gateway=mock, store=store, model="m2")
+    await other.embed_one("net revenue")
+    assert mock.embed_many_calls == 2
+    assert set(store.items) == {("m", chunks._store_key("net revenue"))}
+
+
+@pytest.mark.asyncio
+async def test_store_failures_fall_back_to_provider(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """An unavailable store degrades to plain provider calls."""
+    mock = MockGateway()
+    cached = CachedEmbeddingGateway(
+        gateway=mock, store=FailingStore(), model="m"
+    )
+
+    with caplog.at_level(logging.WARNING):
+        result = await cached.embed_many(["a", "bb"])
+
+    assert result == [[1.0, 1.0, 2.0], [2.0, 1.0, 2.0]]
+    assert "Embedding store lookup failed" in caplog.text
+    assert "Embedding store write failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_persists_across_instances(tmp_path) -> None:
+    """Vectors written by one process-local store are read by the next."""
+    path = tmp_path / "cache.sqlite3"
+    first = SqliteEmbeddingStore(path)
+    await first.put_many("m", {"d1": [0.5, -1.25], "d2": [2.0, 3.0]})
+    await first.put_many("m", {"d1": [9.0, 9.0]})
+    first.close()
+
+    second = SqliteEmbeddingStore(path)
+    found = await second.get_many("m", ["d1", "d3"])
+    second.close()
+
+    assert found == {"d1": [0.5, -1.25]}
+
+
+@pytest.mark.asyncio
+async def test_store_keeps_slices_embedded_before_a_failure() -> None:
+    """A retried call only embeds the slices a failed call did not finish."""
+    mock = MockGateway()
+    store = InMemoryEmbeddingStore()
+    cached = CachedEmbeddingGateway(
+        gateway=mock, store=store, model="m", store_flush_size=2
+    )
+    sent: list[list[str]] = []
+    original = mock.embed_many
+    fail_on_call = 2
+
+    async def flaky(texts: list[str]) -> list[list[float]]:
+        sent.append(texts)
+        if len(sent) == fail_on_call:
+            raise ModelProviderError("Ollama unreachable")
+        return await original(texts)
+
+    mock.embed_many = flaky  # type: ignore[method-assign]
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    with pytest.raises(ModelProviderError):
+        await cached.embed_many(texts)
+
+    sent.clear()
+    fail_on_call = 0
+    result = await cached.embed_many(texts)
+
+    assert sent == [["ccc", "dddd"], ["eeeee"]]
+    assert [vector[0] for vector in result] == [1.0, 2.0, 3.0, 4.0, 5.0]
@@ -0,0 +1,41 @@
+"""Time-ordered entity identifiers."""
+
+import time
+import uuid
+
+import pytest
+
+from findocbot.domain import ids
+from findocbot.domain.entities import ChatTurn, Chunk, Document
+
+
+def test_factories_generate_uuid7_in_creation_order() -> None:
+    before = time.time_ns() // 1_000_000
+    created = [
+        Document.create("a.pdf").id,
+        Chunk.create(document_id="d", chunk_index=0, text="x").id,
+        ChatTurn.create(session_id="s", question="q", answer="a").id,
+    ]
+
+    parsed = [uuid.UUID(value) for value in created]
+    assert [value.version for value in parsed] == [7, 7, 7]
+    assert all(value.variant == uuid.RFC_4122 for value in parsed)
+    assert parsed == sorted(parsed)
+    assert parsed[0].int >> 80 >= before
+
+
+def test_ids_stay_increasing_when_the_clock_stalls_or_steps_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [time.time_ns() + 10**12]
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now[0])
+    # Restored on teardown, so later ids are not stamped in the future.
+    monkeypatch.setattr(ids, "_last_ms", ids._last_ms)
+    monkeypatch.setattr(ids, "_counter", ids._counter)
+
+    generated = [ids.uuid7() for _ in range(5000)]
+    now[0] -= 10**9
+    generated.extend(ids.uuid7() for _ in range(10))
+
+    assert generated == sorted(generated)
+    assert len(set(generated)) == len(generated)
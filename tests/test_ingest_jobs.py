@@ -0,0 +1,283 @@
+"""Asynchronous ingestion: job use cases, worker pool and job API."""
+
+import asyncio
+import io
+from dataclasses import replace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fpdf import FPDF
+
+from findocbot import main
+from findocbot.config import Settings
+from findocbot.domain.exceptions import UploadTooLargeError
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.container import AppContainer
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryHistoryRepository,
+    InMemoryIngestJobRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.ingest_worker import IngestWorkerPool
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.main import create_app
+from findocbot.use_cases.answer_question import AnswerQuestionUseCase
+from findocbot.use_cases.ingest_jobs import (
+    EnqueueUploadUseCase,
+    GetIngestJobUseCase,
+    ProcessIngestJobUseCase,
+)
+from findocbot.use_cases.search_similar_chunks import (
+    SearchSimilarChunksUseCase,
+)
+from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+
+
+class _FakeDB:
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class _Provider:
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {"answer": "ok", "confidence": "low"}
+
+
+def _build_pdf_bytes(text: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    if text:
+        pdf.multi_cell(0, 10, text=text)
+    return bytes(pdf.output())
+
+
+def _build_upload(
+    documents: InMemoryDocumentRepository,
+) -> UploadPDFUseCase:
+    return UploadPDFUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=120, overlap_ratio=0.1),
+        provider=_Provider(),
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, InMemoryChunkRepository()),
+    )
+
+
+async def test_process_job_records_document_and_stage_timings() -> None:
+    jobs = InMemoryIngestJobRepository()
+    documents = InMemoryDocumentRepository()
+    job = await EnqueueUploadUseCase(jobs).execute(
+        "report.pdf", _build_pdf_bytes("Revenue grew by 20 percent.")
+    )
+    process = ProcessIngestJobUseCase(jobs, _build_upload(documents))
+
+    assert await process.run_next() is True
+    assert await process.run_next() is False
+
+    done = await GetIngestJobUseCase(jobs).execute(job.id)
+    assert done is not None
+    assert done.status == "succeeded"
+    assert done.document_id in documents.items
+    assert done.attempts == 1
+    assert {"parse", "chunk", "embed", "persist"} <= set(done.stage_seconds)
+    assert job.id not in jobs.contents
+
+
+async def test_process_job_records_domain_failure() -> None:
+    jobs = InMemoryIngestJobRepository()
+    job = await EnqueueUploadUseCase(jobs).execute(
+        "blank.pdf", _build_pdf_bytes("")
+    )
+    process = ProcessIngestJobUseCase(
+        jobs, _build_upload(InMemoryDocumentRepository())
+    )
+
+    await process.run_next()
+
+    failed = jobs.items[job.id]
+    assert failed.status == "failed"
+    assert failed.error is not None
+    assert "does not contain text" in failed.error
+
+
+async def test_running_job_sends_heartbeats() -> None:
+    jobs = InMemoryIngestJobRepository()
+    job = await EnqueueUploadUseCase(jobs).execute(
+        "report.pdf", _build_pdf_bytes("Revenue grew by 20 percent.")
+    )
+    upload = _build_upload(InMemoryDocumentRepository())
+
+    class _SlowProvider(_Provider):
+        async def embed_many(self, texts: list[str]) -> list[list[float]]:
+            await asyncio.sleep(0.1)
+            return await super().embed_many(texts)
+
+    upload._provider = _SlowProvider()
+    process = ProcessIngestJobUseCase(jobs, upload, heartbeat_seconds=0.01)
+
+    await process.run_next()
+    beats = jobs.heartbeats[job.id]
+    await asyncio.sleep(0.05)
+
+    assert jobs.items[job.id].status == "succeeded"
+    assert beats >= 2
+    assert jobs.heartbeats[job.id] == beats
+
+
+async def test_enqueue_rejects_uploads_over_the_queue_limit() -> None:
+    jobs = InMemoryIngestJobRepository()
+    enqueue = EnqueueUploadUseCase(jobs, max_bytes=1024)
+
+    with pytest.raises(UploadTooLargeError, match="limited"):
+        await enqueue.execute("big.pdf", io.BytesIO(b"%" * 1025))
+    with pytest.raises(UploadTooLargeError):
+        await enqueue.execute("big.pdf", b"%" * 1025)
+    await enqueue.execute("small.pdf", io.BytesIO(b"%" * 1024))
+
+    assert [job.filename for job in jobs.items.values()] == ["small.pdf"]
+
+
+async def test_worker_pool_drains_queue_and_stops() -> None:
+    jobs = InMemoryIngestJobRepository()
+    enqueue = EnqueueUploadUseCase(jobs)
+    for index in range(3):
+        await enqueue.execute(
+            f"report-{index}.pdf", _build_pdf_bytes(f"Profit {index}.")
+        )
+    pool = IngestWorkerPool(
+        ProcessIngestJobUseCase(
+            jobs, _build_upload(InMemoryDocumentRepository())
+        ),
+        concurrency=2,
+        poll_interval_seconds=0.01,
+    )
+
+    await pool.start()
+    for _ in range(200):
+        if all(job.status == "succeeded" for job in jobs.items.values()):
+            break
+        await asyncio.sleep(0.01)
+    await pool.stop()
+
+    assert [job.status for job in jobs.items.values()] == ["succeeded"] * 3
+
+
+def _build_async_app(jobs: InMemoryIngestJobRepository) -> FastAPI:
+    documents = InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository()
+    provider = _Provider()
+    search_chunks = SearchSimilarChunksUseCase(
+        provider=provider, chunks=chunks
+    )
+    container = AppContainer(
+        settings=Settings(ingest_async=True),
+        db=_FakeDB(),  # type: ignore[arg-type]
+        provider=provider,
+        upload_pdf=_build_upload(documents),
+        search_chunks=search_chunks,
+        answer_question=AnswerQuestionUseCase(
+            provider=provider,
+            search_use_case=search_chunks,
+            history=InMemoryHistoryRepository(),
+        ),
+        enqueue_upload=EnqueueUploadUseCase(jobs),
+        get_ingest_job=GetIngestJobUseCase(jobs),
+    )
+    return create_app(container=container)
+
+
+async def test_async_upload_returns_202_and_job_is_queryable() -> None:
+    jobs = InMemoryIngestJobRepository()
+    transport = httpx.ASGITransport(app=_build_async_app(jobs))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            "/documents/upload",
+            files={
+                "file": (
+                    "report.pdf",
+                    _build_pdf_bytes("Revenue grew."),
+                    "application/pdf",
+                )
+            },
+        )
+        assert resp.status_code == 202
+        job_id = resp.json()["job_id"]
+        assert resp.json()["status"] == "queued"
+
+        status_resp = await client.get(f"/documents/jobs/{job_id}")
+        assert status_resp.status_code == 200
+        assert status_resp.json()["filename"] == "report.pdf"
+
+        missing = await client.get("/documents/jobs/unknown")
+        assert missing.status_code == 404
+
+
+async def test_reclaimed_job_keeps_the_new_attempt_state() -> None:
+    jobs = InMemoryIngestJobRepository()
+    job = await EnqueueUploadUseCase(jobs).execute(
+        "report.pdf", _build_pdf_bytes("Revenue grew by 20 percent.")
+    )
+    upload = _build_upload(InMemoryDocumentRepository())
+
+    class _StallingProvider(_Provider):
+        async def embed_many(self, texts: list[str]) -> list[list[float]]:
+            # Another worker reclaims the job while this one is stuck.
+            running = jobs.items[job.id]
+            jobs.items[job.id] = replace(
+                running, attempts=running.attempts + 1
+            )
+            return await super().embed_many(texts)
+
+    upload._provider = _StallingProvider()
+
+    await ProcessIngestJobUseCase(jobs, upload).run_next()
+
+    reclaimed = jobs.items[job.id]
+    assert reclaimed.status == "running"
+    assert reclaimed.attempts == 2
+    assert reclaimed.document_id is None
+    assert job.id in jobs.contents
+
+
+class _ContainerBuiltError(Exception):
+    pass
+
+
+def test_worker_entrypoint_runs_a_consumer_when_the_api_runs_none(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    built: list[Settings] = []
+
+    def capture(settings: Settings) -> AppContainer:
+        built.append(settings)
+        raise _ContainerBuiltError
+
+    monkeypatch.setattr(main, "create_container", capture)
+    with pytest.raises(_ContainerBuiltError):
+        asyncio.run(main.run_worker(Settings(ingest_workers=0)))
+
+    assert built[0].ingest_async is True
+    assert built[0].ingest_workers == 1
+    with pytest.raises(SystemExit):
+        main.run(["worker", "--concurrency", "0"])
@@ -0,0 +1,175 @@
+"""Streaming ingestion mode of UploadPDFUseCase."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import pytest
+from fpdf import FPDF
+
+from findocbot.domain.exceptions import EmptyDocumentError, ModelProviderError
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.ports import TransactionScope
+from findocbot.use_cases.upload_pdf import (
+    IngestPipelineOptions,
+    UploadPDFUseCase,
+)
+
+
+class _Provider:
+    def __init__(self, fail_on_call: int | None = None) -> None:
+        self.fail_on_call = fail_on_call
+        self.batch_sizes: list[int] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [float(len(text)), 1.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.batch_sizes.append(len(texts))
+        if len(self.batch_sizes) == self.fail_on_call:
+            raise ModelProviderError("Ollama is down")
+        return [[float(len(t)), 1.0] for t in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+class _TrackingUnitOfWork(InMemoryUnitOfWork):
+    open = False
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[TransactionScope]:
+        self.open = True
+        try:
+            async with super().begin() as tx:
+                yield tx
+        finally:
+            self.open = False
+
+
+def _build_pdf_bytes(pages: list[str]) -> bytes:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=10)
+    for text in pages:
+        pdf.add_page()
+        pdf.multi_cell(0, 5, text=text)
+    return bytes(pdf.output())
+
+
+def _multi_page_pdf() -> bytes:
+    return _build_pdf_bytes([
+        f"Section {page}\n\n"
+        + " ".join(f"revenue{page}x{word}" for word in range(90))
+        for page in range(6)
+    ])
+
+
+def _build(
+    provider: _Provider,
+    pipeline: IngestPipelineOptions | None,
+) -> tuple[
+    UploadPDFUseCase, InMemoryDocumentRepository, InMemoryChunkRepository
+]:
+    documents = InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository()
+    upload = UploadPDFUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=60, overlap_ratio=0.1),
+        provider=provider,
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
+        pipeline=pipeline,
+    )
+    return upload, documents, chunks
+
+
+async def test_pipelined_upload_matches_sequential_upload() -> None:
+    pdf_bytes = _multi_page_pdf()
+    sequential, _, sequential_chunks = _build(_Provider(), None)
+    provider = _Provider()
+    pipelined, documents, pipelined_chunks = _build(
+        provider,
+        IngestPipelineOptions(
+            embed_batch_size=4, persist_batch_size=6, queue_size=1
+        ),
+    )
+
+    await sequential.execute("report.pdf", pdf_bytes)
+    document = await pipelined.execute("report.pdf", pdf_bytes)
+
+    assert list(documents.items) == [document.id]
+    assert [
+        (s.chunk.chunk_index, s.chunk.text, s.chunk.section, s.embedding)
+        for s in pipelined_chunks.items
+    ] == [
+        (s.chunk.chunk_index, s.chunk.text, s.chunk.section, s.embedding)
+        for s in sequential_chunks.items
+    ]
+    assert len(provider.batch_sizes) > 1
+    assert max(provider.batch_sizes) <= 4
+
+
+async def test_pipelined_upload_embeds_before_opening_the_transaction() -> (
+    None
+):
+    documents = InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository()
+    unit_of_work = _TrackingUnitOfWork(documents, chunks)
+    open_while_embedding: list[bool] = []
+
+    class _Watching(_Provider):
+        async def embed_many(self, texts: list[str]) -> list[list[float]]:
+            open_while_embedding.append(unit_of_work.open)
+            return await super().embed_many(texts)
+
+    provider = _Watching()
+    upload = UploadPDFUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=60, overlap_ratio=0.1),
+        provider=provider,
+        documents=documents,
+        unit_of_work=unit_of_work,
+        pipeline=IngestPipelineOptions(embed_batch_size=2, queue_size=1),
+    )
+
+    await upload.execute("report.pdf", _multi_page_pdf())
+
+    assert len(open_while_embedding) > 1
+    assert not any(open_while_embedding)
+    assert len(chunks.items) == sum(provider.batch_sizes)
+
+
+async def test_pipelined_upload_failure_removes_partial_document() -> None:
+    upload, documents, _ = _build(
+        _Provider(fail_on_call=3),
+        IngestPipelineOptions(
+            embed_batch_size=2, persist_batch_size=2, queue_size=1
+        ),
+    )
+
+    with pytest.raises(ModelProviderError):
+        await upload.execute("report.pdf", _multi_page_pdf())
+
+    assert documents.items == {}
+
+
+async def test_pipelined_upload_blank_pdf_raises_empty_document() -> None:
+    pdf = FPDF()
+    pdf.add_page()
+    upload, documents, _ = _build(_Provider(), IngestPipelineOptions())
+
+    with pytest.raises(EmptyDocumentError):
+        await upload.execute("blank.pdf", bytes(pdf.output()))
+
+    assert documents.items == {}
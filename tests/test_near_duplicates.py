@@ -0,0 +1,282 @@
+"""Near-duplicate chunk detection with MinHash at ingest."""
+
+import io
+
+from fpdf import FPDF
+
+from findocbot.domain.entities import Chunk
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.minhash import MinHashDetector
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
+from findocbot.use_cases.dto import IngestStats
+from findocbot.use_cases.near_duplicates import NearDuplicateFilter
+from findocbot.use_cases.ports import SearchFilters
+from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+
+SAFE_HARBOR = (
+    "This report contains forward-looking statements within the meaning "
+    "of the Private Securities Litigation Reform Act. Actual results may "
+    "differ materially from those expressed or implied by such statements "
+    "due to risks and uncertainties described under Risk Factors, and the "
+    "company undertakes no obligation to update them. Page {page}"
+)
+
+
+class _RecordingProvider:
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+def _chunk(text: str, index: int = 0, document_id: str = "d") -> Chunk:
+    return Chunk.create(document_id=document_id, chunk_index=index, text=text)
+
+
+def _build_pdf_bytes(paragraphs: list[str]) -> bytes:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for paragraph in paragraphs:
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text=paragraph)
+    return bytes(pdf.output())
+
+
+def test_detector_ignores_page_numbers_but_not_figures() -> None:
+    detector = MinHashDetector()
+    first = SAFE_HARBOR.format(page=3)
+    footer = SAFE_HARBOR.format(page=41)
+    table = "Net revenue 2023 was 5.2 billion and operating margin 12.5%."
+    restated = "Net revenue 2024 was 5.6 billion and operating margin 12.5%."
+
+    assert detector.is_near_duplicate(
+        first, detector.sketch(first), footer, detector.sketch(footer)
+    )
+    assert not detector.is_near_duplicate(
+        table, detector.sketch(table), restated, detector.sketch(restated)
+    )
+    other = "Segment results are presented on a constant currency basis."
+    assert not detector.is_near_duplicate(
+        first, detector.sketch(first), other, detector.sketch(other)
+    )
+
+
+def test_detector_keeps_chunks_that_differ_by_a_small_amount() -> None:
+    detector = MinHashDetector()
+    body = (
+        "Consolidated revenue for the fiscal year was ${amount} million, "
+        "reflecting growth across all reportable segments and regions, as "
+        "discussed in the management commentary that follows this table."
+    )
+    first = body.format(amount=512)
+    second = body.format(amount=498)
+    footer = "Page 7\n" + first
+    moved = "Page 8\n" + first
+
+    assert not detector.is_near_duplicate(
+        first, detector.sketch(first), second, detector.sketch(second)
+    )
+    assert detector.is_near_duplicate(
+        footer, detector.sketch(footer), moved, detector.sketch(moved)
+    )
+
+
+def test_detector_compares_figures_on_their_own_lines() -> None:
+    detector = MinHashDetector()
+    table = (
+        "Revenue by region for the fiscal year, in millions of dollars\n"
+        "Americas\n{americas}\nEurope\n{europe}\nAsia Pacific\n120\n"
+        "Total reportable segments\n{total}"
+    )
+    first = table.format(americas=412, europe=318, total=850)
+    second = table.format(americas=455, europe=301, total=876)
+    footer = "- 14 -\n\n" + first
+    moved = "- 15 -\n\n" + first
+
+    assert not detector.is_near_duplicate(
+        first, detector.sketch(first), second, detector.sketch(second)
+    )
+    assert detector.is_near_duplicate(
+        footer, detector.sketch(footer), moved, detector.sketch(moved)
+    )
+
+
+async def test_link_policy_shares_vector_and_hides_duplicate() -> None:
+    chunks = InMemoryChunkRepository()
+    provider = _RecordingProvider()
+    near_duplicates = NearDuplicateFilter(MinHashDetector(), chunks)
+    first = await near_duplicates.session().embed(
+        provider, [_chunk(SAFE_HARBOR.format(page=1)), _chunk("Revenue.", 1)]
+    )
+    await first.save(chunks)
+    provider.embedded.clear()
+
+    again = await near_duplicates.session().embed(
+        provider,
+        [
+            _chunk(SAFE_HARBOR.format(page=9), document_id="e"),
+            _chunk(SAFE_HARBOR.format(page=10), 1, document_id="e"),
+        ],
+    )
+    await again.save(chunks)
+
+    assert provider.embedded == []
+    assert (again.embedded, again.linked, again.skipped) == (0, 2, 0)
+    canonical = first.chunks[0]
+    assert {c.canonical_chunk_id for c in again.chunks} == {canonical.id}
+    assert again.embeddings == [first.embeddings[0]] * 2
+    results = await chunks.search_by_embedding(first.embeddings[0], top_k=10)
+    assert [r.chunk.id for r in results] == [c.id for c in first.chunks]
+
+    await chunks.delete_chunks([canonical.id])
+    linked = await chunks.list_by_document("e")
+    assert [c.canonical_chunk_id for c in linked] == [None, None]
+
+
+async def test_scoped_search_finds_chunks_linked_to_another_document() -> None:
+    chunks = InMemoryChunkRepository()
+    provider = _RecordingProvider()
+    near_duplicates = NearDuplicateFilter(MinHashDetector(), chunks)
+    first = await near_duplicates.session().embed(
+        provider, [_chunk(SAFE_HARBOR.format(page=1))]
+    )
+    await first.save(chunks)
+    again = await near_duplicates.session().embed(
+        provider,
+        [
+            _chunk(SAFE_HARBOR.format(page=9), document_id="e"),
+            _chunk(SAFE_HARBOR.format(page=10), 1, document_id="e"),
+        ],
+    )
+    await again.save(chunks)
+    query = first.embeddings[0]
+
+    scoped = await chunks.search_by_embedding(
+        query, top_k=10, filters=SearchFilters(document_ids=("e",))
+    )
+    both = await chunks.search_by_embedding(
+        query, top_k=10, filters=SearchFilters(document_ids=("d", "e"))
+    )
+
+    assert [r.chunk.id for r in scoped] == [again.chunks[0].id]
+    assert [r.chunk.id for r in both] == [first.chunks[0].id]
+
+
+async def test_skip_policy_drops_duplicates_within_one_batch() -> None:
+    chunks = InMemoryChunkRepository()
+    provider = _RecordingProvider()
+    near_duplicates = NearDuplicateFilter(
+        MinHashDetector(), chunks, policy="skip"
+    )
+    result = await near_duplicates.session().embed(
+        provider,
+        [
+            _chunk(SAFE_HARBOR.format(page=1)),
+            _chunk("Liquidity and capital resources.", 1),
+            _chunk(SAFE_HARBOR.format(page=2), 2),
+        ],
+    )
+
+    assert [c.chunk_index for c in result.chunks] == [0, 1]
+    assert len(provider.embedded) == 2
+    assert (result.linked, result.skipped) == (0, 1)
+    assert set(result.sketches) == {c.id for c in result.chunks}
+
+
+async def test_excluded_chunks_are_not_used_as_canonicals() -> None:
+    chunks = InMemoryChunkRepository()
+    provider = _RecordingProvider()
+    near_duplicates = NearDuplicateFilter(MinHashDetector(), chunks)
+    stored = await near_duplicates.session().embed(
+        provider, [_chunk(SAFE_HARBOR.format(page=1))]
+    )
+    await stored.save(chunks)
+
+    result = await near_duplicates.session(
+        exclude=[stored.chunks[0].id]
+    ).embed(provider, [_chunk(SAFE_HARBOR.format(page=2))])
+
+    assert result.linked == 0
+    assert result.embedded == 1
+
+
+async def test_uploads_link_boilerplate_across_documents() -> None:
+    documents = InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository()
+    provider = _RecordingProvider()
+    near_duplicates = NearDuplicateFilter(MinHashDetector(), chunks)
+    parser = PyPDFParser()
+    chunker = ParagraphTokenChunker(
+        chunk_tokens=60, overlap_ratio=0.1, min_chunk_tokens=5
+    )
+    upload = UploadPDFUseCase(
+        parser=parser,
+        chunker=chunker,
+        provider=provider,
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
+        near_duplicates=near_duplicates,
+    )
+    bulk = BulkUploadUseCase(
+        parser=parser,
+        chunker=chunker,
+        provider=provider,
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, chunks),
+        near_duplicates=near_duplicates,
+    )
+
+    await upload.execute(
+        "a.pdf",
+        _build_pdf_bytes([
+            SAFE_HARBOR.format(page=1),
+            "Alpha Corp grew revenue in every segment this year.",
+        ]),
+    )
+    provider.embedded.clear()
+    stats = IngestStats()
+    results = await bulk.execute(
+        [
+            (
+                f"{name}.pdf",
+                io.BytesIO(
+                    _build_pdf_bytes([
+                        SAFE_HARBOR.format(page=page),
+                        f"{name} Corp reduced its debt during the year.",
+                    ])
+                ),
+            )
+            for name, page in (("Beta", 7), ("Gamma", 8))
+        ],
+        stats=stats,
+    )
+
+    assert [item.status for item in results] == ["created", "created"]
+    assert stats.near_duplicates == 2
+    assert not any("Private Securities" in text for text in provider.embedded)
+    linked = [
+        item.chunk
+        for item in chunks.items
+        if item.chunk.canonical_chunk_id is not None
+    ]
+    assert len(linked) == 2
@@ -1,5 +1,6 @@
 """Tests for OllamaGateway with httpx mocked via respx."""
 
+import asyncio
 import json
 
 import httpx
@@ -7,7 +8,10 @@ import pytest
 import respx
 
 from findocbot.domain.exceptions import ModelProviderError
-from findocbot.infrastructure.ollama_gateway import OllamaGateway
+from findocbot.infrastructure.ollama_gateway import (
+    OllamaGateway,
+    _TokenBudget,
+)
 
 BASE_URL = "http://ollama.test:11434"
 
@@ -54,6 +58,166 @@ async def test_embed_many_batches_correctly(
         await gw.stop()
 
 
+@respx.mock
+async def test_embed_many_bounds_in_flight_batches_and_keeps_order() -> None:
+    """Concurrent batches never exceed max_in_flight; order is preserved."""
+    gw = OllamaGateway(
+        base_url=BASE_URL,
+        chat_model="test",
+        embed_model="test",
+        batch_size=2,
+        max_in_flight=3,
+    )
+    in_flight = 0
+    peak = 0
+
+    async def embed(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        inputs = json.loads(request.content)["input"]
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later batches finish first to prove reassembly by position.
+        await asyncio.sleep(0.05 / int(inputs[0]))
+        in_flight -= 1
+        return httpx.Response(
+            200, json={"embeddings": [[float(text)] for text in inputs]}
+        )
+
+    respx.post(f"{BASE_URL}/api/embed").mock(side_effect=embed)
+    await gw.start()
+    try:
+        texts = [str(i) for i in range(1, 12)]
+        result = await gw.embed_many(texts)
+    finally:
+        await gw.stop()
+    assert result == [[float(i)] for i in range(1, 12)]
+    assert peak == 3
+
+
+@respx.mock
+async def test_embed_many_failed_batch_cancels_the_rest() -> None:
+    """One failing batch raises and cancels batches still in flight."""
+    gw = OllamaGateway(
+        base_url=BASE_URL,
+        chat_model="test",
+        embed_model="test",
+        batch_size=1,
+        max_in_flight=4,
+    )
+    finished: list[str] = []
+
+    async def embed(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["input"][0]
+        if text == "bad":
+            return httpx.Response(500)
+        await asyncio.sleep(1)
+        finished.append(text)
+        return httpx.Response(200, json={"embeddings": [[0.0]]})
+
+    respx.post(f"{BASE_URL}/api/embed").mock(side_effect=embed)
+    await gw.start()
+    try:
+        with pytest.raises(ModelProviderError, match="HTTP 500"):
+            await gw.embed_many(["a", "bad", "c", "d"])
+    finally:
+        await gw.stop()
+    assert finished == []
+
+
+@respx.mock
+async def test_embed_many_packs_batches_by_token_budget() -> None:
+    """Dense texts get smaller batches than short ones under one budget."""
+    gw = OllamaGateway(
+        base_url=BASE_URL,
+        chat_model="test",
+        embed_model="test",
+        batch_size=50,
+        token_budget=10,
+    )
+    sent: list[list[str]] = []
+
+    def embed(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        sent.append(inputs)
+        return httpx.Response(200, json={"embeddings": [[0.0]] * len(inputs)})
+
+    respx.post(f"{BASE_URL}/api/embed").mock(side_effect=embed)
+    await gw.start()
+    try:
+        dense = "x" * 20  # ~6 tokens
+        await gw.embed_many([dense, "a", "b", "c", dense, dense])
+    finally:
+        await gw.stop()
+    assert sent == [[dense, "a", "b", "c"], [dense], [dense]]
+    stats = gw.get_stats()
+    assert stats.batches == 3
+    assert stats.items == 6
+    assert stats.token_budget == 10
+
+
+@respx.mock
+async def test_adaptive_batching_halves_and_retries_on_server_error() -> None:
+    """A 5xx shrinks the budget and the failed batch is retried in halves."""
+    gw = OllamaGateway(
+        base_url=BASE_URL,
+        chat_model="test",
+        embed_model="test",
+        batch_size=50,
+        token_budget=64,
+        adaptive_batching=True,
+    )
+    sizes: list[int] = []
+
+    def embed(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        sizes.append(len(inputs))
+        if len(inputs) > 2:
+            return httpx.Response(503)
+        return httpx.Response(
+            200, json={"embeddings": [[float(t)] for t in inputs]}
+        )
+
+    respx.post(f"{BASE_URL}/api/embed").mock(side_effect=embed)
+    await gw.start()
+    try:
+        result = await gw.embed_many(["1", "2", "3", "4"])
+    finally:
+        await gw.stop()
+    assert result == [[1.0], [2.0], [3.0], [4.0]]
+    assert sizes == [4, 2, 2]
+    stats = gw.get_stats()
+    assert stats.shrinks == 1
+    assert stats.batches == 2
+
+
+@respx.mock
+async def test_fixed_budget_does_not_retry_server_errors(
+    gateway: OllamaGateway,
+) -> None:
+    """Without adaptive batching a 5xx is surfaced unchanged."""
+    route = respx.post(f"{BASE_URL}/api/embed").mock(
+        return_value=httpx.Response(503)
+    )
+    with pytest.raises(ModelProviderError, match="HTTP 503"):
+        await gateway.embed_many(["a", "b"])
+    assert route.call_count == 1
+
+
+def test_token_budget_grows_only_while_per_token_latency_improves() -> None:
+    budget = _TokenBudget(initial=1000, adaptive=True)
+
+    budget.observe(tokens=100, seconds=1.0)
+    assert budget.current == 1250
+    budget.observe(tokens=200, seconds=2.0)  # same rate: hold
+    assert budget.current == 1250
+    budget.observe(tokens=200, seconds=1.0)
+    assert budget.current == 1562
+
+    budget.shrink()
+    assert budget.current == 781
+    assert budget.shrinks == 1
+
+
 @respx.mock
 async def test_embed_empty_list_returns_empty(
     gateway: OllamaGateway,
@@ -176,3 +340,70 @@ async def test_gateway_raises_if_not_started() -> None:
     )
     with pytest.raises(RuntimeError, match="not started"):
         await gw.embed_one("prompt")
+
+
+@respx.mock
+async def test_transient_failures_are_retried_per_batch() -> None:
+    """A failed batch is resent on its own; finished batches are kept."""
+    gw = OllamaGateway(
+        base_url=BASE_URL,
+        chat_model="test",
+        embed_model="test",
+        batch_size=2,
+        max_retries=2,
+        retry_backoff_seconds=0.0,
+    )
+    sent: list[list[str]] = []
+    failures = iter([
+        httpx.Response(503),
+        httpx.ConnectError("connection refused"),
+    ])
+
+    def embed(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        sent.append(inputs)
+        if inputs == ["c", "d"] and (failure := next(failures, None)):
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        return httpx.Response(
+            200, json={"embeddings": [[float(ord(t))] for t in inputs]}
+        )
+
+    respx.post(f"{BASE_URL}/api/embed").mock(side_effect=embed)
+    await gw.start()
+    try:
+        result = await gw.embed_many(["a", "b", "c", "d", "e"])
+    finally:
+        await gw.stop()
+    assert result == [[97.0], [98.0], [99.0], [100.0], [101.0]]
+    assert sent == [["a", "b"], ["c", "d"], ["c", "d"], ["c", "d"], ["e"]]
+    assert gw.get_stats().retries == 2
+
+
+@respx.mock
+async def test_retries_give_up_after_max_and_skip_client_errors() -> None:
+    """Retries are bounded, and 4xx other than 429 are not retried."""
+    gw = OllamaGateway(
+        base_url=BASE_URL,
+        chat_model="test",
+        embed_model="test",
+        max_retries=2,
+        retry_backoff_seconds=0.0,
+    )
+    route = respx.post(f"{BASE_URL}/api/embed").mock(
+        return_value=httpx.Response(500)
+    )
+    await gw.start()
+    try:
+        with pytest.raises(ModelProviderError, match="HTTP 500"):
+            await gw.embed_many(["a"])
+        assert route.call_count == 3
+
+        route.mock(return_value=httpx.Response(400))
+        route.reset()
+        with pytest.raises(ModelProviderError, match="HTTP 400"):
+            await gw.embed_many(["a"])
+        assert route.call_count == 1
+    finally:
+        await gw.stop()
@@ -1,6 +1,13 @@
+import tempfile
+import time
+
+import pytest
 from fpdf import FPDF
 
+from findocbot.domain.exceptions import UnreadableDocumentError
+from findocbot.infrastructure import sandboxed_pdf_parser
 from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.infrastructure.sandboxed_pdf_parser import SandboxedPDFParser
 
 
 def _build_pdf_bytes(text: str) -> bytes:
@@ -16,6 +23,20 @@ def _build_pdf_bytes(text: str) -> bytes:
     return data.encode("latin-1")
 
 
+def _count_spawns(
+    monkeypatch: pytest.MonkeyPatch, parser: SandboxedPDFParser
+) -> list[int]:
+    spawned = [0]
+    spawn = parser._spawn_worker
+
+    def counting_spawn() -> sandboxed_pdf_parser._SandboxWorker:
+        spawned[0] += 1
+        return spawn()
+
+    monkeypatch.setattr(parser, "_spawn_worker", counting_spawn)
+    return spawned
+
+
 def test_pdf_parser_extracts_text() -> None:
     parser = PyPDFParser()
     pdf_bytes = _build_pdf_bytes("Revenue increased by 12% in Q4.")
@@ -23,3 +44,144 @@ def test_pdf_parser_extracts_text() -> None:
     extracted = parser.extract_text(pdf_bytes)
 
     assert "Revenue increased by 12% in Q4." in extracted
+
+
+def test_pdf_parser_parallel_mode_keeps_page_order() -> None:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for page in range(7):
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text=f"Page {page} net income was {page}0.")
+    pdf_bytes = bytes(pdf.output())
+
+    serial = list(PyPDFParser().iter_pages(pdf_bytes))
+    parser = PyPDFParser(workers=2, parallel_min_pages=1)
+    try:
+        parallel = list(parser.iter_pages(pdf_bytes))
+        pool = parser._pool
+        # The workers outlive the document and take the next one.
+        other = list(parser.iter_pages(_build_pdf_bytes("Other filing.")))
+        assert list(parser.iter_pages(pdf_bytes)) == parallel
+        assert parser._pool is pool is not None
+    finally:
+        parser.stop()
+
+    assert parser._pool is None
+    assert parallel == serial
+    assert other == ["Other filing."]
+    assert all(f"Page {page} " in text for page, text in enumerate(parallel))
+
+
+def test_pdf_parser_reads_spooled_file_in_place() -> None:
+    pdf_bytes = _build_pdf_bytes("Operating margin widened to 18%.")
+    spooled = tempfile.SpooledTemporaryFile(max_size=16)  # rolled to disk
+    spooled.write(pdf_bytes)
+
+    # Position is irrelevant: the parser rewinds file objects.
+    assert list(PyPDFParser().iter_pages(spooled)) == list(
+        PyPDFParser().iter_pages(pdf_bytes)
+    )
+    spooled.close()
+
+
+def test_sandboxed_parser_matches_in_process_parser() -> None:
+    pdf_bytes = _build_pdf_bytes("Free cash flow reached 4.2bn.")
+    parser = SandboxedPDFParser(workers=1)
+    try:
+        assert list(parser.iter_pages(pdf_bytes)) == list(
+            PyPDFParser().iter_pages(pdf_bytes)
+        )
+    finally:
+        parser.stop()
+
+
+def test_sandboxed_parser_rejects_malformed_pdf_and_keeps_working(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    parser = SandboxedPDFParser(workers=1)
+    spawned = _count_spawns(monkeypatch, parser)
+    try:
+        with pytest.raises(UnreadableDocumentError, match="malformed"):
+            parser.extract_text(b"not a pdf at all")
+
+        text = parser.extract_text(_build_pdf_bytes("Dividend of 1.10."))
+        assert "Dividend of 1.10." in text
+        assert spawned[0] == 1  # the worker survived the bad input
+    finally:
+        parser.stop()
+
+
+def test_sandboxed_parser_kills_worker_past_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pdf_bytes = _build_pdf_bytes("Guidance unchanged.")
+    parser = SandboxedPDFParser(workers=1, timeout_seconds=1e-9)
+    spawned = _count_spawns(monkeypatch, parser)
+    try:
+        with pytest.raises(UnreadableDocumentError, match="exceeded"):
+            parser.extract_text(pdf_bytes)
+
+        parser._timeout = 60.0
+        assert "Guidance unchanged." in parser.extract_text(pdf_bytes)
+        assert spawned[0] == 2
+    finally:
+        parser.stop()
+
+
+def test_sandboxed_parser_does_not_count_consumer_time(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for page in range(3):
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text=f"Segment {page} revenue grew.")
+    elapsed = [0.0]
+    monkeypatch.setattr(
+        sandboxed_pdf_parser.time,
+        "monotonic",
+        lambda: time.perf_counter() + elapsed[0],
+    )
+    parser = SandboxedPDFParser(workers=1, timeout_seconds=30.0)
+    try:
+        pages = []
+        for text in parser.iter_pages(bytes(pdf.output())):
+            # The consumer holds each page longer than the whole budget.
+            elapsed[0] += 60.0
+            pages.append(text)
+        assert len(pages) == 3
+    finally:
+        parser.stop()
+
+
+def test_sandboxed_parser_recycles_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pdf_bytes = _build_pdf_bytes("Capex fell 3%.")
+    parser = SandboxedPDFParser(workers=1, recycle_after=1)
+    spawned = _count_spawns(monkeypatch, parser)
+    try:
+        parser.extract_text(pdf_bytes)
+        parser.extract_text(pdf_bytes)
+        assert spawned[0] == 2
+    finally:
+        parser.stop()
+
+
+def test_sandboxed_parser_replaces_worker_that_died_while_idle(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pdf_bytes = _build_pdf_bytes("Net debt fell.")
+    parser = SandboxedPDFParser(workers=1)
+    spawned = _count_spawns(monkeypatch, parser)
+    try:
+        parser.extract_text(pdf_bytes)
+        idle = parser._idle.get_nowait()
+        idle.process.kill()  # e.g. picked by the OOM killer
+        idle.process.join()
+        parser._idle.put(idle)
+
+        assert "Net debt fell." in parser.extract_text(pdf_bytes)
+        assert spawned[0] == 2
+    finally:
+        parser.stop()
@@ -5,18 +5,27 @@ Run with: pytest --integration
 """
 
 import asyncio
+from dataclasses import replace
 
 import asyncpg
 import pytest
 from testcontainers.postgres import PostgresContainer
 
-from findocbot.domain.entities import ChatTurn, Chunk, Document
+from findocbot.domain.entities import ChatTurn, Chunk, Document, IngestJob
+from findocbot.domain.exceptions import DuplicateDocumentError
 from findocbot.infrastructure.db import PostgresPool
 from findocbot.infrastructure.postgres_repositories import (
+    DocumentTextCache,
     PostgresChatHistoryRepository,
     PostgresChunkRepository,
     PostgresDocumentRepository,
+    PostgresDocumentTextStore,
+    PostgresEmbeddingStore,
+    PostgresIngestJobRepository,
+    PostgresPageTextStore,
+    PostgresUnitOfWork,
 )
+from findocbot.use_cases.ports import MinHashSketch, SearchFilters
 
 pytestmark = pytest.mark.integration
 
@@ -26,7 +35,15 @@ CREATE EXTENSION IF NOT EXISTS vector;
 CREATE TABLE IF NOT EXISTS documents (
     id UUID PRIMARY KEY,
     filename TEXT NOT NULL,
-    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    content_sha256 TEXT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS document_aliases (
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (document_id, filename)
 );
 
 CREATE TABLE IF NOT EXISTS chunks (
@@ -34,10 +51,47 @@ CREATE TABLE IF NOT EXISTS chunks (
     document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
     chunk_index INTEGER NOT NULL,
     section TEXT NULL,
-    content TEXT NOT NULL,
-    embedding VECTOR(768) NOT NULL
+    content TEXT NULL,
+    embedding VECTOR(768) NOT NULL,
+    canonical_chunk_id UUID NULL
+        REFERENCES chunks(id) ON DELETE SET NULL DEFERRABLE INITIALLY DEFERRED,
+    span_start INTEGER NULL,
+    span_end INTEGER NULL,
+    CONSTRAINT chunks_content_or_span
+        CHECK (content IS NOT NULL OR span_start IS NOT NULL)
 );
 
+-- migrations/optional/halfvec_embeddings.sql, for the halfvec tests.
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS embedding_half HALFVEC(768) NULL;
+
+CREATE OR REPLACE FUNCTION chunks_sync_embedding_half() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.embedding_half := NEW.embedding::HALFVEC(768);
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER trg_chunks_embedding_half
+    BEFORE INSERT OR UPDATE OF embedding ON chunks
+    FOR EACH ROW EXECUTE FUNCTION chunks_sync_embedding_half();
+
+CREATE TABLE IF NOT EXISTS document_texts (
+    document_id UUID PRIMARY KEY REFERENCES documents(id) ON DELETE CASCADE,
+    text_sha256 TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    content BYTEA NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chunk_minhash (
+    chunk_id UUID PRIMARY KEY REFERENCES chunks(id) ON DELETE CASCADE,
+    signature BIGINT[] NOT NULL,
+    band_keys BIGINT[] NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_minhash_band_keys
+    ON chunk_minhash USING gin (band_keys);
+
 CREATE TABLE IF NOT EXISTS chat_turns (
     id UUID PRIMARY KEY,
     session_id TEXT NOT NULL,
@@ -45,6 +99,37 @@ CREATE TABLE IF NOT EXISTS chat_turns (
     answer TEXT NOT NULL,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
+
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id UUID PRIMARY KEY,
+    filename TEXT NOT NULL,
+    content BYTEA NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    document_id UUID NULL REFERENCES documents(id) ON DELETE SET NULL,
+    error TEXT NULL,
+    stage_seconds JSONB NOT NULL DEFAULT '{}'::jsonb,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ NULL,
+    finished_at TIMESTAMPTZ NULL,
+    heartbeat_at TIMESTAMPTZ NULL
+);
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,
+    text_sha256 TEXT NOT NULL,
+    embedding VECTOR(768) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (model, text_sha256)
+);
+
+CREATE TABLE IF NOT EXISTS page_texts (
+    content_sha256 TEXT PRIMARY KEY
+        REFERENCES documents(content_sha256) ON DELETE CASCADE,
+    page_count INTEGER NOT NULL,
+    pages BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
 """
 
 
@@ -81,7 +166,10 @@ async def db_pool(pg_dsn: str) -> PostgresPool:
     pool = PostgresPool(pg_dsn)
     await pool.start()
     # The container is module-scoped; wipe data so tests stay independent.
-    await pool.pool.execute("TRUNCATE chunks, documents, chat_turns")
+    await pool.pool.execute(
+        "TRUNCATE ingest_jobs, document_aliases, chunk_minhash, chunks, "
+        "document_texts, documents, chat_turns, embedding_cache, page_texts"
+    )
     yield pool
     await pool.stop()
 
@@ -100,6 +188,30 @@ async def test_document_create_and_retrieve(db_pool: PostgresPool) -> None:
     assert row["filename"] == "test.pdf"
 
 
+@pytest.mark.asyncio
+async def test_document_digest_is_unique(db_pool: PostgresPool) -> None:
+    """A second document with the same digest is rejected and found."""
+    repo = PostgresDocumentRepository(db_pool)
+    doc = Document.create(filename="10-K.pdf", content_sha256="ab" * 32)
+    await repo.create(doc)
+
+    with pytest.raises(DuplicateDocumentError):
+        await repo.create(
+            Document.create(filename="copy.pdf", content_sha256="ab" * 32)
+        )
+    await repo.add_alias(doc.id, "copy.pdf")
+    await repo.add_alias(doc.id, "copy.pdf")
+
+    found = await repo.get_by_digest("ab" * 32)
+    assert found is not None
+    assert found.id == doc.id
+    aliases = await db_pool.pool.fetch(
+        "SELECT filename FROM document_aliases WHERE document_id = $1",
+        doc.id,
+    )
+    assert [row["filename"] for row in aliases] == ["copy.pdf"]
+
+
 @pytest.mark.asyncio
 async def test_chunk_insert_and_search(db_pool: PostgresPool) -> None:
     """Chunks with embeddings can be persisted and searched by vector."""
@@ -130,6 +242,117 @@ async def test_chunk_insert_and_search(db_pool: PostgresPool) -> None:
     assert isinstance(results[0].chunk.document_id, str)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exact_search_max_rows", [0, 10_000])
+async def test_filtered_search_exact_and_hnsw_plans(
+    db_pool: PostgresPool, exact_search_max_rows: int
+) -> None:
+    """Both plans return the filtered top-k, not post-filtered HNSW hits."""
+    repo = PostgresChunkRepository(
+        db_pool, exact_search_max_rows=exact_search_max_rows
+    )
+    doc_repo = PostgresDocumentRepository(db_pool)
+    target = Document.create(filename="target.pdf")
+    others = [Document.create(filename=f"other-{i}.pdf") for i in range(3)]
+    for doc in [target, *others]:
+        await doc_repo.create(doc)
+    query = [1.0] + [0.0] * 767
+    for doc in others:
+        await repo.add_chunks_with_embeddings(
+            [
+                Chunk.create(document_id=doc.id, chunk_index=i, text="close")
+                for i in range(50)
+            ],
+            [query] * 50,
+        )
+    far = [0.2, 1.0] + [0.0] * 766
+    await repo.add_chunks_with_embeddings(
+        [
+            Chunk.create(
+                document_id=target.id,
+                chunk_index=i,
+                text=f"target {i}",
+                section="Section 7 Liquidity" if i == 2 else "Section 1",
+            )
+            for i in range(3)
+        ],
+        [far] * 3,
+    )
+
+    by_document = await repo.search_by_embedding(
+        query, top_k=2, filters=SearchFilters(document_ids=(target.id,))
+    )
+    by_section = await repo.search_by_embedding(
+        query,
+        top_k=5,
+        filters=SearchFilters(
+            document_ids=(target.id, "not-a-uuid"), section="section 7"
+        ),
+    )
+
+    assert [r.chunk.document_id for r in by_document] == [target.id] * 2
+    assert [r.chunk.text for r in by_section] == ["target 2"]
+
+
+@pytest.mark.asyncio
+async def test_ef_search_is_local_and_never_below_top_k(
+    db_pool: PostgresPool,
+) -> None:
+    """ef_search is raised to top_k and reset when the query commits."""
+    repo = PostgresChunkRepository(db_pool, ef_search=1)
+    doc = Document.create(filename="report.pdf")
+    await PostgresDocumentRepository(db_pool).create(doc)
+    await repo.add_chunks_with_embeddings(
+        [
+            Chunk.create(document_id=doc.id, chunk_index=i, text=str(i))
+            for i in range(5)
+        ],
+        [[float(i + 1)] + [1.0] * 767 for i in range(5)],
+    )
+
+    results = await repo.search_by_embedding([1.0] * 768, top_k=3)
+    wider = await repo.search_by_embedding([1.0] * 768, top_k=3, ef_search=100)
+
+    assert len(results) == len(wider) == 3
+    async with db_pool.pool.acquire() as conn:
+        # Loading pgvector registers its settings in this session.
+        await conn.execute("SELECT '[1]'::vector")
+        assert await conn.fetchval("SHOW hnsw.ef_search") == "40"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rerank_factor", [1, 4])
+async def test_halfvec_search_with_full_precision_rerank(
+    db_pool: PostgresPool, rerank_factor: int
+) -> None:
+    """The trigger fills embedding_half; reranked scores are exact."""
+    full = PostgresChunkRepository(db_pool)
+    half = PostgresChunkRepository(
+        db_pool, embedding_index="halfvec", rerank_factor=rerank_factor
+    )
+    doc = Document.create(filename="report.pdf")
+    await PostgresDocumentRepository(db_pool).create(doc)
+    await full.add_chunks_with_embeddings(
+        [
+            Chunk.create(document_id=doc.id, chunk_index=i, text=str(i))
+            for i in range(4)
+        ],
+        [[1.0, 0.1 * i + 0.0001] + [0.0] * 766 for i in range(4)],
+    )
+    query = [1.0] + [0.0] * 767
+
+    expected = await full.search_by_embedding(query, top_k=2)
+    results = await half.search_by_embedding(query, top_k=2)
+
+    missing = await db_pool.pool.fetchval(
+        "SELECT count(*) FROM chunks WHERE embedding_half IS NULL"
+    )
+    assert missing == 0
+    assert [r.chunk.id for r in results] == [r.chunk.id for r in expected]
+    if rerank_factor > 1:
+        assert [r.score for r in results] == [r.score for r in expected]
+
+
 @pytest.mark.asyncio
 async def test_chat_history_add_and_list(db_pool: PostgresPool) -> None:
     """Chat turns are persisted and listed in chronological order."""
@@ -148,6 +371,60 @@ async def test_chat_history_add_and_list(db_pool: PostgresPool) -> None:
     assert isinstance(recent[0].id, str)
 
 
+@pytest.mark.asyncio
+async def test_chunk_bulk_load_spans_copy_sub_batches(
+    db_pool: PostgresPool,
+) -> None:
+    """Chunks split across several COPY batches all land with vectors."""
+    doc = Document.create(filename="filing.pdf")
+    await PostgresDocumentRepository(db_pool).create(doc)
+    repo = PostgresChunkRepository(db_pool, copy_batch_size=2)
+    chunks = [
+        Chunk.create(document_id=doc.id, chunk_index=i, text=f"chunk {i}")
+        for i in range(5)
+    ]
+    embeddings = [[float(i)] + [0.0] * 767 for i in range(5)]
+
+    await repo.add_chunks_with_embeddings(chunks, embeddings)
+    await repo.add_chunks_with_embeddings([], [])
+
+    rows = await db_pool.pool.fetch(
+        """
+        SELECT chunk_index, (embedding::real[])[1] AS first
+        FROM chunks
+        WHERE document_id = $1
+        ORDER BY chunk_index
+        """,
+        doc.id,
+    )
+    assert [(row["chunk_index"], row["first"]) for row in rows] == [
+        (i, float(i)) for i in range(5)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_document_with_chunks(
+    db_pool: PostgresPool,
+) -> None:
+    """A failure inside the unit of work leaves neither rows nor chunks."""
+    doc = Document.create(filename="report.pdf")
+    chunk = Chunk.create(document_id=doc.id, chunk_index=0, text="Revenue")
+
+    with pytest.raises(RuntimeError):
+        async with PostgresUnitOfWork(db_pool).begin() as tx:
+            await tx.documents.create(doc)
+            await tx.chunks.add_chunks_with_embeddings([chunk], [[0.1] * 768])
+            raise RuntimeError("embedding stage failed")
+
+    assert await db_pool.pool.fetchval("SELECT COUNT(*) FROM documents") == 0
+    assert await db_pool.pool.fetchval("SELECT COUNT(*) FROM chunks") == 0
+
+    async with PostgresUnitOfWork(db_pool).begin() as tx:
+        await tx.documents.create(doc)
+        await tx.chunks.add_chunks_with_embeddings([chunk], [[0.1] * 768])
+    assert await db_pool.pool.fetchval("SELECT COUNT(*) FROM chunks") == 1
+
+
 @pytest.mark.asyncio
 async def test_search_empty_when_no_chunks(
     db_pool: PostgresPool,
@@ -156,3 +433,300 @@ async def test_search_empty_when_no_chunks(
     repo = PostgresChunkRepository(db_pool)
     results = await repo.search_by_embedding([1.0] * 768, top_k=5)
     assert results == []
+
+
+@pytest.mark.asyncio
+async def test_ingest_job_claims_are_exclusive(db_pool: PostgresPool) -> None:
+    """Concurrent claims never hand the same job to two workers."""
+    repo = PostgresIngestJobRepository(db_pool, stale_after_seconds=600)
+    for index in range(3):
+        await repo.enqueue(IngestJob.create(f"{index}.pdf"), b"%PDF")
+
+    claims = await asyncio.gather(*(repo.claim_next() for _ in range(5)))
+
+    claimed = [claim for claim in claims if claim is not None]
+    assert len(claimed) == 3
+    assert len({job.id for job, _ in claimed}) == 3
+    assert all(content == b"%PDF" for _, content in claimed)
+
+
+@pytest.mark.asyncio
+async def test_ingest_job_reclaims_stop_after_max_attempts(
+    db_pool: PostgresPool,
+) -> None:
+    """A job whose worker keeps dying is failed, not reclaimed forever."""
+    repo = PostgresIngestJobRepository(
+        db_pool, stale_after_seconds=0, max_attempts=2
+    )
+    job = IngestJob.create("crash.pdf")
+    await repo.enqueue(job, b"%PDF")
+
+    first = await repo.claim_next()
+    await repo.heartbeat(job.id)
+    second = await repo.claim_next()
+
+    assert first is not None and first[0].attempts == 1
+    assert second is not None and second[0].attempts == 2
+    assert await repo.claim_next() is None
+    failed = await repo.get(job.id)
+    assert failed is not None
+    assert failed.status == "failed"
+    assert failed.error is not None and "2 attempts" in failed.error
+
+
+@pytest.mark.asyncio
+async def test_ingest_job_ignores_results_of_a_reclaimed_attempt(
+    db_pool: PostgresPool,
+) -> None:
+    """A worker that lost its claim cannot overwrite the new run."""
+    repo = PostgresIngestJobRepository(db_pool, stale_after_seconds=0)
+    job = IngestJob.create("slow.pdf")
+    await repo.enqueue(job, b"%PDF")
+    await repo.claim_next()
+    await repo.claim_next()
+
+    assert not await repo.fail(job.id, 1, "Stale worker.", {})
+
+    loaded = await repo.get(job.id)
+    assert loaded is not None
+    assert loaded.status == "running"
+    assert loaded.attempts == 2
+    assert loaded.error is None
+
+
+@pytest.mark.asyncio
+async def test_ingest_job_heartbeat_prevents_reclaim(
+    db_pool: PostgresPool,
+) -> None:
+    """Only jobs without a recent heartbeat are reclaimed."""
+    repo = PostgresIngestJobRepository(db_pool, stale_after_seconds=60)
+    job = IngestJob.create("slow.pdf")
+    await repo.enqueue(job, b"%PDF")
+    await repo.claim_next()
+    await db_pool.pool.execute(
+        "UPDATE ingest_jobs SET started_at = NOW() - interval '1 hour', "
+        "heartbeat_at = NOW() - interval '1 hour'"
+    )
+
+    await repo.heartbeat(job.id)
+
+    assert await repo.claim_next() is None
+
+
+@pytest.mark.asyncio
+async def test_ingest_job_completion_round_trip(db_pool: PostgresPool) -> None:
+    """Completed jobs expose document id and timings; bytes are dropped."""
+    doc = Document.create(filename="report.pdf")
+    await PostgresDocumentRepository(db_pool).create(doc)
+    repo = PostgresIngestJobRepository(db_pool, stale_after_seconds=600)
+    job = IngestJob.create("report.pdf")
+    await repo.enqueue(job, b"%PDF")
+    await repo.claim_next()
+
+    assert await repo.complete(job.id, 1, doc.id, {"parse": 0.5})
+
+    loaded = await repo.get(job.id)
+    assert loaded is not None
+    assert loaded.status == "succeeded"
+    assert loaded.document_id == doc.id
+    assert loaded.stage_seconds == {"parse": 0.5}
+    assert loaded.finished_at is not None
+    assert await repo.get("not-a-uuid") is None
+    content = await db_pool.pool.fetchval(
+        "SELECT content FROM ingest_jobs WHERE id = $1", job.id
+    )
+    assert content is None
+
+
+@pytest.mark.asyncio
+async def test_embedding_store_round_trip(db_pool: PostgresPool) -> None:
+    """Stored vectors are returned per model; re-puts keep the original."""
+    store = PostgresEmbeddingStore(db_pool)
+    vector = [0.5] * 768
+
+    await store.put_many("m1", {"a" * 64: vector})
+    await store.put_many("m1", {"a" * 64: [0.25] * 768})
+
+    assert await store.get_many("m1", ["a" * 64, "b" * 64]) == {
+        "a" * 64: vector
+    }
+    assert await store.get_many("m2", ["a" * 64]) == {}
+
+
+@pytest.mark.asyncio
+async def test_page_text_round_trip_and_cascade(db_pool: PostgresPool) -> None:
+    """Page texts survive compression and go away with their document."""
+    documents = PostgresDocumentRepository(db_pool)
+    doc = Document.create(filename="report.pdf", content_sha256="c" * 64)
+    await documents.create(doc)
+    store = PostgresPageTextStore(db_pool)
+    pages = ["Revenue rose.", "", "Ünicode → kept"]
+
+    await store.put("c" * 64, pages)
+    await store.put("c" * 64, ["replaced"])
+
+    assert await store.get("c" * 64) == pages
+    assert await store.get("d" * 64) is None
+    await documents.delete(doc.id)
+    assert await store.get("c" * 64) is None
+
+
+@pytest.mark.asyncio
+async def test_chunk_reindex_and_delete(db_pool: PostgresPool) -> None:
+    """Chunks can be listed, moved and removed without touching vectors."""
+    doc = Document.create(filename="report.pdf")
+    await PostgresDocumentRepository(db_pool).create(doc)
+    repo = PostgresChunkRepository(db_pool)
+    chunks = [
+        Chunk.create(doc.id, index, f"text {index}") for index in range(3)
+    ]
+    await repo.add_chunks_with_embeddings(chunks, [[0.1] * 768] * 3)
+
+    await repo.delete_chunks([chunks[0].id])
+    await repo.reindex_chunks({chunks[1].id: 5, chunks[2].id: 4})
+
+    listed = await repo.list_by_document(doc.id)
+    assert [(c.id, c.chunk_index) for c in listed] == [
+        (chunks[2].id, 4),
+        (chunks[1].id, 5),
+    ]
+    assert await PostgresDocumentRepository(db_pool).get(doc.id) == doc
+    assert await PostgresDocumentRepository(db_pool).list_ids() == [doc.id]
+
+
+@pytest.mark.asyncio
+async def test_document_digest_swap_in_unit_of_work(
+    db_pool: PostgresPool,
+) -> None:
+    """A replaced document moves to a new digest with its page text."""
+    doc = Document.create(filename="10-K.pdf", content_sha256="e" * 64)
+    await PostgresDocumentRepository(db_pool).create(doc)
+    await PostgresPageTextStore(db_pool).put("e" * 64, ["old"])
+    revised = Document(
+        id=doc.id,
+        filename="10-K-A.pdf",
+        created_at=doc.created_at,
+        content_sha256="f" * 64,
+    )
+
+    async with PostgresUnitOfWork(db_pool).begin() as tx:
+        await tx.pages.delete("e" * 64)
+        await tx.documents.update(revised)
+        await tx.pages.put("f" * 64, ["new"])
+
+    store = PostgresPageTextStore(db_pool)
+    assert await store.get("e" * 64) is None
+    assert await store.get("f" * 64) == ["new"]
+    assert await PostgresDocumentRepository(db_pool).get(doc.id) == revised
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_links_sketches_and_promotion(
+    db_pool: PostgresPool,
+) -> None:
+    """Linked chunks stay out of search and are promoted on delete."""
+    doc = Document.create(filename="report.pdf")
+    await PostgresDocumentRepository(db_pool).create(doc)
+    repo = PostgresChunkRepository(db_pool)
+    canonical = Chunk.create(doc.id, 0, "safe harbor")
+    linked = replace(
+        Chunk.create(doc.id, 1, "safe harbor."),
+        canonical_chunk_id=canonical.id,
+    )
+    sketch = MinHashSketch(signature=[1, 2, 3, 4], band_keys=[11, 2**62])
+    async with PostgresUnitOfWork(db_pool).begin() as tx:
+        # Inserted before its canonical chunk: the check is deferred.
+        await tx.chunks.add_chunks_with_embeddings([linked], [[0.2] * 768])
+        await tx.chunks.add_chunks_with_embeddings([canonical], [[0.2] * 768])
+        await tx.chunks.add_sketches({canonical.id: sketch})
+
+    found = await repo.find_near_duplicate_candidates([5, 2**62])
+    assert found == [(canonical, sketch)]
+    assert await repo.find_near_duplicate_candidates([5]) == []
+    assert (await repo.get_embeddings([canonical.id]))[canonical.id] == (
+        pytest.approx([0.2] * 768)
+    )
+    results = await repo.search_by_embedding([0.2] * 768, top_k=5)
+    assert [r.chunk.id for r in results] == [canonical.id]
+    assert (await repo.list_by_document(doc.id))[1] == linked
+
+    await repo.delete_chunks([canonical.id])
+    results = await repo.search_by_embedding([0.2] * 768, top_k=5)
+    assert [r.chunk.id for r in results] == [linked.id]
+    assert await repo.find_near_duplicate_candidates([11]) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exact_search_max_rows", [0, 10_000])
+async def test_scoped_search_includes_chunks_linked_across_documents(
+    db_pool: PostgresPool, exact_search_max_rows: int
+) -> None:
+    """A document whose chunks link to another one is still searchable."""
+    doc_repo = PostgresDocumentRepository(db_pool)
+    first = Document.create(filename="2023.pdf")
+    second = Document.create(filename="2024.pdf")
+    for doc in (first, second):
+        await doc_repo.create(doc)
+    repo = PostgresChunkRepository(
+        db_pool, exact_search_max_rows=exact_search_max_rows
+    )
+    canonical = Chunk.create(first.id, 0, "safe harbor", section="Legal")
+    linked = replace(
+        Chunk.create(second.id, 0, "safe harbor.", section="Legal"),
+        canonical_chunk_id=canonical.id,
+    )
+    vector = [0.3] * 768
+    await repo.add_chunks_with_embeddings([canonical], [vector])
+    await repo.add_chunks_with_embeddings([linked], [vector])
+
+    scoped = await repo.search_by_embedding(
+        vector, top_k=5, filters=SearchFilters(document_ids=(second.id,))
+    )
+    both = await repo.search_by_embedding(
+        vector,
+        top_k=5,
+        filters=SearchFilters(
+            document_ids=(first.id, second.id), section="legal"
+        ),
+    )
+
+    assert [r.chunk.id for r in scoped] == [linked.id]
+    assert [r.chunk.id for r in both] == [canonical.id]
+
+
+@pytest.mark.asyncio
+async def test_span_chunks_are_materialized_from_document_text(
+    db_pool: PostgresPool,
+) -> None:
+    """Span chunks store no text and read back as slices of one copy."""
+    doc = Document.create(filename="report.pdf")
+    text = "Revenue rose.\n\nMargins (net) fell."
+    cache = DocumentTextCache(max_documents=1)
+    first = Chunk.create(doc.id, 0, "Revenue rose.", span=(0, 13))
+    second = Chunk.create(doc.id, 1, "Margins (net)", span=(15, 28))
+    async with PostgresUnitOfWork(db_pool, text_cache=cache).begin() as tx:
+        await tx.documents.create(doc)
+        await tx.texts.put(doc.id, text)
+        await tx.chunks.add_chunks_with_embeddings(
+            [first, second], [[0.1] * 768, [0.2] * 768]
+        )
+    repo = PostgresChunkRepository(db_pool, text_cache=cache)
+
+    stored = await db_pool.pool.fetchval(
+        "SELECT count(*) FROM chunks WHERE content IS NULL"
+    )
+    assert stored == 2
+    assert await repo.list_by_document(doc.id) == [first, second]
+    results = await repo.search_by_embedding([0.2] * 768, top_k=1)
+    assert results[0].chunk == second
+
+    await repo.respan_chunks({second.id: (15, 33)})
+    assert (await repo.list_by_document(doc.id))[1].text == (
+        "Margins (net) fell."
+    )
+    texts = PostgresDocumentTextStore(db_pool)
+    await texts.put(doc.id, "Revenue fell.")
+    assert await texts.get(doc.id) == "Revenue fell."
+    assert (await repo.list_by_document(doc.id))[0].text == "Revenue fell."
+    await PostgresDocumentRepository(db_pool).delete(doc.id)
+    assert await texts.get(doc.id) is None
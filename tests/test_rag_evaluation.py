@@ -27,6 +27,7 @@ from findocbot.infrastructure.in_memory import (
     InMemoryChunkRepository,
     InMemoryDocumentRepository,
     InMemoryHistoryRepository,
+    InMemoryUnitOfWork,
 )
 from findocbot.infrastructure.pdf_parser import PyPDFParser
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
@@ -170,7 +171,7 @@ async def test_rag_evaluation_metrics() -> None:
         chunker=chunker,
         provider=provider,
         documents=docs,
-        chunks=chunks_repo,
+        unit_of_work=InMemoryUnitOfWork(docs, chunks_repo),
     )
     search = SearchSimilarChunksUseCase(provider=provider, chunks=chunks_repo)
     ask = AnswerQuestionUseCase(
@@ -0,0 +1,296 @@
+"""Re-chunking stored documents from cached page text."""
+
+from collections.abc import Awaitable, Callable
+
+import pytest
+from fpdf import FPDF
+
+from findocbot.domain.entities import Document
+from findocbot.domain.exceptions import (
+    DocumentChangedError,
+    DocumentNotFoundError,
+    ModelProviderError,
+    PageTextUnavailableError,
+)
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.rechunk_document import RechunkDocumentUseCase
+from findocbot.use_cases.upload_pdf import (
+    IngestPipelineOptions,
+    UploadPDFUseCase,
+)
+
+
+class _RecordingProvider:
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+        self.fail = False
+        self.while_embedding: Callable[[], Awaitable[None]] | None = None
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        if self.fail:
+            raise ModelProviderError("provider down")
+        if self.while_embedding is not None:
+            hook, self.while_embedding = self.while_embedding, None
+            await hook()
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+def _build_pdf_bytes(pages: list[str]) -> bytes:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for text in pages:
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text=text)
+    return bytes(pdf.output())
+
+
+_PAGES = [
+    "\n\n".join(
+        f"Section {page}.{n}: revenue in segment {n} rose {n + page} percent "
+        "on higher volumes and stable pricing across regions."
+        for n in range(6)
+    )
+    for page in range(3)
+]
+
+
+class _Harness:
+    def __init__(
+        self,
+        pipeline: IngestPipelineOptions | None = None,
+        spans: bool = False,
+    ) -> None:
+        self.provider = _RecordingProvider()
+        self.documents = InMemoryDocumentRepository()
+        self.chunks = InMemoryChunkRepository()
+        self.unit_of_work = InMemoryUnitOfWork(self.documents, self.chunks)
+        self.upload = UploadPDFUseCase(
+            parser=PyPDFParser(),
+            chunker=ParagraphTokenChunker(chunk_tokens=60, overlap_ratio=0.1),
+            provider=self.provider,
+            documents=self.documents,
+            unit_of_work=self.unit_of_work,
+            pipeline=pipeline,
+            store_chunk_spans=spans,
+        )
+
+    def rechunker(
+        self, chunk_tokens: int, spans: bool = False
+    ) -> RechunkDocumentUseCase:
+        return RechunkDocumentUseCase(
+            chunker=ParagraphTokenChunker(
+                chunk_tokens=chunk_tokens, overlap_ratio=0.1
+            ),
+            provider=self.provider,
+            documents=self.documents,
+            chunks=self.chunks,
+            page_texts=self.unit_of_work.pages,
+            unit_of_work=self.unit_of_work,
+            store_chunk_spans=spans,
+        )
+
+    def assert_spans_match_text(self, document_id: str) -> None:
+        text = self.unit_of_work.texts.items[document_id]
+        assert self.chunks.items
+        for item in self.chunks.items:
+            chunk = item.chunk
+            assert chunk.span_start is not None
+            assert chunk.text == text[chunk.span_start : chunk.span_end]
+
+    def stored(self) -> list[tuple[int, str, list[float]]]:
+        return sorted(
+            (item.chunk.chunk_index, item.chunk.text, item.embedding)
+            for item in self.chunks.items
+        )
+
+
+@pytest.mark.parametrize(
+    "pipeline", [None, IngestPipelineOptions(embed_batch_size=2)]
+)
+async def test_upload_caches_page_text(
+    pipeline: IngestPipelineOptions | None,
+) -> None:
+    harness = _Harness(pipeline)
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+
+    assert document.content_sha256 is not None
+    cached = harness.unit_of_work.pages.items[document.content_sha256]
+    assert cached == list(PyPDFParser().iter_pages(_build_pdf_bytes(_PAGES)))
+
+
+async def test_rechunk_with_same_settings_embeds_nothing() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+    before = harness.stored()
+    harness.provider.embedded.clear()
+
+    result = await harness.rechunker(chunk_tokens=60).execute(document.id)
+
+    assert harness.provider.embedded == []
+    assert result.reused == result.chunks == len(before)
+    assert result.removed == 0
+    assert harness.stored() == before
+
+
+async def test_rechunk_with_new_settings_matches_fresh_upload() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+    old_count = len(harness.chunks.items)
+
+    result = await harness.rechunker(chunk_tokens=90).execute(document.id)
+
+    fresh = _Harness()
+    fresh.upload._chunker = ParagraphTokenChunker(
+        chunk_tokens=90, overlap_ratio=0.1
+    )
+    await fresh.upload.execute("report.pdf", _build_pdf_bytes(_PAGES))
+    assert harness.stored() == fresh.stored()
+    assert result.chunks == len(fresh.chunks.items)
+    assert result.removed == old_count - result.reused
+
+
+@pytest.mark.parametrize(
+    "pipeline", [None, IngestPipelineOptions(embed_batch_size=2)]
+)
+async def test_span_upload_stores_text_once(
+    pipeline: IngestPipelineOptions | None,
+) -> None:
+    harness = _Harness(pipeline, spans=True)
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+
+    harness.assert_spans_match_text(document.id)
+    # Overlap text is a slice of the source, not a space-joined copy.
+    assert any("\nregions.\nSection" in t for _, t, _ in harness.stored())
+
+
+async def test_rechunk_with_spans_moves_legacy_chunks_to_spans() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(["Liquidity remained strong"])
+    )
+    assert harness.unit_of_work.texts.items == {}
+    harness.provider.embedded.clear()
+
+    result = await harness.rechunker(chunk_tokens=60, spans=True).execute(
+        document.id
+    )
+
+    harness.assert_spans_match_text(document.id)
+    assert (result.reused, result.embedded) == (1, 0)
+    assert harness.provider.embedded == []
+
+
+async def test_rechunk_with_spans_keeps_spans_consistent() -> None:
+    harness = _Harness(spans=True)
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+
+    result = await harness.rechunker(chunk_tokens=90, spans=True).execute(
+        document.id
+    )
+
+    harness.assert_spans_match_text(document.id)
+    assert result.chunks == len(harness.chunks.items)
+
+
+class _PatchedChunker(ParagraphTokenChunker):
+    """Chunker after a "bug fix" that changes only some chunk texts."""
+
+    def iter_chunks(self, pages):  # type: ignore[no-untyped-def]
+        for text, section in super().iter_chunks(pages):
+            if "Section 1 ." in text:
+                text = text.replace("percent", "%")
+            yield text, section
+
+
+async def test_rechunk_embeds_only_changed_text() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+    harness.provider.embedded.clear()
+    rechunk = harness.rechunker(chunk_tokens=60)
+    rechunk._chunker = _PatchedChunker(chunk_tokens=60, overlap_ratio=0.1)
+
+    result = await rechunk.execute(document.id)
+
+    assert harness.provider.embedded
+    assert all("Section 1 ." in text for text in harness.provider.embedded)
+    assert result.embedded == result.removed == len(harness.provider.embedded)
+    assert result.reused == result.chunks - result.embedded > 0
+    assert [i for i, _, _ in harness.stored()] == list(range(result.chunks))
+
+
+async def test_rechunk_failure_leaves_chunks_untouched() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+    before = harness.stored()
+    harness.provider.fail = True
+
+    with pytest.raises(ModelProviderError):
+        await harness.rechunker(chunk_tokens=90).execute(document.id)
+
+    assert harness.stored() == before
+
+
+async def test_rechunk_embeds_outside_the_transaction_and_detects_races() -> (
+    None
+):
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "report.pdf", _build_pdf_bytes(_PAGES)
+    )
+    before = harness.chunks.items[0].chunk
+
+    async def concurrent_delete() -> None:
+        await harness.chunks.delete_chunks([before.id])
+
+    harness.provider.while_embedding = concurrent_delete
+
+    with pytest.raises(DocumentChangedError):
+        await harness.rechunker(chunk_tokens=90).execute(document.id)
+
+    result = await harness.rechunker(chunk_tokens=90).execute(document.id)
+    assert [i for i, _, _ in harness.stored()] == list(range(result.chunks))
+
+
+async def test_rechunk_rejects_unknown_and_uncached_documents() -> None:
+    harness = _Harness()
+    legacy = Document.create("legacy.pdf", content_sha256="0" * 64)
+    await harness.documents.create(legacy)
+    rechunk = harness.rechunker(chunk_tokens=60)
+
+    with pytest.raises(DocumentNotFoundError):
+        await rechunk.execute("missing")
+    with pytest.raises(PageTextUnavailableError):
+        await rechunk.execute(legacy.id)
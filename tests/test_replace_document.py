@@ -0,0 +1,274 @@
+"""Replacing documents with revised PDFs at page granularity."""
+
+from collections.abc import Iterable, Iterator
+
+import pytest
+from fpdf import FPDF
+
+from findocbot.domain.exceptions import (
+    DocumentNotFoundError,
+    DuplicateDocumentError,
+)
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.ports import ChunkSpan
+from findocbot.use_cases.replace_document import (
+    ReplaceDocumentUseCase,
+    _diff_pages,
+)
+from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+
+
+class _RecordingProvider:
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+def _page(number: int, suffix: str = "") -> str:
+    return "\n\n".join(
+        f"Note {number}.{n}: segment {n} revenue rose {n + number} percent "
+        f"on higher volumes{suffix}."
+        for n in range(4)
+    )
+
+
+def _build_pdf_bytes(pages: list[str]) -> bytes:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for text in pages:
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text=text)
+    return bytes(pdf.output())
+
+
+class _RecordingChunker(ParagraphTokenChunker):
+    def __init__(self) -> None:
+        super().__init__(chunk_tokens=40, overlap_ratio=0.1)
+        self.chunked: list[str] = []
+
+    def iter_spans(self, pages: Iterable[str]) -> Iterator[ChunkSpan]:
+        pages = list(pages)
+        self.chunked.append(self.normalize(pages))
+        return super().iter_spans(pages)
+
+
+class _Harness:
+    def __init__(self, spans: bool = False, page_text: bool = True) -> None:
+        self.provider = _RecordingProvider()
+        self.documents = InMemoryDocumentRepository()
+        self.chunks = InMemoryChunkRepository()
+        self.unit_of_work = InMemoryUnitOfWork(self.documents, self.chunks)
+        self.chunker = chunker = _RecordingChunker()
+        self.upload = UploadPDFUseCase(
+            parser=PyPDFParser(),
+            chunker=chunker,
+            provider=self.provider,
+            documents=self.documents,
+            unit_of_work=self.unit_of_work,
+            store_chunk_spans=spans,
+            store_page_text=page_text,
+        )
+        self.replace = ReplaceDocumentUseCase(
+            parser=PyPDFParser(),
+            chunker=chunker,
+            provider=self.provider,
+            documents=self.documents,
+            chunks=self.chunks,
+            page_texts=self.unit_of_work.pages,
+            unit_of_work=self.unit_of_work,
+            store_chunk_spans=spans,
+            store_page_text=page_text,
+        )
+
+    def stored(self) -> list[tuple[int, str]]:
+        return sorted(
+            (item.chunk.chunk_index, item.chunk.text)
+            for item in self.chunks.items
+        )
+
+
+_ORIGINAL = [_page(number) for number in range(6)]
+
+
+def test_diff_pages_aligns_inserted_and_removed_pages() -> None:
+    pages = ["a", "b", "c", "d"]
+
+    def summary(new: list[str]) -> tuple[list[int], int]:
+        diff = _diff_pages(pages, new)
+        return diff.changed, diff.removed
+
+    assert summary(pages) == ([], 0)
+    assert summary(["a", "B", "c", "d"]) == ([1], 0)
+    assert summary(["a", "b", "new", "c", "d"]) == ([2], 0)
+    assert summary(["a", "c", "d"]) == ([], 1)
+    assert _diff_pages(pages, ["a", "c", "d"]).moved == {0: 0, 2: 1, 3: 2}
+
+
+async def test_replace_embeds_only_chunks_of_changed_pages() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "10-K.pdf", _build_pdf_bytes(_ORIGINAL)
+    )
+    old_digest = document.content_sha256
+    harness.provider.embedded.clear()
+    amended = list(_ORIGINAL)
+    amended[3] = _page(3, suffix=" and restated margins")
+
+    result = await harness.replace.execute(
+        document.id, "10-K-A.pdf", _build_pdf_bytes(amended)
+    )
+
+    assert result.document_id == document.id
+    assert result.changed_pages == [3]
+    assert result.removed_pages == 0
+    assert harness.provider.embedded
+    assert all("restated" in text for text in harness.provider.embedded)
+    assert result.chunks.embedded == len(harness.provider.embedded)
+    assert result.chunks.reused > result.chunks.embedded
+
+    revised = harness.documents.items[document.id]
+    assert revised.filename == "10-K-A.pdf"
+    assert revised.content_sha256 != old_digest
+    assert old_digest not in harness.unit_of_work.pages.items
+    fresh = _Harness()
+    await fresh.upload.execute("10-K-A.pdf", _build_pdf_bytes(amended))
+    assert harness.stored() == fresh.stored()
+
+
+def _layout(harness: _Harness) -> list[tuple]:
+    return sorted(
+        (c.chunk_index, c.text, c.section, c.span_start, c.span_end)
+        for c in (item.chunk for item in harness.chunks.items)
+    )
+
+
+@pytest.mark.parametrize(
+    "amended",
+    [
+        [*_ORIGINAL[:3], _page(3, " and restated margins"), *_ORIGINAL[4:]],
+        [*_ORIGINAL[:2], _page(9), *_ORIGINAL[2:]],
+        [*_ORIGINAL[:2], *_ORIGINAL[3:]],
+        [_page(0, " restated"), *_ORIGINAL[1:4], _page(4, " restated")],
+    ],
+    ids=["modified", "inserted", "removed", "two-ranges"],
+)
+async def test_replace_rechunks_only_changed_page_ranges(
+    amended: list[str],
+) -> None:
+    harness = _Harness(spans=True)
+    document = await harness.upload.execute(
+        "10-K.pdf", _build_pdf_bytes(_ORIGINAL)
+    )
+    harness.chunker.chunked.clear()
+
+    result = await harness.replace.execute(
+        document.id, "10-K-A.pdf", _build_pdf_bytes(amended)
+    )
+
+    fresh = _Harness(spans=True)
+    await fresh.upload.execute("10-K-A.pdf", _build_pdf_bytes(amended))
+    assert _layout(harness) == _layout(fresh)
+    assert result.chunks.reused > result.chunks.embedded
+    # Only windows around the changed pages went through the chunker.
+    chunked = sum(len(text) for text in harness.chunker.chunked)
+    assert chunked < len(fresh.chunker.chunked[0]) / 2
+
+
+async def test_replace_rechunks_everything_when_a_heading_changes() -> None:
+    harness = _Harness(spans=True)
+    document = await harness.upload.execute(
+        "10-K.pdf", _build_pdf_bytes(_ORIGINAL)
+    )
+    harness.chunker.chunked.clear()
+    amended = list(_ORIGINAL)
+    amended[3] = "Section 2 Restatement\n\n" + _ORIGINAL[3]
+
+    await harness.replace.execute(
+        document.id, "10-K-A.pdf", _build_pdf_bytes(amended)
+    )
+
+    fresh = _Harness(spans=True)
+    await fresh.upload.execute("10-K-A.pdf", _build_pdf_bytes(amended))
+    assert _layout(harness) == _layout(fresh)
+    assert harness.chunker.chunked[-1] == fresh.chunker.chunked[0]
+
+
+async def test_replace_with_identical_bytes_changes_nothing() -> None:
+    harness = _Harness()
+    pdf_bytes = _build_pdf_bytes(_ORIGINAL)
+    document = await harness.upload.execute("10-K.pdf", pdf_bytes)
+    before = harness.stored()
+    harness.provider.embedded.clear()
+
+    result = await harness.replace.execute(document.id, "10-K.pdf", pdf_bytes)
+
+    assert result.changed_pages == []
+    assert result.chunks.embedded == result.chunks.removed == 0
+    assert harness.provider.embedded == []
+    assert harness.stored() == before
+
+
+async def test_replace_rolls_back_on_digest_conflict() -> None:
+    harness = _Harness()
+    document = await harness.upload.execute(
+        "10-K.pdf", _build_pdf_bytes(_ORIGINAL)
+    )
+    other = _build_pdf_bytes(_ORIGINAL[:2])
+    await harness.upload.execute("other.pdf", other)
+    before = harness.stored()
+    pages_before = dict(harness.unit_of_work.pages.items)
+
+    with pytest.raises(DuplicateDocumentError):
+        await harness.replace.execute(document.id, "10-K-A.pdf", other)
+
+    assert harness.documents.items[document.id] == document
+    assert harness.unit_of_work.pages.items == pages_before
+    assert harness.stored() == before
+
+
+async def test_replace_skips_page_text_when_the_cache_is_off() -> None:
+    harness = _Harness(page_text=False)
+    document = await harness.upload.execute(
+        "10-K.pdf", _build_pdf_bytes(_ORIGINAL)
+    )
+    amended = [*_ORIGINAL[:3], _page(3, " and restated margins")]
+
+    result = await harness.replace.execute(
+        document.id, "10-K-A.pdf", _build_pdf_bytes(amended)
+    )
+
+    assert result.changed_pages == [0, 1, 2, 3]
+    assert harness.unit_of_work.pages.items == {}
+    fresh = _Harness()
+    await fresh.upload.execute("10-K-A.pdf", _build_pdf_bytes(amended))
+    assert harness.stored() == fresh.stored()
+
+
+async def test_replace_unknown_document() -> None:
+    harness = _Harness()
+
+    with pytest.raises(DocumentNotFoundError):
+        await harness.replace.execute(
+            "missing", "x.pdf", _build_pdf_bytes(_ORIGINAL)
+        )
@@ -0,0 +1,217 @@
+"""Resumable uploads: byte ranges on disk, ingestion on finalize."""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import httpx
+import pytest
+from fpdf import FPDF
+
+from findocbot.config import Settings
+from findocbot.domain.entities import Document
+from findocbot.domain.exceptions import (
+    UploadConflictError,
+    UploadNotFoundError,
+    UploadTooLargeError,
+)
+from findocbot.infrastructure.chunking import ParagraphTokenChunker
+from findocbot.infrastructure.container import AppContainer
+from findocbot.infrastructure.in_memory import (
+    InMemoryChunkRepository,
+    InMemoryDocumentRepository,
+    InMemoryHistoryRepository,
+    InMemoryIngestJobRepository,
+    InMemoryUnitOfWork,
+)
+from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.infrastructure.upload_store import LocalUploadStore
+from findocbot.main import create_app
+from findocbot.use_cases.answer_question import AnswerQuestionUseCase
+from findocbot.use_cases.ingest_jobs import EnqueueUploadUseCase
+from findocbot.use_cases.resumable_upload import ResumableUploadUseCase
+from findocbot.use_cases.search_similar_chunks import (
+    SearchSimilarChunksUseCase,
+)
+from findocbot.use_cases.upload_pdf import UploadPDFUseCase
+
+
+class _StubProvider:
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def embed_one(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+    async def generate_structured(self, prompt: str, schema: dict) -> dict:
+        return {}
+
+
+class _FakeDB:
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+def _pdf_bytes() -> bytes:
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for page in range(3):
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text=f"Annual report page {page}: revenue.")
+    return bytes(pdf.output())
+
+
+async def _blocks(data: bytes, size: int = 7) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _broken(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+    raise ConnectionResetError("client went away")
+
+
+def _build(
+    tmp_path: Path, max_bytes: int = 10**8
+) -> tuple[ResumableUploadUseCase, InMemoryDocumentRepository, Path]:
+    documents = InMemoryDocumentRepository()
+    upload = UploadPDFUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=60, overlap_ratio=0.1),
+        provider=_StubProvider(),
+        documents=documents,
+        unit_of_work=InMemoryUnitOfWork(documents, InMemoryChunkRepository()),
+    )
+    resumable = ResumableUploadUseCase(
+        store=LocalUploadStore(tmp_path),
+        upload=upload,
+        max_bytes=max_bytes,
+        write_block_bytes=64,
+    )
+    return resumable, documents, tmp_path
+
+
+async def test_resume_after_disconnect_and_finalize(tmp_path: Path) -> None:
+    resumable, documents, directory = _build(tmp_path)
+    content = _pdf_bytes()
+    session = await resumable.create("annual.pdf", len(content))
+
+    with pytest.raises(ConnectionResetError):
+        await resumable.append(session.id, 0, _broken(content[:1000]))
+    received = (await resumable.status(session.id)).received
+    assert received == 1000
+
+    with pytest.raises(UploadConflictError):
+        await resumable.append(session.id, received + 1, _blocks(b"x"))
+    with pytest.raises(UploadConflictError):
+        await resumable.finalize(session.id)
+    # Resending bytes that already arrived is harmless.
+    await resumable.append(session.id, 900, _blocks(content[900:]))
+
+    document = await resumable.finalize(session.id)
+
+    assert isinstance(document, Document)
+    assert await documents.get(document.id) == document
+    assert list(directory.iterdir()) == []
+    with pytest.raises(UploadNotFoundError):
+        await resumable.status(session.id)
+
+
+async def test_sizes_are_enforced(tmp_path: Path) -> None:
+    resumable, _, _ = _build(tmp_path, max_bytes=100)
+
+    with pytest.raises(UploadTooLargeError):
+        await resumable.create("huge.pdf", 101)
+    session = await resumable.create("small.pdf", 10)
+    with pytest.raises(UploadTooLargeError):
+        await resumable.append(session.id, 0, _blocks(b"0123456789AB", 4))
+    assert (await resumable.status(session.id)).received == 8
+    with pytest.raises(UploadNotFoundError):
+        await resumable.status("../../etc/passwd")
+
+
+async def test_queued_uploads_are_capped_at_the_queue_limit(
+    tmp_path: Path,
+) -> None:
+    resumable, _, _ = _build(tmp_path)
+    queued = ResumableUploadUseCase(
+        store=LocalUploadStore(tmp_path),
+        upload=resumable._upload,
+        enqueue=EnqueueUploadUseCase(
+            InMemoryIngestJobRepository(), max_bytes=1024
+        ),
+        max_bytes=4096,
+    )
+
+    with pytest.raises(UploadTooLargeError):
+        await queued.create("big.pdf", 1025)
+    assert (await queued.create("small.pdf", 1024)).size == 1024
+
+
+async def test_api_protocol(tmp_path: Path) -> None:
+    resumable, _, _ = _build(tmp_path)
+    provider = _StubProvider()
+    search = SearchSimilarChunksUseCase(
+        provider=provider, chunks=InMemoryChunkRepository()
+    )
+    container = AppContainer(
+        settings=Settings(),
+        db=_FakeDB(),  # type: ignore[arg-type]
+        provider=provider,
+        upload_pdf=resumable._upload,
+        search_chunks=search,
+        answer_question=AnswerQuestionUseCase(
+            provider=provider,
+            search_use_case=search,
+            history=InMemoryHistoryRepository(),
+        ),
+        resumable_upload=resumable,
+    )
+    content = _pdf_bytes()
+    half = len(content) // 2
+    total = len(content)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(container=container)),
+        base_url="http://test",
+    ) as client:
+        created = await client.post(
+            "/documents/uploads",
+            json={"filename": "annual.pdf", "size": total},
+        )
+        assert created.status_code == 201
+        url = f"/documents/uploads/{created.json()['upload_id']}"
+
+        first = await client.put(
+            url,
+            content=content[:half],
+            headers={"Content-Range": f"bytes 0-{half - 1}/{total}"},
+        )
+        assert first.json()["received"] == half
+        gap = await client.put(
+            url,
+            content=b"x",
+            headers={"Content-Range": f"bytes {half + 1}-{half + 1}/{total}"},
+        )
+        assert gap.status_code == 409
+        early = await client.post(f"{url}/finalize")
+        assert early.status_code == 409
+        assert (await client.get(url)).json()["received"] == half
+
+        rest = await client.put(
+            url,
+            content=content[half:],
+            headers={"Content-Range": f"bytes {half}-{total - 1}/{total}"},
+        )
+        assert rest.json()["received"] == total
+        done = await client.post(f"{url}/finalize")
+        assert done.status_code == 200
+        assert done.json()["filename"] == "annual.pdf"
+        assert (await client.get(url)).status_code == 404
@@ -1,11 +1,15 @@
+from datetime import UTC, datetime, timedelta
+
 from fpdf import FPDF
 
 from findocbot.infrastructure.chunking import ParagraphTokenChunker
 from findocbot.infrastructure.in_memory import (
     InMemoryChunkRepository,
     InMemoryDocumentRepository,
+    InMemoryUnitOfWork,
 )
 from findocbot.infrastructure.pdf_parser import PyPDFParser
+from findocbot.use_cases.ports import SearchFilters
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
 )
@@ -60,7 +64,7 @@ async def test_upload_then_search_returns_relevant_chunk() -> None:
         chunker=chunker,
         provider=provider,
         documents=docs,
-        chunks=chunks,
+        unit_of_work=InMemoryUnitOfWork(docs, chunks),
     )
     search = SearchSimilarChunksUseCase(provider=provider, chunks=chunks)
 
@@ -75,3 +79,43 @@ async def test_upload_then_search_returns_relevant_chunk() -> None:
 
     assert results
     assert "Revenue" in results[0].text
+
+
+async def test_search_filters_by_document_section_and_upload_date() -> None:
+    provider = FakeProviderGateway()
+    docs = InMemoryDocumentRepository()
+    chunks = InMemoryChunkRepository(documents=docs)
+    upload = UploadPDFUseCase(
+        parser=PyPDFParser(),
+        chunker=ParagraphTokenChunker(chunk_tokens=120, overlap_ratio=0.1),
+        provider=provider,
+        documents=docs,
+        unit_of_work=InMemoryUnitOfWork(docs, chunks),
+    )
+    search = SearchSimilarChunksUseCase(provider=provider, chunks=chunks)
+    first = await upload.execute(
+        "first.pdf", _build_pdf_bytes("Section 1\nRevenue revenue revenue.")
+    )
+    second = await upload.execute(
+        "second.pdf", _build_pdf_bytes("Section 2\nRevenue and assets.")
+    )
+
+    everything = await search.execute("revenue", top_k=5)
+    scoped = await search.execute(
+        "revenue", top_k=5, filters=SearchFilters(document_ids=(second.id,))
+    )
+    by_section = await search.execute(
+        "revenue", top_k=5, filters=SearchFilters(section="SECTION 2")
+    )
+    later = await search.execute(
+        "revenue",
+        top_k=5,
+        filters=SearchFilters(
+            uploaded_after=datetime.now(tz=UTC) + timedelta(minutes=1)
+        ),
+    )
+
+    assert {item.document_id for item in everything} == {first.id, second.id}
+    assert [item.document_id for item in scoped] == [second.id]
+    assert [item.section for item in by_section] == ["Section 2"]
+    assert later == []
@@ -4,9 +4,15 @@ Catches regressions like forgotten pass-through methods (C2) and ensures
 the container can be built with fake dependencies.
 """
 
+import io
+import os
+import zipfile
+
 import httpx
+import pytest
 from fpdf import FPDF
 
+from findocbot.adapters.api import routes
 from findocbot.config import Settings
 from findocbot.infrastructure.cached_embedding_gateway import (
     CachedEmbeddingGateway,
@@ -17,10 +23,12 @@ from findocbot.infrastructure.in_memory import (
     InMemoryChunkRepository,
     InMemoryDocumentRepository,
     InMemoryHistoryRepository,
+    InMemoryUnitOfWork,
 )
 from findocbot.infrastructure.pdf_parser import PyPDFParser
 from findocbot.main import create_app
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
+from findocbot.use_cases.bulk_upload import BulkUploadUseCase
 from findocbot.use_cases.search_similar_chunks import (
     SearchSimilarChunksUseCase,
 )
@@ -87,9 +95,9 @@ def _build_pdf_bytes(text: str) -> bytes:
     return data.encode("latin-1")
 
 
-def _build_test_container() -> AppContainer:
+def _build_test_container(settings: Settings | None = None) -> AppContainer:
     """Wire an AppContainer with in-memory dependencies for smoke testing."""
-    settings = Settings()
+    settings = settings or Settings()
     fake_db = _FakeDB()
     provider = _FakeModelProvider()
     cached_provider = CachedEmbeddingGateway(
@@ -110,12 +118,20 @@ def _build_test_container() -> AppContainer:
         search_use_case=search_chunks,
         history=history,
     )
+    unit_of_work = InMemoryUnitOfWork(documents, chunks)
     upload_pdf = UploadPDFUseCase(
         parser=parser,
         chunker=chunker,
         provider=cached_provider,
         documents=documents,
-        chunks=chunks,
+        unit_of_work=unit_of_work,
+    )
+    bulk_upload = BulkUploadUseCase(
+        parser=parser,
+        chunker=chunker,
+        provider=cached_provider,
+        documents=documents,
+        unit_of_work=unit_of_work,
     )
 
     return AppContainer(
@@ -125,6 +141,7 @@ def _build_test_container() -> AppContainer:
         upload_pdf=upload_pdf,
         search_chunks=search_chunks,
         answer_question=answer_question,
+        bulk_upload=bulk_upload,
     )
 
 
@@ -242,3 +259,80 @@ async def test_ask_rejects_empty_question() -> None:
             },
         )
         assert resp.status_code == 422  # Pydantic validation error
+
+
+async def test_bulk_upload_accepts_pdfs_and_zip_archives() -> None:
+    """Smoke: PDFs inside a zip are ingested alongside loose PDFs."""
+    app = create_app(container=_build_test_container())
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("q1/10-Q.pdf", _build_pdf_bytes("Q1 revenue rose."))
+        bundle.writestr("q1/notes.txt", "ignored")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        resp = await client.post(
+            "/documents/bulk-upload",
+            files=[
+                (
+                    "files",
+                    (
+                        "10-K.pdf",
+                        _build_pdf_bytes("FY revenue."),
+                        "application/pdf",
+                    ),
+                ),
+                ("files", ("q1.zip", archive.getvalue(), "application/zip")),
+            ],
+        )
+
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [(i["filename"], i["status"]) for i in items] == [
+        ("10-K.pdf", "created"),
+        ("10-Q.pdf", "created"),
+    ]
+
+
+async def test_bulk_upload_bounds_archives_by_the_request_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Zips may exceed the single-PDF limit but not the bulk limit."""
+    pdf = _build_pdf_bytes("Q1 revenue rose.")
+    monkeypatch.setattr(routes, "_MAX_UPLOAD_BYTES", len(pdf) + 1024)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("q1/10-Q.pdf", pdf)
+        bundle.writestr("q1/exhibits.bin", os.urandom(len(pdf) * 4))
+    # Each member is small; together they decompress past 1 MB.
+    bomb = io.BytesIO()
+    with zipfile.ZipFile(bomb, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for index in range(3):
+            bundle.writestr(f"{index}.pdf", b"\0" * 400 * 1024)
+    app = create_app(
+        container=_build_test_container(Settings(bulk_upload_max_mb=1))
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        accepted = await client.post(
+            "/documents/bulk-upload",
+            files=[
+                ("files", ("q1.zip", archive.getvalue(), "application/zip"))
+            ],
+        )
+        rejected = await client.post(
+            "/documents/bulk-upload",
+            files=[
+                ("files", ("bomb.zip", bomb.getvalue(), "application/zip"))
+            ],
+        )
+
+    assert len(archive.getvalue()) > routes._MAX_UPLOAD_BYTES
+    assert accepted.status_code == 200
+    assert [i["status"] for i in accepted.json()["items"]] == ["created"]
+    assert len(bomb.getvalue()) < 1024 * 1024
+    assert rejected.status_code == 413
+    assert "Archive contents" in rejected.json()["detail"]
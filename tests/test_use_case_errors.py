@@ -9,6 +9,7 @@ from findocbot.infrastructure.in_memory import (
     InMemoryChunkRepository,
     InMemoryDocumentRepository,
     InMemoryHistoryRepository,
+    InMemoryUnitOfWork,
 )
 from findocbot.infrastructure.pdf_parser import PyPDFParser
 from findocbot.use_cases.answer_question import AnswerQuestionUseCase
@@ -71,14 +72,14 @@ def _build_answer_use_case(provider: _Provider) -> AnswerQuestionUseCase:
     )
 
 
-async def test_upload_chunk_persistence_failure_deletes_document() -> None:
+async def test_upload_chunk_persistence_failure_rolls_back_document() -> None:
     documents = InMemoryDocumentRepository()
     upload = UploadPDFUseCase(
         parser=PyPDFParser(),
         chunker=ParagraphTokenChunker(chunk_tokens=120, overlap_ratio=0.1),
         provider=_Provider(),
         documents=documents,
-        chunks=_FailingChunkRepository(),
+        unit_of_work=InMemoryUnitOfWork(documents, _FailingChunkRepository()),
     )
     pdf_bytes = _build_pdf_bytes("Revenue grew by 20 percent.")
 
@@ -0,0 +1,42 @@
+"""Tests for the pgvector binary codecs registered on the pool."""
+
+import struct
+
+import pytest
+
+from findocbot.infrastructure.db import (
+    _decode_halfvec,
+    _decode_vector,
+    _encode_halfvec,
+    _encode_vector,
+)
+
+
+def test_vector_codec_matches_pgvector_wire_format() -> None:
+    encoded = _encode_vector([1.0, -0.5, 0.25])
+
+    assert encoded == struct.pack(">HH3f", 3, 0, 1.0, -0.5, 0.25)
+    assert _decode_vector(encoded) == [1.0, -0.5, 0.25]
+
+
+def test_vector_codec_round_trips_at_float32_precision() -> None:
+    values = [i / 7 for i in range(768)]
+
+    decoded = _decode_vector(_encode_vector(values))
+
+    assert len(decoded) == 768
+    assert decoded == pytest.approx(values, rel=1e-6)
+
+
+def test_halfvec_codec_round_trips_at_float16_precision() -> None:
+    encoded = _encode_halfvec([0.1, 2.0, -3.5])
+
+    assert len(encoded) == 4 + 3 * 2
+    assert _decode_halfvec(encoded) == pytest.approx(
+        [0.1, 2.0, -3.5], rel=1e-3
+    )
+
+
+def test_vector_decoder_rejects_truncated_payload() -> None:
+    with pytest.raises(ValueError, match="Malformed"):
+        _decode_vector(struct.pack(">HH2f", 3, 0, 1.0, 2.0))